@@ -0,0 +1,235 @@
+"""utils.database.Database 벤치마크 / 소크 테스트
+
+저장소 루트에서 실행:
+    python -m benchmarks.bench_database --output bench/database.json
+    python -m benchmarks.bench_database --tickets 1000 --logs 10000 --ops 200   # 빠른 확인용
+
+결과는 키가 정렬된 JSON으로 저장되므로 버전 간 diff로 비교할 수 있습니다.
+--baseline으로 이전 결과 파일을 지정하면 p50/p99 변화율도 함께 출력합니다.
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+
+from utils.database import Database
+
+LOG_ACTIONS = ('created', 'claimed', 'closed', 'force_closed')
+TICKET_TYPES = ('general', 'technical', 'report')
+
+def percentile(sorted_values, pct):
+    """정렬된 값 목록의 백분위수 (nearest-rank)"""
+    if not sorted_values:
+        return 0.0
+    index = max(0, min(len(sorted_values) - 1, int(round(pct / 100 * len(sorted_values))) - 1))
+    return sorted_values[index]
+
+def summarize(latencies, wall_time):
+    """지연 시간 목록을 요약"""
+    values = sorted(latencies)
+    return {
+        'count': len(values),
+        'p50_ms': round(percentile(values, 50) * 1000, 3),
+        'p99_ms': round(percentile(values, 99) * 1000, 3),
+        'max_ms': round(values[-1] * 1000, 3) if values else 0.0,
+        'throughput_ops': round(len(values) / wall_time, 1) if wall_time else 0.0
+    }
+
+def make_transcript(size_kb):
+    """대략 size_kb 크기의 텍스트 트랜스크립트 생성"""
+    line = "[2025-01-01 12:00:00] user#0001:\n트랜스크립트 벤치마크 메시지 내용입니다.\n\n"
+    return line * max(1, (size_kb * 1024) // len(line.encode('utf-8')))
+
+def seed(db_path, tickets, logs, transcripts, transcript_kb, open_ratio):
+    """sqlite3로 대량 데이터 직접 적재"""
+    rng = random.Random(42)
+    conn = sqlite3.connect(db_path)
+    conn.execute('PRAGMA synchronous = OFF')
+    
+    open_every = max(1, int(1 / open_ratio)) if open_ratio else 0
+    conn.executemany(
+        '''INSERT INTO tickets (id, channel_id, user_id, ticket_type, created_at, closed_at, closed_by, status, ticket_number)
+           VALUES (?, ?, ?, ?, datetime('now', ?), ?, ?, ?, ?)''',
+        (
+            (
+                i, 10**17 + i, 10**16 + rng.randrange(5000), TICKET_TYPES[i % 3], f'-{rng.randrange(365)} days',
+                None if open_every and i % open_every == 0 else '2025-01-01 00:00:00',
+                None if open_every and i % open_every == 0 else 10**16 + rng.randrange(50),
+                'open' if open_every and i % open_every == 0 else 'closed',
+                i
+            )
+            for i in range(1, tickets + 1)
+        )
+    )
+    conn.executemany(
+        'INSERT INTO ticket_logs (ticket_id, action, user_id) VALUES (?, ?, ?)',
+        ((rng.randrange(1, tickets + 1), LOG_ACTIONS[i % 4], 10**16 + rng.randrange(5000)) for i in range(logs))
+    )
+    content = make_transcript(transcript_kb)
+    conn.executemany(
+        'INSERT INTO transcripts (ticket_id, content) VALUES (?, ?)',
+        ((rng.randrange(1, tickets + 1), content) for _ in range(transcripts))
+    )
+    conn.execute("UPDATE ticket_sequence SET value = ? WHERE name = 'ticket'", (tickets,))
+    conn.commit()
+    conn.close()
+
+async def run_phase(name, operation, ops, concurrency):
+    """operation(i)을 동시성 제한 하에 ops번 실행하고 지연 시간 측정"""
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+    
+    async def worker(i):
+        async with semaphore:
+            start = time.perf_counter()
+            await operation(i)
+            latencies.append(time.perf_counter() - start)
+    
+    start = time.perf_counter()
+    await asyncio.gather(*(worker(i) for i in range(ops)))
+    wall_time = time.perf_counter() - start
+    
+    result = summarize(latencies, wall_time)
+    print(f"  {name:<16} p50 {result['p50_ms']:>9.3f}ms  p99 {result['p99_ms']:>9.3f}ms  {result['throughput_ops']:>9.1f} ops/s")
+    return result
+
+async def run_benchmark(args, db_path):
+    db = Database(db_path, archive_dir=os.path.join(os.path.dirname(db_path), 'archive'))
+    await db.setup()
+    
+    print(f"데이터 적재 중: 티켓 {args.tickets}, 로그 {args.logs}, 트랜스크립트 {args.transcripts}x{args.transcript_kb}KB")
+    start = time.perf_counter()
+    seed(db_path, args.tickets, args.logs, args.transcripts, args.transcript_kb, args.open_ratio)
+    await db.load_open_tickets()
+    seed_time = time.perf_counter() - start
+    print(f"적재 완료 ({seed_time:.1f}s), 열린 티켓 {len(db.open_tickets)}개")
+    
+    rng = random.Random(7)
+    open_channels = list(db.open_tickets)
+    closed_channels = [10**17 + i for i in range(1, args.tickets + 1) if 10**17 + i not in db.open_tickets]
+    transcript = make_transcript(args.transcript_kb)
+    created_channels = []
+    
+    async def create(i):
+        number = await db.next_ticket_number()
+        channel_id = 2 * 10**17 + i
+        await db.create_ticket(channel_id, 10**16 + i, TICKET_TYPES[i % 3], number)
+        created_channels.append(channel_id)
+    
+    async def close(i):
+        await db.close_ticket(created_channels[i % len(created_channels)], 10**16)
+    
+    async def lookup_open(i):
+        await db.get_ticket_by_channel(rng.choice(open_channels))
+    
+    async def lookup_closed(i):
+        await db.get_ticket_by_channel(rng.choice(closed_channels))
+    
+    async def log_append(i):
+        await db.add_ticket_log(rng.randrange(1, args.tickets + 1), 'claimed', 10**16 + i, {'bench': i})
+    
+    async def transcript_save(i):
+        await db.save_transcript(rng.randrange(1, args.tickets + 1), transcript)
+    
+    results = {}
+    print(f"측정 중: 작업당 {args.ops}회, 동시성 {args.concurrency}")
+    results['create'] = await run_phase('create', create, args.ops, args.concurrency)
+    results['close'] = await run_phase('close', close, args.ops, args.concurrency)
+    if open_channels:
+        results['lookup_open'] = await run_phase('lookup_open', lookup_open, args.ops, args.concurrency)
+    if closed_channels:
+        results['lookup_closed'] = await run_phase('lookup_closed', lookup_closed, args.ops, args.concurrency)
+    results['log_append'] = await run_phase('log_append', log_append, args.ops, args.concurrency)
+    results['transcript_save'] = await run_phase('transcript_save', transcript_save, max(1, args.ops // 10), args.concurrency)
+    
+    if args.soak_seconds:
+        results['soak_mixed'] = await run_soak(args, [create, lookup_open, log_append, lookup_closed], created_channels, db)
+    
+    return seed_time, results
+
+async def run_soak(args, operations, created_channels, db):
+    """지정한 시간 동안 혼합 작업을 계속 실행"""
+    print(f"소크 테스트: {args.soak_seconds}초, 동시성 {args.concurrency}")
+    latencies = []
+    deadline = time.perf_counter() + args.soak_seconds
+    counter = iter(range(10**6, 10**9))
+    
+    async def worker(seed_value):
+        rng = random.Random(seed_value)
+        while time.perf_counter() < deadline:
+            operation = rng.choice(operations)
+            start = time.perf_counter()
+            await operation(next(counter))
+            latencies.append(time.perf_counter() - start)
+    
+    start = time.perf_counter()
+    await asyncio.gather(*(worker(i) for i in range(args.concurrency)))
+    result = summarize(latencies, time.perf_counter() - start)
+    print(f"  {'soak_mixed':<16} p50 {result['p50_ms']:>9.3f}ms  p99 {result['p99_ms']:>9.3f}ms  {result['throughput_ops']:>9.1f} ops/s")
+    return result
+
+def print_comparison(results, baseline_path):
+    """이전 결과 대비 변화율 출력"""
+    with open(baseline_path, 'r', encoding='utf-8') as f:
+        baseline = json.load(f).get('results', {})
+    
+    print(f"\n기준 결과 대비 ({baseline_path}):")
+    for name, result in results.items():
+        before = baseline.get(name)
+        if not before:
+            continue
+        changes = []
+        for key in ('p50_ms', 'p99_ms', 'throughput_ops'):
+            if before.get(key):
+                changes.append(f"{key} {(result[key] - before[key]) / before[key] * 100:+.1f}%")
+        print(f"  {name:<16} " + "  ".join(changes))
+
+def main():
+    parser = argparse.ArgumentParser(description="Database 벤치마크 / 소크 테스트")
+    parser.add_argument('--tickets', type=int, default=100_000, help="적재할 티켓 수")
+    parser.add_argument('--logs', type=int, default=1_000_000, help="적재할 로그 행 수")
+    parser.add_argument('--transcripts', type=int, default=2_000, help="적재할 트랜스크립트 수")
+    parser.add_argument('--transcript-kb', type=int, default=256, help="트랜스크립트 하나의 크기 (KB)")
+    parser.add_argument('--open-ratio', type=float, default=0.01, help="열린 티켓 비율")
+    parser.add_argument('--ops', type=int, default=2_000, help="작업당 실행 횟수")
+    parser.add_argument('--concurrency', type=int, default=16, help="동시 실행 수")
+    parser.add_argument('--soak-seconds', type=int, default=0, help="혼합 작업 소크 테스트 시간 (초)")
+    parser.add_argument('--output', help="결과 JSON 파일 경로")
+    parser.add_argument('--baseline', help="비교할 이전 결과 JSON 파일 경로")
+    args = parser.parse_args()
+    
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        seed_time, results = asyncio.run(run_benchmark(args, os.path.join(tmp_dir, 'bench.db')))
+    
+    report = {
+        'environment': {
+            'python': platform.python_version(),
+            'sqlite': sqlite3.sqlite_version,
+            'platform': platform.platform()
+        },
+        'parameters': {
+            key: getattr(args, key)
+            for key in ('tickets', 'logs', 'transcripts', 'transcript_kb', 'open_ratio', 'ops', 'concurrency', 'soak_seconds')
+        },
+        'seed_seconds': round(seed_time, 1),
+        'results': results
+    }
+    
+    if args.output:
+        os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2, sort_keys=True, ensure_ascii=False)
+            f.write('\n')
+        print(f"\n결과 저장: {args.output}")
+    
+    if args.baseline:
+        print_comparison(results, args.baseline)
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,240 @@
+"""utils.transcript 렌더링 벤치마크
+
+저장소 루트에서 실행:
+    python -m benchmarks.bench_transcript --output bench/transcript.json
+    python -m benchmarks.bench_transcript --scales 100 1000   # 빠른 확인용
+
+티켓 종료 시 실제로 사용하는 경로를 측정합니다.
+  bodies        render_payload_bodies (기록된 페이로드 렌더링, 워커 프로세스에서 실행되는 함수)
+  build_cold    TranscriptCapture.build_transcript, 캐시 없음 (DB 조회 + 렌더링 + 헤더/푸터)
+  build_cached  TranscriptCapture.build_transcript, 이전 결과가 캐시된 상태에서 새 메시지 CACHED_NEW_MESSAGES개만 추가
+
+규모마다 별도 프로세스에서 실행하여 최대 RSS가 서로 섞이지 않게 합니다.
+메시지당 시간(us_per_message)이 규모에 따라 커지면 렌더러에 이차 동작이 생긴 것입니다.
+--baseline으로 이전 결과 파일을 지정하면 변화율도 함께 출력합니다.
+"""
+import argparse
+import asyncio
+import datetime
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from types import SimpleNamespace
+
+import discord
+
+from utils.database import Database
+from utils.transcript import TranscriptCapture, TranscriptMessage, render_payload_bodies
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+DEFAULT_SCALES = (100, 10_000, 100_000)
+PATHS = ('bodies', 'build_cold', 'build_cached')
+# build_cached에서 캐시 이후 새로 추가되는 메시지 수
+CACHED_NEW_MESSAGES = 10
+
+CONTENTS = (
+    "안녕하세요, 티켓 관련 문의드립니다.",
+    "**중요**: 서버 접속이 안 됩니다. `ping` 결과를 첨부합니다.\n다시 확인 부탁드립니다.",
+    "<@123456789012345678> 확인 부탁드립니다 <:check:987654321098765432>",
+    "```python\nprint('hello')\nfor i in range(10):\n    print(i)\n```",
+    "로그를 보니 `ConnectionResetError`가 반복해서 발생합니다. " * 4,
+    "감사합니다!"
+)
+
+class SyntheticAvatar:
+    """discord.Asset 대용 (from_message에서 쓰는 속성만 제공)"""
+    
+    def __init__(self, key):
+        self.key = key
+        self.url = f"https://cdn.discordapp.com/avatars/0/{key}.png?size=128"
+    
+    def with_format(self, _):
+        return self
+    
+    def with_size(self, _):
+        return self
+
+def make_message(index, start):
+    """embed, 첨부파일, 시스템 메시지가 섞인 합성 메시지"""
+    author_index = index % 7
+    author = SimpleNamespace(
+        display_name=f"사용자{author_index}",
+        discriminator=f"{author_index:04d}",
+        display_avatar=SyntheticAvatar(f"a_{author_index:032x}")
+    )
+    
+    attachments = []
+    if index % 5 == 0:
+        attachments.append(SimpleNamespace(
+            filename=f"screenshot_{index}.png",
+            size=150_000 + index,
+            url=f"https://cdn.discordapp.com/attachments/0/{index}/screenshot_{index}.png"
+        ))
+    
+    embeds = []
+    if index % 7 == 0:
+        embeds.append(SimpleNamespace(title=f"알림 {index}", description="자동으로 생성된 임베드 설명입니다.\n두 번째 줄"))
+    
+    return SimpleNamespace(
+        id=10**17 + index,
+        type=discord.MessageType.pins_add if index % 50 == 49 else discord.MessageType.default,
+        system_content=f"{author.display_name}님이 메시지를 고정했습니다.",
+        created_at=start + datetime.timedelta(seconds=index),
+        author=author,
+        content=CONTENTS[index % len(CONTENTS)],
+        attachments=attachments,
+        embeds=embeds
+    )
+
+class SyntheticChannel:
+    """build_transcript에서 쓰는 속성만 제공하는 합성 채널 (길드 없음)"""
+    
+    def __init__(self, name, count):
+        self.name = name
+        self.id = 1
+        self.count = count
+        self.start = datetime.datetime(2025, 1, 1)
+    
+    def payloads(self, start=0, stop=None):
+        return [
+            (10**17 + index, TranscriptMessage.from_message(make_message(index, self.start)).dumps())
+            for index in range(start, self.count if stop is None else stop)
+        ]
+
+def peak_rss_mb():
+    """현재 프로세스의 최대 RSS (MB)"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # macOS는 바이트, Linux는 KB 단위
+    return round(peak / (1024 * 1024 if sys.platform == 'darwin' else 1024), 1)
+
+async def measure_build(channel, cached):
+    """기록된 메시지로 build_transcript 실행 시간 측정 (메시지 기록 시간은 제외)"""
+    with tempfile.TemporaryDirectory() as directory:
+        db = Database(os.path.join(directory, 'bench.db'), archive_dir=os.path.join(directory, 'archive'))
+        await db.setup()
+        # 렌더링 시간과 RSS가 이 프로세스에 잡히도록 워커 프로세스를 쓰지 않음, 캐시는 규모와 관계없이 유지
+        capture = TranscriptCapture(db, render_workers=0, cache_max_bytes=2**40)
+        capture.start(channel.id)
+        
+        cached_count = max(0, channel.count - CACHED_NEW_MESSAGES) if cached else 0
+        if cached_count:
+            await db.capture_messages(channel.id, channel.payloads(stop=cached_count))
+            await capture.build_transcript(channel)
+        await db.capture_messages(channel.id, channel.payloads(start=cached_count))
+        
+        start = time.perf_counter()
+        transcript = await capture.build_transcript(channel)
+        return time.perf_counter() - start, transcript.html, transcript.text
+
+def measure(path, count):
+    """한 가지 경로와 규모를 측정 (워커 프로세스에서 실행)"""
+    channel = SyntheticChannel(f"ticket-{count}", count)
+    baseline_rss = peak_rss_mb()
+    
+    if path == 'bodies':
+        # 직렬화된 페이로드 렌더링 (페이로드 준비 시간은 제외)
+        payloads = [payload for _, payload in channel.payloads()]
+        start = time.perf_counter()
+        html, text = render_payload_bodies(payloads)
+        wall_time = time.perf_counter() - start
+    else:
+        wall_time, html, text = asyncio.run(measure_build(channel, cached=path == 'build_cached'))
+    
+    return {
+        'messages': count,
+        'wall_seconds': round(wall_time, 4),
+        'us_per_message': round(wall_time / count * 1_000_000, 2),
+        'peak_rss_mb': peak_rss_mb(),
+        'baseline_rss_mb': baseline_rss,
+        'html_bytes': len(html),
+        'text_bytes': len(text)
+    }
+
+def run_worker(path, count):
+    """새 인터프리터에서 measure()를 실행하고 결과 반환"""
+    output = subprocess.run(
+        [sys.executable, '-m', 'benchmarks.bench_transcript', '--worker', path, str(count)],
+        check=True,
+        capture_output=True,
+        text=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+def print_comparison(results, baseline_path):
+    """이전 결과 대비 변화율 출력"""
+    with open(baseline_path, 'r', encoding='utf-8') as f:
+        baseline = json.load(f).get('results', {})
+    
+    print(f"\n기준 결과 대비 ({baseline_path}):")
+    for name, result in results.items():
+        before = baseline.get(name)
+        if not before:
+            continue
+        changes = []
+        for key in ('us_per_message', 'peak_rss_mb', 'html_bytes', 'text_bytes'):
+            if before.get(key) and result.get(key) is not None:
+                changes.append(f"{key} {(result[key] - before[key]) / before[key] * 100:+.1f}%")
+        print(f"  {name:<20} " + "  ".join(changes))
+
+def main():
+    parser = argparse.ArgumentParser(description="트랜스크립트 렌더링 벤치마크")
+    parser.add_argument('--scales', type=int, nargs='+', default=list(DEFAULT_SCALES), help="측정할 메시지 수")
+    parser.add_argument('--paths', nargs='+', choices=PATHS, default=list(PATHS), help="측정할 렌더링 경로")
+    parser.add_argument('--output', help="결과 JSON 파일 경로")
+    parser.add_argument('--baseline', help="비교할 이전 결과 JSON 파일 경로")
+    parser.add_argument('--worker', nargs=2, metavar=('PATH', 'COUNT'), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    
+    if args.worker:
+        print(json.dumps(measure(args.worker[0], int(args.worker[1]))))
+        return
+    
+    results = {}
+    for path in args.paths:
+        print(f"{path}:")
+        previous = None
+        for count in args.scales:
+            result = run_worker(path, count)
+            results[f"{path}_{count}"] = result
+            
+            # 메시지당 시간이 규모와 함께 늘어나는지 표시
+            growth = f"  x{result['us_per_message'] / previous:.2f}/msg" if previous else ""
+            previous = result['us_per_message']
+            print(
+                f"  {count:>8} msgs  {result['wall_seconds']:>8.3f}s  {result['us_per_message']:>8.2f}us/msg  "
+                f"RSS {result['peak_rss_mb']}MB  HTML {result['html_bytes'] / 1024:,.0f}KB  "
+                f"텍스트 {result['text_bytes'] / 1024:,.0f}KB{growth}"
+            )
+    
+    report = {
+        'environment': {
+            'python': platform.python_version(),
+            'discord.py': discord.__version__,
+            'platform': platform.platform()
+        },
+        'parameters': {'scales': args.scales, 'paths': args.paths},
+        'results': results
+    }
+    
+    if args.output:
+        os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2, sort_keys=True, ensure_ascii=False)
+            f.write('\n')
+        print(f"\n결과 저장: {args.output}")
+    
+    if args.baseline:
+        print_comparison(results, args.baseline)
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,25 +1,88 @@
 import discord
-from discord.ext import commands
+from discord.ext import commands, tasks
 from discord import app_commands
 import datetime
+import asyncio
 import aiosqlite
+import logging
+from typing import Union
 from utils.permissions import is_support_staff
 
+logger = logging.getLogger(__name__)
+
 class AdminCommands(commands.Cog):
     """관리자 명령어 클래스"""
     
     def __init__(self, bot):
         self.bot = bot
+        self.archive_config = bot.config.get('archive', {})
+        self.archive_lock = asyncio.Lock()
+    
+    async def cog_load(self):
+        """Cog 로드 시 실행"""
+        if self.archive_config.get('enabled', False):
+            self.archive_old_tickets.change_interval(hours=self.archive_config.get('interval_hours', 6))
+            self.archive_old_tickets.start()
+    
+    async def cog_unload(self):
+        """Cog 언로드 시 실행"""
+        if self.archive_old_tickets.is_running():
+            self.archive_old_tickets.cancel()
+    
+    async def run_archive(self, older_than_days):
+        """오래된 종료 티켓을 작은 배치 단위로 보관"""
+        batch_size = self.archive_config.get('batch_size', 100)
+        total = 0
+        async with self.archive_lock:
+            while True:
+                archived = await self.bot.db.archive_closed_tickets(older_than_days, batch_size)
+                total += archived
+                if archived < batch_size:
+                    break
+                # 배치 사이에 다른 작업이 실행될 수 있도록 양보
+                await asyncio.sleep(1)
+        return total
+    
+    @tasks.loop(hours=6)
+    async def archive_old_tickets(self):
+        """주기적으로 오래된 종료 티켓 보관"""
+        try:
+            total = await self.run_archive(self.archive_config.get('retention_days', 30))
+            if total:
+                logger.info(f"오래된 티켓 {total}개 보관 완료")
+        except Exception as e:
+            logger.error(f"티켓 보관 작업 실패: {e}")
+    
+    @archive_old_tickets.before_loop
+    async def before_archive_old_tickets(self):
+        """태스크 시작 전 봇이 준비될 때까지 대기"""
+        await self.bot.wait_until_ready()
+    
+    @app_commands.command(name="clearold", description="오래된 종료 티켓을 보관 파일로 이동합니다")
+    @app_commands.default_permissions(administrator=True)
+    async def clear_old(self, interaction: discord.Interaction, days: app_commands.Range[int, 1] = None):
+        """오래된 티켓 보관"""
+        days = days or self.archive_config.get('retention_days', 30)
+        
+        await interaction.response.defer(ephemeral=True)
+        
+        total = await self.run_archive(days)
+        
+        embed = discord.Embed(
+            title="🗄️ 오래된 티켓 보관 완료",
+            description=f"{days}일 이전에 종료된 티켓 {total}개를 보관했습니다.",
+            color=discord.Color.green()
+        )
+        await interaction.followup.send(embed=embed, ephemeral=True)
     
     @app_commands.command(name="forceclose", description="티켓을 강제로 종료합니다")
     @app_commands.default_permissions(manage_channels=True)
-    async def force_close(self, interaction: discord.Interaction, channel: discord.TextChannel = None):
+    async def force_close(self, interaction: discord.Interaction, channel: Union[discord.TextChannel, discord.Thread] = None):
         """강제 종료"""
         target_channel = channel or interaction.channel
         
         # 티켓 채널인지 확인
-        ticket_prefix = self.bot.config['bot_settings']['ticket_prefix']
-        if not target_channel.name.startswith(ticket_prefix):
+        if not self.bot.db.is_ticket_channel(target_channel.id):
             await interaction.response.send_message("이것은 티켓 채널이 아닙니다.", ephemeral=True)
             return
         
@@ -31,43 +94,73 @@ class AdminCommands(commands.Cog):
             await interaction.followup.send("이 채널의 티켓 정보를 찾을 수 없습니다.", ephemeral=True)
             return
         
-        # 트랜스크립트 생성
-        from utils.transcript import TranscriptGenerator
-        html_file, text_file, message_count = await TranscriptGenerator.save_transcript(target_channel)
-        
-        # 데이터베이스 업데이트
-        await self.bot.db.close_ticket(target_channel.id, interaction.user.id)
-        await self.bot.db.add_ticket_log(
-            ticket['id'], 
-            'force_closed', 
-            interaction.user.id,
-            {'reason': 'Admin force close'}
+        await self.bot.ticket_closer.close(
+            target_channel,
+            interaction.user,
+            forced=True,
+            details={'reason': 'Admin force close'},
+            delete_delay=0
         )
         
-        # 트랜스크립트 저장
-        with open(text_file.fp.name, 'rb') as f:
-            content = f.read().decode('utf-8')
-            await self.bot.db.save_transcript(ticket['id'], content)
-        
-        # 로그 채널에 기록
-        log_channel = interaction.guild.get_channel(self.bot.log_channel_id)
-        if log_channel:
-            log_embed = discord.Embed(
-                title="관리자 강제 종료",
-                color=discord.Color.orange()
-            )
-            log_embed.add_field(name="티켓 채널", value=target_channel.name, inline=True)
-            log_embed.add_field(name="종료자", value=interaction.user.mention, inline=True)
-            log_embed.add_field(name="티켓 생성자", value=f"<@{ticket['user_id']}>", inline=True)
-            log_embed.timestamp = datetime.datetime.now()
-            
-            await log_channel.send(embed=log_embed)
-        
-        # 채널 삭제
-        await target_channel.delete(reason=f"강제 종료 - {interaction.user}")
-        
         if interaction.channel != target_channel:
             await interaction.followup.send(f"티켓 {target_channel.name}이 강제로 종료되었습니다.")
 
+    def _ticket_type_label(self, ticket_type):
+        """티켓 유형 표시 이름"""
+        info = next((t for t in self.bot.config['ticket_types'] if t['category'] == ticket_type), None)
+        return f"{info['emoji']} {info['name']}" if info else ticket_type
+    
+    @app_commands.command(name="activetickets", description="활성 티켓 목록을 확인합니다")
+    @app_commands.default_permissions(manage_channels=True)
+    async def active_tickets(self, interaction: discord.Interaction):
+        """활성 티켓 목록"""
+        open_tickets = self.bot.db.open_tickets
+        
+        embed = discord.Embed(
+            title="📋 활성 티켓 목록",
+            description=f"현재 열린 티켓: {len(open_tickets)}개",
+            color=discord.Color.blue()
+        )
+        
+        lines = [
+            f"<#{ticket['channel_id']}> - <@{ticket['user_id']}> ({self._ticket_type_label(ticket['ticket_type'])})"
+            for ticket in sorted(open_tickets.values(), key=lambda t: t['id'])[:15]
+        ]
+        if len(open_tickets) > 15:
+            lines.append(f"... 외 {len(open_tickets) - 15}개")
+        embed.add_field(name="티켓", value="\n".join(lines) or "없음", inline=False)
+        
+        embed.timestamp = datetime.datetime.now()
+        await interaction.response.send_message(embed=embed, ephemeral=True)
+    
+    @app_commands.command(name="ticketstatsall", description="서버 전체 티켓 통계를 확인합니다")
+    @app_commands.default_permissions(administrator=True)
+    async def ticket_stats_all(self, interaction: discord.Interaction):
+        """서버 전체 통계"""
+        stats = await self.bot.db.get_ticket_stats()
+        
+        embed = discord.Embed(
+            title="📊 서버 전체 티켓 통계",
+            color=discord.Color.blue()
+        )
+        embed.add_field(name="열린 티켓", value=f"{stats['open']}개", inline=True)
+        embed.add_field(name="전체 생성", value=f"{stats['created']}개", inline=True)
+        embed.add_field(name="전체 종료", value=f"{stats['closed']}개", inline=True)
+        
+        type_lines = [
+            f"{self._ticket_type_label(row['ticket_type'])}: {row['open_count']}개 열림 / {row['total_count']}개 전체"
+            for row in stats['by_type']
+        ]
+        embed.add_field(name="유형별", value="\n".join(type_lines) or "없음", inline=False)
+        
+        daily_lines = [f"{row['day']}: 생성 {row['created']} / 종료 {row['closed']}" for row in stats['daily']]
+        embed.add_field(name="최근 7일", value="\n".join(daily_lines) or "없음", inline=False)
+        
+        staff_lines = [f"<@{row['user_id']}>: {row['claims']}건" for row in stats['staff']]
+        embed.add_field(name="담당 순위", value="\n".join(staff_lines) or "없음", inline=False)
+        
+        embed.timestamp = datetime.datetime.now()
+        await interaction.response.send_message(embed=embed, ephemeral=True)
+
 async def setup(bot):
     await bot.add_cog(AdminCommands(bot))
\ No newline at end of file
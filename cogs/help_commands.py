@@ -42,7 +42,7 @@ class HelpCommands(commands.Cog):
                 "`/forceclose [채널]` - 티켓 강제 종료\n"
                 "`/ticketinfo [채널]` - 티켓 정보 확인\n"
                 "`/activetickets` - 활성 티켓 목록\n"
-                "`/clearold [일수]` - 오래된 티켓 삭제\n"
+                "`/clearold [일수]` - 오래된 종료 티켓 보관\n"
                 "`/ticketstatsall` - 서버 전체 통계"
             ),
             inline=False
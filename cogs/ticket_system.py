@@ -3,15 +3,75 @@ from discord.ext import commands
 from discord import app_commands
 import datetime
 import asyncio
+import logging
+import math
 from utils.permissions import PermissionManager
-from utils.transcript import TranscriptGenerator
+
+logger = logging.getLogger(__name__)
 
 class TicketSystem(commands.Cog):
     """티켓 시스템 메인 Cog"""
     
     def __init__(self, bot):
         self.bot = bot
-        self.ticket_cooldown = {}
+    
+    @commands.Cog.listener()
+    async def on_ready(self):
+        """자동 배정 상태 로드 후 재시작 동안 놓친 열린 티켓의 메시지 기록 따라잡기"""
+        if self.bot.assigner:
+            await self.bot.assigner.load()
+        
+        capture = self.bot.transcript_capture
+        for channel_id in list(self.bot.db.open_tickets):
+            channel = self.bot.get_channel(channel_id)
+            if not channel or channel_id in capture.live_channels:
+                continue
+            try:
+                await capture.catch_up(channel)
+            except Exception as e:
+                logger.error(f"티켓 메시지 기록 따라잡기 실패 ({channel_id}): {e}")
+    
+    @commands.Cog.listener()
+    async def on_presence_update(self, before: discord.Member, after: discord.Member):
+        """지원팀원 온라인 상태 반영 (자동 배정)"""
+        if self.bot.assigner and before.status != after.status:
+            self.bot.assigner.presence_changed(after)
+    
+    @commands.Cog.listener()
+    async def on_message(self, message: discord.Message):
+        """티켓 채널 메시지 기록"""
+        if self.bot.db.is_ticket_channel(message.channel.id):
+            # 봇이 보낸 메시지(자동 종료 알림 등)는 활동으로 보지 않음
+            if self.bot.inactivity and not message.author.bot:
+                self.bot.inactivity.touch(message.channel.id)
+            await self.bot.transcript_capture.record(message)
+    
+    @commands.Cog.listener()
+    async def on_message_edit(self, before: discord.Message, after: discord.Message):
+        """수정된 티켓 채널 메시지 기록"""
+        if self.bot.db.is_ticket_channel(after.channel.id):
+            await self.bot.transcript_capture.record(after)
+    
+    @commands.Cog.listener()
+    async def on_guild_channel_create(self, channel: discord.abc.GuildChannel):
+        """티켓 카테고리 채널 수 갱신"""
+        self.bot.ticket_categories.channel_created(channel)
+    
+    @commands.Cog.listener()
+    async def on_guild_channel_delete(self, channel: discord.abc.GuildChannel):
+        """티켓 카테고리 채널 수 갱신"""
+        self.bot.ticket_categories.channel_deleted(channel)
+    
+    @commands.Cog.listener()
+    async def on_guild_channel_update(self, before: discord.abc.GuildChannel, after: discord.abc.GuildChannel):
+        """다른 카테고리로 옮겨진 채널 반영"""
+        self.bot.ticket_categories.channel_moved(before, after)
+    
+    @commands.Cog.listener()
+    async def on_raw_message_delete(self, payload: discord.RawMessageDeleteEvent):
+        """삭제된 티켓 채널 메시지 제거 (캐시에 없는 메시지도 처리)"""
+        if self.bot.db.is_ticket_channel(payload.channel_id):
+            await self.bot.transcript_capture.remove(payload.message_id, payload.channel_id)
     
     @app_commands.command(name="setup", description="티켓 시스템을 설정합니다")
     @app_commands.default_permissions(administrator=True)
@@ -23,7 +83,10 @@ class TicketSystem(commands.Cog):
         log_channel = interaction.guild.get_channel(self.bot.log_channel_id)
         
         missing = []
-        if not category:
+        if self.bot.thread_tickets:
+            if not isinstance(interaction.guild.get_channel(self.bot.ticket_hub_channel_id), discord.TextChannel):
+                missing.append("티켓 허브 채널")
+        elif not category:
             missing.append("티켓 카테고리")
         if not support_role:
             missing.append("지원팀 역할")
@@ -66,16 +129,12 @@ class TicketSystem(commands.Cog):
     async def close_ticket(self, interaction: discord.Interaction):
         """티켓 종료 명령어"""
         # 티켓 채널인지 확인
-        ticket_prefix = self.bot.config['bot_settings']['ticket_prefix']
-        if not interaction.channel.name.startswith(ticket_prefix):
+        if not self.bot.db.is_ticket_channel(interaction.channel.id):
             await interaction.response.send_message("이 명령어는 티켓 채널에서만 사용할 수 있습니다.", ephemeral=True)
             return
         
         # 권한 확인
         ticket = await self.bot.db.get_ticket_by_channel(interaction.channel.id)
-        if not ticket:
-            await interaction.response.send_message("이 티켓 정보를 찾을 수 없습니다.", ephemeral=True)
-            return
         
         # 티켓 소유자 또는 담당자인지 확인
         is_owner = ticket['user_id'] == interaction.user.id
@@ -95,6 +154,37 @@ class TicketSystem(commands.Cog):
         view = TicketCloseConfirmView(self.bot, interaction.user)
         await interaction.response.send_message(embed=embed, view=view)
 
+    @app_commands.command(name="duty", description="티켓 자동 배정 근무 상태를 전환합니다")
+    async def duty(self, interaction: discord.Interaction):
+        """근무 상태 전환 (근무 중이면 새 티켓을 자동으로 배정받음)"""
+        if not self.bot.assigner:
+            await interaction.response.send_message("자동 배정이 꺼져 있습니다.", ephemeral=True)
+            return
+        
+        if not any(role.id == self.bot.support_role_id for role in interaction.user.roles):
+            await interaction.response.send_message("지원팀만 사용할 수 있습니다.", ephemeral=True)
+            return
+        
+        on_duty = interaction.user.id not in self.bot.assigner.on_duty
+        await self.bot.assigner.set_duty(interaction.user.id, on_duty)
+        
+        load = self.bot.assigner.loads.get(interaction.user.id, 0)
+        if on_duty:
+            message = f"🟢 근무를 시작했습니다. 새 티켓이 자동으로 배정됩니다. (현재 담당 중: {load}개)"
+        else:
+            message = f"⚪ 근무를 종료했습니다. 더 이상 새 티켓이 배정되지 않습니다. (현재 담당 중: {load}개)"
+        await interaction.response.send_message(message, ephemeral=True)
+
+def ticket_cooldown_minutes(bot, ticket_type: str = None) -> float:
+    """티켓 생성 쿨다운 (분)
+    
+    ticket_type이 없으면 모든 유형에 적용되는 사용자별 쿨다운, 있으면 그 유형에 추가로 적용되는 cooldown_minutes (없으면 0)
+    """
+    if ticket_type is None:
+        return bot.config.get('ticket_cooldown', {}).get('default_minutes', 5)
+    type_info = next((t for t in bot.config['ticket_types'] if t['category'] == ticket_type), {})
+    return type_info.get('cooldown_minutes', 0)
+
 class TicketCreateView(discord.ui.View):
     """티켓 생성 버튼 View"""
     
@@ -105,16 +195,15 @@ class TicketCreateView(discord.ui.View):
     @discord.ui.button(label="새로운 문의 티켓 생성", style=discord.ButtonStyle.primary, custom_id="create_ticket")
     async def create_ticket(self, interaction: discord.Interaction, button: discord.ui.Button):
         """티켓 생성 버튼"""
-        # 쿨다운 확인 (5분)
-        user_id = interaction.user.id
-        if user_id in self.bot.get_cog('TicketSystem').ticket_cooldown:
-            last_time = self.bot.get_cog('TicketSystem').ticket_cooldown[user_id]
-            if datetime.datetime.now() - last_time < datetime.timedelta(minutes=5):
-                await interaction.response.send_message(
-                    "새 티켓 생성은 5분에 한 번만 가능합니다. 잠시 후 다시 시도해주세요.",
-                    ephemeral=True
-                )
-                return
+        # 사용자별 쿨다운 확인 (유형과 관계없이 적용)
+        remaining = self.bot.cooldowns.remaining(interaction.user.id)
+        if remaining:
+            await interaction.response.send_message(
+                f"새 티켓 생성은 {ticket_cooldown_minutes(self.bot):g}분에 한 번만 가능합니다. "
+                f"{math.ceil(remaining / 60)}분 후 다시 시도해주세요.",
+                ephemeral=True
+            )
+            return
         
         # 티켓 유형 선택 View 표시
         view = TicketTypeSelectView(self.bot)
@@ -152,6 +241,16 @@ class TicketTypeSelectView(discord.ui.View):
         """드롭다운 선택 콜백"""
         selected_type = interaction.data['values'][0]
         
+        # 유형별 쿨다운 확인 (cooldown_minutes가 설정된 유형만)
+        remaining = self.bot.cooldowns.remaining(interaction.user.id, selected_type)
+        if remaining:
+            await interaction.response.send_message(
+                f"이 유형의 티켓은 {ticket_cooldown_minutes(self.bot, selected_type):g}분에 한 번만 생성할 수 있습니다. "
+                f"{math.ceil(remaining / 60)}분 후 다시 시도해주세요.",
+                ephemeral=True
+            )
+            return
+        
         # 선택한 유형으로 모달 표시
         modal = TicketDetailsModal(self.bot, selected_type)
         await interaction.response.send_modal(modal)
@@ -177,52 +276,139 @@ class TicketDetailsModal(discord.ui.Modal):
     
     async def on_submit(self, interaction: discord.Interaction):
         """모달 제출 시"""
-        # 티켓 채널 생성
-        guild = interaction.guild
-        category = guild.get_channel(self.bot.ticket_category_id)
+        # 3초 응답 제한 안에 먼저 응답하고, 결과는 나중에 같은 메시지를 수정해 알림
+        await interaction.response.defer(ephemeral=True, thinking=True)
         
-        if not category:
-            await interaction.response.send_message("티켓 카테고리를 찾을 수 없습니다. 관리자에게 문의하세요.", ephemeral=True)
-            return
+        guild = interaction.guild
         
         # 지원팀 역할 확인
         support_role = guild.get_role(self.bot.support_role_id)
         if not support_role:
-            await interaction.response.send_message("지원팀 역할을 찾을 수 없습니다. 관리자에게 문의하세요.", ephemeral=True)
+            await interaction.edit_original_response(content="지원팀 역할을 찾을 수 없습니다. 관리자에게 문의하세요.")
             return
         
-        # 티켓 번호 생성
-        ticket_count = len([ch for ch in category.channels if ch.name.startswith(self.bot.config['bot_settings']['ticket_prefix'])])
-        ticket_name = f"{self.bot.config['bot_settings']['ticket_prefix']}{ticket_count + 1:04d}-{interaction.user.name}"
+        # 티켓 번호 할당
+        ticket_number = await self.bot.db.next_ticket_number()
+        ticket_name = f"{self.bot.config['bot_settings']['ticket_prefix']}{ticket_number:04d}-{interaction.user.name}"
         
-        # 채널 생성
-        channel = await category.create_text_channel(
-            name=ticket_name,
-            topic=f"티켓 생성자: {interaction.user.mention} | 유형: {self.ticket_type}"
+        if self.bot.thread_tickets:
+            channel = await self._open_thread(interaction, ticket_name)
+        else:
+            channel = await self._open_channel(interaction, ticket_name, support_role)
+        if channel is None:
+            return
+        
+        self.bot.transcript_capture.start(channel.id)
+        if self.bot.inactivity:
+            self.bot.inactivity.touch(channel.id)
+        
+        # 쿨다운 설정
+        self.bot.cooldowns.set(interaction.user.id, ticket_cooldown_minutes(self.bot) * 60)
+        self.bot.cooldowns.set(interaction.user.id, ticket_cooldown_minutes(self.bot, self.ticket_type) * 60, self.ticket_type)
+        
+        # 선택한 티켓 유형 정보 찾기
+        ticket_type_info = next((t for t in self.bot.config['ticket_types'] if t['category'] == self.ticket_type), None)
+        
+        # 로그는 작성기에 넘기기만 하고 전송을 기다리지 않음
+        self._post_log(interaction, channel, ticket_type_info)
+        
+        # 채널이 만들어진 뒤의 작업은 서로 의존하지 않으므로 동시에 실행
+        results = await asyncio.gather(
+            self._save_ticket(interaction, channel, ticket_number),
+            self._send_welcome(interaction, channel, support_role, ticket_type_info),
+            return_exceptions=True
         )
+        for step, result in zip(("저장", "환영 메시지"), results):
+            if isinstance(result, Exception):
+                logger.error(f"티켓 생성 중 {step} 실패 ({channel.id}): {result}")
+        
+        if isinstance(results[0], Exception):
+            await interaction.edit_original_response(
+                content=f"티켓 채널 {channel.mention}은 생성되었지만 저장에 실패했습니다. 관리자에게 문의하세요."
+            )
+            return
         
-        # 권한 설정
-        await PermissionManager.setup_channel_permissions(channel, interaction.user, support_role)
+        await interaction.edit_original_response(content=f"티켓이 생성되었습니다! {channel.mention}")
         
-        # 데이터베이스에 티켓 저장
+        # 응답한 뒤 가장 한가한 지원팀원에게 배정
+        if self.bot.assigner:
+            try:
+                await self.bot.assigner.assign(channel, results[0])
+            except discord.HTTPException as e:
+                logger.error(f"티켓 자동 배정 실패 ({channel.id}): {e}")
+    
+    async def _open_channel(self, interaction: discord.Interaction, ticket_name: str, support_role: discord.Role):
+        """티켓 채널 생성 (실패하면 응답을 수정하고 None)"""
+        guild = interaction.guild
+        if not guild.get_channel(self.bot.ticket_category_id):
+            await interaction.edit_original_response(content="티켓 카테고리를 찾을 수 없습니다. 관리자에게 문의하세요.")
+            return None
+        
+        channel_settings = {
+            'name': ticket_name,
+            'topic': f"티켓 생성자: {interaction.user.mention} | 유형: {self.ticket_type}",
+            'overwrites': PermissionManager.ticket_overwrites(guild, interaction.user, support_role)
+        }
+        
+        # 미리 만들어 둔 대기 채널이 있으면 한 번의 수정으로 사용, 없으면 새로 생성 (권한도 같은 요청으로 설정)
+        if self.bot.channel_pool:
+            channel = await self.bot.channel_pool.claim(**channel_settings)
+            if channel is not None:
+                return channel
+        
+        try:
+            # 기본 카테고리가 가득 차면 추가 카테고리에 생성
+            return await self.bot.ticket_categories.create_text_channel(**channel_settings)
+        except (discord.HTTPException, RuntimeError) as e:
+            logger.error(f"티켓 채널 생성 실패: {e}")
+            await interaction.edit_original_response(content="티켓 채널을 생성하지 못했습니다. 잠시 후 다시 시도해주세요.")
+            return None
+    
+    async def _open_thread(self, interaction: discord.Interaction, ticket_name: str):
+        """티켓 허브 채널 아래 비공개 스레드 생성 (실패하면 응답을 수정하고 None)
+        
+        권한 수정이 필요 없고 채널 수 제한에도 포함되지 않음
+        지원팀은 환영 메시지의 역할 멘션으로 스레드에 추가됨
+        """
+        hub = interaction.guild.get_channel(self.bot.ticket_hub_channel_id)
+        if not isinstance(hub, discord.TextChannel):
+            await interaction.edit_original_response(content="티켓 허브 채널을 찾을 수 없습니다. 관리자에게 문의하세요.")
+            return None
+        
+        try:
+            thread = await hub.create_thread(
+                name=ticket_name,
+                type=discord.ChannelType.private_thread,
+                invitable=False,
+                auto_archive_duration=self.bot.config.get('ticket_threads', {}).get('auto_archive_minutes', 10080),
+                reason=f"티켓 생성 - {interaction.user}"
+            )
+            await thread.add_user(interaction.user)
+        except discord.HTTPException as e:
+            logger.error(f"티켓 스레드 생성 실패: {e}")
+            await interaction.edit_original_response(content="티켓을 생성하지 못했습니다. 잠시 후 다시 시도해주세요.")
+            return None
+        return thread
+    
+    async def _save_ticket(self, interaction: discord.Interaction, channel: discord.TextChannel, ticket_number: int):
+        """데이터베이스에 티켓 저장 후 생성 로그 기록"""
         ticket_id = await self.bot.db.create_ticket(
             channel.id,
             interaction.user.id,
-            self.ticket_type
+            self.ticket_type,
+            ticket_number
         )
-        
-        # 쿨다운 설정
-        self.bot.get_cog('TicketSystem').ticket_cooldown[interaction.user.id] = datetime.datetime.now()
-        
-        # 환영 메시지
+        await self.bot.db.add_ticket_log(ticket_id, 'created', interaction.user.id)
+        return ticket_id
+    
+    async def _send_welcome(self, interaction: discord.Interaction, channel: discord.TextChannel, support_role: discord.Role, ticket_type_info):
+        """환영 메시지와 티켓 제어 버튼 전송"""
         welcome_embed = discord.Embed(
             title=f"새로운 티켓이 생성되었습니다",
             description=self.bot.config['ticket_messages']['welcome'].format(user=interaction.user.mention),
             color=discord.Color.from_str(self.bot.config['bot_settings']['embed_color'])
         )
         
-        # 선택한 티켓 유형 정보 찾기
-        ticket_type_info = next((t for t in self.bot.config['ticket_types'] if t['category'] == self.ticket_type), None)
         if ticket_type_info:
             welcome_embed.add_field(name="티켓 유형", value=f"{ticket_type_info['emoji']} {ticket_type_info['name']}", inline=True)
         
@@ -233,33 +419,27 @@ class TicketDetailsModal(discord.ui.Modal):
         # 티켓 제어 버튼
         view = TicketControlView(self.bot)
         
-        await channel.send(
+        message = await channel.send(
             f"{interaction.user.mention} {support_role.mention}",
             embed=welcome_embed,
             view=view
         )
         
-        # 로그
-        await self.bot.db.add_ticket_log(ticket_id, 'created', interaction.user.id)
-        
-        # 로그 채널에 기록
-        log_channel = guild.get_channel(self.bot.log_channel_id)
-        if log_channel:
-            log_embed = discord.Embed(
-                title="새로운 티켓 생성",
-                color=discord.Color.green()
-            )
-            log_embed.add_field(name="생성자", value=interaction.user.mention, inline=True)
-            log_embed.add_field(name="티켓 채널", value=channel.mention, inline=True)
-            log_embed.add_field(name="유형", value=f"{ticket_type_info['emoji']} {ticket_type_info['name']}" if ticket_type_info else self.ticket_type, inline=True)
-            log_embed.timestamp = datetime.datetime.now()
-            
-            await log_channel.send(embed=log_embed)
-        
-        await interaction.response.send_message(
-            f"티켓이 생성되었습니다! {channel.mention}",
-            ephemeral=True
+        # 티켓 저장과 동시에 보내므로 on_message보다 먼저 레지스트리에 없을 수 있어 직접 기록
+        await self.bot.transcript_capture.record(message)
+    
+    def _post_log(self, interaction: discord.Interaction, channel: discord.TextChannel, ticket_type_info):
+        """로그 채널에 기록 (로그 작성기로 전송)"""
+        log_embed = discord.Embed(
+            title="새로운 티켓 생성",
+            color=discord.Color.green()
         )
+        log_embed.add_field(name="생성자", value=interaction.user.mention, inline=True)
+        log_embed.add_field(name="티켓 채널", value=channel.mention, inline=True)
+        log_embed.add_field(name="유형", value=f"{ticket_type_info['emoji']} {ticket_type_info['name']}" if ticket_type_info else self.ticket_type, inline=True)
+        log_embed.timestamp = datetime.datetime.now()
+        
+        self.bot.log_writer.post(embed=log_embed)
 
 class TicketControlView(discord.ui.View):
     """티켓 제어 버튼 View"""
@@ -282,11 +462,14 @@ class TicketControlView(discord.ui.View):
             await interaction.response.send_message("티켓 정보를 찾을 수 없습니다.", ephemeral=True)
             return
         
-        # 채널 주제 업데이트
-        current_topic = interaction.channel.topic or ""
-        if "담당자:" not in current_topic:
-            new_topic = f"{current_topic} | 담당자: {interaction.user.mention}"
-            await interaction.channel.edit(topic=new_topic)
+        # 채널 주제 업데이트 (스레드는 주제가 없으므로 담당자 기록으로만 확인)
+        is_thread = isinstance(interaction.channel, discord.Thread)
+        current_topic = "" if is_thread else (interaction.channel.topic or "")
+        claimed = ticket['claimed_by'] or "담당자:" in current_topic
+        
+        if not claimed:
+            if not is_thread:
+                await interaction.channel.edit(topic=f"{current_topic} | 담당자: {interaction.user.mention}")
             
             # 담당 알림 임베드
             embed = discord.Embed(
@@ -299,13 +482,20 @@ class TicketControlView(discord.ui.View):
             await interaction.response.send_message(embed=embed)
             
             # 로그
-            await self.bot.db.add_ticket_log(ticket['id'], 'claimed', interaction.user.id)
+            await self.bot.db.claim_ticket(ticket['id'], interaction.user.id)
+            if self.bot.assigner:
+                self.bot.assigner.claimed(interaction.user.id)
         else:
             await interaction.response.send_message("이미 담당자가 배정된 티켓입니다.", ephemeral=True)
     
     @discord.ui.button(label="🔒 티켓 종료", style=discord.ButtonStyle.danger, custom_id="close_ticket_button")
     async def close_ticket(self, interaction: discord.Interaction, button: discord.ui.Button):
         """티켓 종료 버튼"""
+        # 열린 티켓인지 확인 (종료 후 삭제 대기 중인 채널 포함)
+        if not self.bot.db.is_ticket_channel(interaction.channel.id):
+            await interaction.response.send_message("이미 종료되었거나 티켓 채널이 아닙니다.", ephemeral=True)
+            return
+        
         # 권한 확인
         ticket = await self.bot.db.get_ticket_by_channel(interaction.channel.id)
         if not ticket:
@@ -332,14 +522,20 @@ class TicketControlView(discord.ui.View):
     @discord.ui.button(label="💾 트랜스크립트 저장", style=discord.ButtonStyle.secondary, custom_id="save_transcript")
     async def save_transcript(self, interaction: discord.Interaction, button: discord.ui.Button):
         """트랜스크립트 저장 버튼"""
+        # 종료된 티켓에서 기록을 다시 만들면 삭제되지 않는 기록이 남으므로 열린 티켓만 허용
+        if not self.bot.db.is_ticket_channel(interaction.channel.id):
+            await interaction.response.send_message("열린 티켓에서만 트랜스크립트를 저장할 수 있습니다.", ephemeral=True)
+            return
+        
         await interaction.response.defer(ephemeral=True)
         
         # 트랜스크립트 생성
-        html_file, text_file, message_count = await TranscriptGenerator.save_transcript(interaction.channel)
+        transcript = await self.bot.transcript_capture.build_transcript(interaction.channel)
         
-        await interaction.followup.send(
-            f"트랜스크립트가 생성되었습니다. (총 {message_count}개 메시지)",
-            files=[html_file, text_file],
+        await transcript.deliver(
+            interaction.followup,
+            interaction.guild.filesize_limit,
+            content=f"트랜스크립트가 생성되었습니다. (총 {transcript.message_count}개 메시지)",
             ephemeral=True
         )
 
@@ -358,69 +554,9 @@ class TicketCloseConfirmView(discord.ui.View):
             await interaction.response.send_message("이 버튼을 사용할 권한이 없습니다.", ephemeral=True)
             return
         
-        await interaction.response.defer()
-        
-        # 트랜스크립트 생성
-        html_file, text_file, message_count = await TranscriptGenerator.save_transcript(interaction.channel)
-        
-        # 티켓 정보 업데이트
-        ticket = await self.bot.db.get_ticket_by_channel(interaction.channel.id)
-        if ticket:
-            # 데이터베이스 업데이트
-            await self.bot.db.close_ticket(interaction.channel.id, interaction.user.id)
-            await self.bot.db.add_ticket_log(ticket['id'], 'closed', interaction.user.id)
-            
-            # 트랜스크립트 저장
-            with open(text_file.fp.name, 'rb') as f:
-                content = f.read().decode('utf-8')
-                await self.bot.db.save_transcript(ticket['id'], content)
-            
-            # 티켓 생성자에게 DM으로 트랜스크립트 전송
-            if self.bot.config['permissions']['transcript_dm']:
-                try:
-                    user = self.bot.get_user(ticket['user_id'])
-                    if user:
-                        dm_embed = discord.Embed(
-                            title="티켓이 종료되었습니다",
-                            description=f"티켓 채널: {interaction.channel.name}\n대화 내용이 첨부되었습니다.",
-                            color=discord.Color.blue()
-                        )
-                        await user.send(embed=dm_embed, files=[
-                            discord.File(html_file.fp, filename=f"{interaction.channel.name}_transcript.html"),
-                            discord.File(text_file.fp, filename=f"{interaction.channel.name}_transcript.txt")
-                        ])
-                except:
-                    pass
-        
-        # 로그 채널에 기록
-        log_channel = interaction.guild.get_channel(self.bot.log_channel_id)
-        if log_channel:
-            log_embed = discord.Embed(
-                title="티켓 종료",
-                color=discord.Color.red()
-            )
-            log_embed.add_field(name="티켓 채널", value=interaction.channel.name, inline=True)
-            log_embed.add_field(name="종료자", value=interaction.user.mention, inline=True)
-            log_embed.add_field(name="메시지 수", value=f"{message_count}", inline=True)
-            log_embed.timestamp = datetime.datetime.now()
-            
-            await log_channel.send(embed=log_embed, files=[
-                discord.File(html_file.fp, filename=f"{interaction.channel.name}_transcript.html")
-            ])
-        
-        # 종료 메시지
-        close_embed = discord.Embed(
-            title="티켓이 종료되었습니다",
-            description=self.bot.config['ticket_messages']['closed'],
-            color=discord.Color.red()
-        )
-        await interaction.channel.send(embed=close_embed)
-        
-        # 채널 삭제
-        if self.bot.config['permissions']['auto_delete_after_close']:
-            await asyncio.sleep(self.bot.config['permissions']['delete_delay_seconds'])
-        
-        await interaction.channel.delete(reason=f"티켓 종료 - {interaction.user}")
+        # 바로 응답한 뒤 종료 파이프라인 실행 (채널 삭제는 예약됨)
+        await interaction.response.edit_message(content="티켓을 종료하는 중입니다...", embed=None, view=None)
+        await self.bot.ticket_closer.close(interaction.channel, interaction.user)
     
     @discord.ui.button(label="취소", style=discord.ButtonStyle.secondary)
     async def cancel(self, interaction: discord.Interaction, button: discord.ui.Button):
@@ -31,6 +31,7 @@ if not debug_mode:
 intents = discord.Intents.default()
 intents.guilds = True
 intents.members = True  # 멤버 정보 접근에 필요 (특권 인텐트)
+intents.message_content = True  # 티켓 메시지 실시간 기록에 필요 (특권 인텐트)
 
 class TicketBot(commands.Bot):
     def __init__(self):
@@ -43,6 +44,9 @@ class TicketBot(commands.Bot):
             logger.error(f"config.json 로드 실패: {e}")
             sys.exit(1)
         
+        # 온라인 상태로 자동 배정할 때만 (특권 인텐트)
+        intents.presences = self.config.get('auto_assign', {}).get('use_presence', False)
+        
         super().__init__(
             command_prefix=self.config['bot_settings']['prefix'],
             intents=intents,
@@ -56,11 +60,19 @@ class TicketBot(commands.Bot):
             self.ticket_category_id = int(os.getenv('TICKET_CATEGORY_ID'))
             self.support_role_id = int(os.getenv('SUPPORT_ROLE_ID'))
             self.admin_role_id = int(os.getenv('ADMIN_ROLE_ID'))
+            # 스레드 티켓 모드에서 비공개 스레드를 만들 채널 (선택사항)
+            self.ticket_hub_channel_id = int(os.getenv('TICKET_HUB_CHANNEL_ID') or 0)
             logger.info("환경 변수 로드 성공")
         except Exception as e:
             logger.error(f"환경 변수 로드 실패: {e}")
             logger.error("필수 환경 변수가 설정되지 않았습니다. .env 파일을 확인하세요.")
             sys.exit(1)
+        
+        # 채널 대신 허브 채널 아래 비공개 스레드로 티켓 생성
+        self.thread_tickets = self.config.get('ticket_threads', {}).get('enabled', False)
+        if self.thread_tickets and not self.ticket_hub_channel_id:
+            logger.error("스레드 티켓 모드에는 TICKET_HUB_CHANNEL_ID 환경 변수가 필요합니다.")
+            sys.exit(1)
     
     async def setup_hook(self):
         logger.info("setup_hook 시작")
@@ -68,8 +80,126 @@ class TicketBot(commands.Bot):
         # 데이터베이스 초기화
         try:
             from utils.database import Database
-            self.db = Database('tickets.db')
+            archive_config = self.config.get('archive', {})
+            self.db = Database('tickets.db', archive_dir=archive_config.get('directory', 'archive'))
             await self.db.setup()
+            
+            from utils.transcript import TranscriptCapture
+            transcript_config = self.config.get('transcript', {})
+            
+            # 아바타 썸네일 / 요약 카드 (선택사항)
+            self.transcript_images = None
+            image_config = transcript_config.get('images', {})
+            if image_config.get('enabled', False):
+                from utils.images import TranscriptImages
+                self.transcript_images = TranscriptImages(
+                    cache_dir=image_config.get('cache_directory', 'cache/avatars'),
+                    avatar_size=image_config.get('avatar_size', 64),
+                    memory_items=image_config.get('memory_items', 512),
+                    workers=image_config.get('workers', 2),
+                    font_path=image_config.get('font_path') or None
+                )
+            
+            self.transcript_capture = TranscriptCapture(
+                self.db,
+                render_workers=transcript_config.get('render_workers', 2),
+                process_threshold=transcript_config.get('process_render_threshold', 500),
+                images=self.transcript_images,
+                cache_max_bytes=transcript_config.get('cache_max_mb', 64) * 1024 * 1024,
+                chunk_size=transcript_config.get('render_chunk_size', 1000)
+            )
+            
+            # 첨부파일 번들 (선택사항)
+            self.attachment_archiver = None
+            attachment_config = transcript_config.get('attachments', {})
+            if attachment_config.get('enabled', False):
+                from utils.attachments import AttachmentArchiver
+                self.attachment_archiver = AttachmentArchiver(
+                    store_dir=attachment_config.get('store_directory', 'attachments'),
+                    bundle_dir=attachment_config.get('bundle_directory', 'transcripts'),
+                    max_concurrency=attachment_config.get('max_concurrency', 4),
+                    max_bytes_per_ticket=attachment_config.get('max_mb_per_ticket', 50) * 1024 * 1024,
+                    max_file_bytes=attachment_config.get('max_mb_per_file', 25) * 1024 * 1024,
+                    http=self.http
+                )
+            
+            # 티켓 생성 쿨다운 (크기 제한, 재시작 후에도 유지)
+            from utils.cooldowns import CooldownStore
+            cooldown_config = self.config.get('ticket_cooldown', {})
+            self.cooldowns = CooldownStore(
+                max_entries=cooldown_config.get('max_entries', 10000),
+                path=cooldown_config.get('persist_path', 'cache/cooldowns.json') or None,
+                save_interval=cooldown_config.get('save_interval_seconds', 60)
+            )
+            self.cooldowns.start()
+            
+            # 로그 채널 전송을 모아서 보내는 작성기 (티켓 흐름이 로그 전송을 기다리지 않음)
+            from utils.log_writer import LogWriter
+            self.log_writer = LogWriter(self, window=self.config.get('log_writer', {}).get('window_seconds', 2))
+            self.log_writer.start()
+            
+            # 재시작 후에도 남는 지연 작업 큐 (채널 삭제, 트랜스크립트 DM, 로그 게시)
+            from utils.job_queue import JobQueue
+            queue_config = self.config.get('job_queue', {})
+            self.job_queue = JobQueue(
+                self,
+                workers=queue_config.get('workers', 2),
+                poll_interval=queue_config.get('poll_interval_seconds', 30),
+                visibility_timeout=queue_config.get('visibility_timeout_seconds', 300),
+                max_attempts=queue_config.get('max_attempts', 5),
+                backoff_base=queue_config.get('backoff_base_seconds', 10),
+                backoff_max=queue_config.get('backoff_max_seconds', 900)
+            )
+            
+            from utils.ticket_closer import TicketCloser
+            self.ticket_closer = TicketCloser(self, spool_dir=transcript_config.get('pending_directory', 'transcripts/pending'))
+            self.job_queue.start()
+            
+            # 활동이 없는 티켓 알림 / 자동 종료 (선택사항)
+            self.inactivity = None
+            auto_close_config = self.config.get('auto_close', {})
+            if auto_close_config.get('enabled', False):
+                from utils.inactivity import InactivityMonitor
+                self.inactivity = InactivityMonitor(
+                    self,
+                    remind_after=auto_close_config.get('remind_after_hours', 24) * 3600,
+                    close_after=auto_close_config.get('close_after_hours', 48) * 3600,
+                    tick=auto_close_config.get('tick_seconds', 60)
+                )
+                self.inactivity.start()
+            
+            # 기본 카테고리가 가득 차면 추가 카테고리를 만들어 사용
+            from utils.categories import TicketCategoryManager
+            category_config = self.config.get('ticket_categories', {})
+            self.ticket_categories = TicketCategoryManager(
+                self,
+                max_channels=category_config.get('max_channels', 50),
+                remove_delay=category_config.get('remove_empty_after_seconds', 300)
+            )
+            self.ticket_categories.start()
+            
+            # 지원팀 자동 배정 (선택사항)
+            self.assigner = None
+            assign_config = self.config.get('auto_assign', {})
+            if assign_config.get('enabled', False):
+                from utils.assignment import TicketAssigner
+                self.assigner = TicketAssigner(
+                    self,
+                    use_presence=assign_config.get('use_presence', False),
+                    max_load=assign_config.get('max_open_per_staff', 0)
+                )
+            
+            # 미리 만들어 두는 티켓 채널 풀 (선택사항)
+            self.channel_pool = None
+            pool_config = self.config.get('ticket_pool', {})
+            if pool_config.get('enabled', False) and not self.thread_tickets:
+                from utils.channel_pool import TicketChannelPool
+                self.channel_pool = TicketChannelPool(
+                    self,
+                    size=pool_config.get('size', 5),
+                    refill_delay=pool_config.get('refill_delay_seconds', 1.0)
+                )
+                self.channel_pool.start()
             logger.info("데이터베이스 초기화 성공")
         except Exception as e:
             logger.error(f"데이터베이스 초기화 실패: {e}")
@@ -97,6 +227,29 @@ class TicketBot(commands.Bot):
                     import traceback
                     logger.error(traceback.format_exc())
     
+    async def close(self):
+        # 트랜스크립트 렌더링 워커 프로세스 정리
+        if hasattr(self, 'transcript_capture'):
+            self.transcript_capture.close()
+        if getattr(self, 'attachment_archiver', None):
+            await self.attachment_archiver.close()
+        if getattr(self, 'transcript_images', None):
+            await self.transcript_images.close()
+        if getattr(self, 'channel_pool', None):
+            self.channel_pool.close()
+        if hasattr(self, 'ticket_categories'):
+            self.ticket_categories.close()
+        if getattr(self, 'inactivity', None):
+            self.inactivity.close()
+        if hasattr(self, 'job_queue'):
+            await self.job_queue.close()
+        if hasattr(self, 'cooldowns'):
+            await self.cooldowns.close()
+        # 남은 로그를 보낸 뒤 연결 종료
+        if hasattr(self, 'log_writer'):
+            await self.log_writer.close()
+        await super().close()
+    
     async def on_ready(self):
         logger.info(f'{self.user} 봇이 시작되었습니다!')
         logger.info(f'봇 ID: {self.user.id}')
@@ -134,8 +287,7 @@ class TicketBot(commands.Bot):
                 logger.info(f"  /{command.name} - {command.description}")
             
             # 로그 채널에도 알림
-            log_channel = self.get_channel(self.log_channel_id)
-            if log_channel:
+            if self.get_channel(self.log_channel_id):
                 embed = discord.Embed(
                     title="✅ 봇 시작됨",
                     description=f"총 {len(commands_list)}개의 명령어가 로드되었습니다.",
@@ -147,7 +299,7 @@ class TicketBot(commands.Bot):
                     value="\n".join(commands_list[:10]) + (f"\n... 외 {len(commands_list)-10}개" if len(commands_list) > 10 else ""),
                     inline=False
                 )
-                await log_channel.send(embed=embed)
+                self.log_writer.post(embed=embed)
                 
         except Exception as e:
             logger.error(f'❌ Slash 명령어 동기화 실패: {e}')
@@ -0,0 +1,96 @@
+import hashlib
+import tempfile
+import time
+import unittest
+import zipfile
+from pathlib import Path
+from types import SimpleNamespace
+
+import discord
+
+from utils.attachments import AttachmentArchiver
+
+def signed_url(name: str, expires_at: float) -> str:
+    return f"https://cdn.discordapp.com/attachments/1/2/{name}?ex={int(expires_at):x}&is=0&hm=abc"
+
+class FakeHTTP:
+    """refresh-urls 요청만 처리하는 discord.py HTTPClient 대용"""
+    
+    def __init__(self, fail: bool = False):
+        self.fail = fail
+        self.requests = []
+    
+    async def request(self, route, json=None):
+        self.requests.append((route.path, json))
+        if self.fail:
+            raise discord.HTTPException(SimpleNamespace(status=500, reason="error"), "refresh failed")
+        return {'refreshed_urls': [
+            {'original': url, 'refreshed': url.split('?')[0] + f"?ex={int(time.time()) + 86400:x}&hm=new"}
+            for url in json['attachment_urls']
+        ]}
+
+class AttachmentRefreshTest(unittest.IsolatedAsyncioTestCase):
+    
+    async def asyncSetUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        root = Path(self.directory.name)
+        self.http = FakeHTTP()
+        self.archiver = AttachmentArchiver(store_dir=root / 'attachments', bundle_dir=root / 'transcripts', http=self.http)
+        
+        # CDN 대용: 만료된 서명 URL은 404, 유효한 URL은 내용을 저장소에 기록
+        self.downloaded = []
+        
+        async def download(url):
+            self.downloaded.append(url)
+            if AttachmentArchiver.needs_refresh(url, now=time.time() - AttachmentArchiver.REFRESH_MARGIN):
+                return None
+            data = url.split('?')[0].encode('utf-8')
+            digest = hashlib.sha256(data).hexdigest()
+            path = self.archiver._store_path(digest)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_bytes(data)
+            return digest, len(data)
+        
+        self.archiver._download = download
+    
+    async def asyncTearDown(self):
+        self.directory.cleanup()
+    
+    def test_needs_refresh(self):
+        now = time.time()
+        self.assertFalse(AttachmentArchiver.needs_refresh(signed_url("a.png", now + 3600), now=now))
+        self.assertTrue(AttachmentArchiver.needs_refresh(signed_url("a.png", now - 3600), now=now))
+        self.assertTrue(AttachmentArchiver.needs_refresh(signed_url("a.png", now + 60), now=now))
+        self.assertTrue(AttachmentArchiver.needs_refresh("https://cdn.discordapp.com/attachments/1/2/a.png", now=now))
+    
+    async def test_expired_url_is_refreshed_before_download(self):
+        expired = signed_url("log.txt", time.time() - 2 * 86400)
+        fresh = signed_url("shot.png", time.time() + 3600)
+        
+        bundle = await self.archiver.build_bundle("ticket-1_1", b"<html></html>", [
+            (10, [["log.txt", 100, expired]]),
+            (11, [["shot.png", 100, fresh]])
+        ])
+        
+        self.assertEqual((bundle['archived'], bundle['skipped']), (2, 0))
+        # 만료된 URL만 재발급 요청하고, 다운로드는 재발급된 URL로 함
+        self.assertEqual(self.http.requests, [('/attachments/refresh-urls', {'attachment_urls': [expired]})])
+        self.assertNotIn(expired, self.downloaded)
+        self.assertIn(fresh, self.downloaded)
+        with zipfile.ZipFile(bundle['path']) as archive:
+            self.assertEqual(
+                sorted(archive.namelist()),
+                ['attachments/10_log.txt', 'attachments/11_shot.png', 'transcript.html']
+            )
+    
+    async def test_failed_refresh_counts_expired_url_as_skipped(self):
+        self.http.fail = True
+        expired = signed_url("log.txt", time.time() - 2 * 86400)
+        
+        bundle = await self.archiver.build_bundle("ticket-2_2", b"<html></html>", [(10, [["log.txt", 100, expired]])])
+        
+        self.assertEqual((bundle['archived'], bundle['skipped']), (0, 1))
+        self.assertEqual(self.downloaded, [expired])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,113 @@
+import json
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from utils.cooldowns import CooldownStore
+
+class FakeClock:
+    """time.time() 대용 (직접 진행)"""
+    
+    def __init__(self, now: float = 1_000_000.0):
+        self.now = now
+    
+    def __call__(self):
+        return self.now
+
+class CooldownStoreTest(unittest.IsolatedAsyncioTestCase):
+    
+    def setUp(self):
+        self.clock = FakeClock()
+        patcher = mock.patch('utils.cooldowns.time.time', self.clock)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+    
+    def test_remaining_and_expiry(self):
+        store = CooldownStore()
+        store.set(1, 300)
+        
+        self.clock.now += 100
+        self.assertAlmostEqual(store.remaining(1), 200)
+        self.assertEqual(store.remaining(2), 0)
+        
+        # 만료된 항목은 조회할 때 지움
+        self.clock.now += 200
+        self.assertEqual(store.remaining(1), 0)
+        self.assertEqual(len(store), 0)
+    
+    def test_kinds_are_independent(self):
+        store = CooldownStore()
+        store.set(1, 300)
+        store.set(1, 60, 'bug')
+        
+        self.assertAlmostEqual(store.remaining(1), 300)
+        self.assertAlmostEqual(store.remaining(1, 'bug'), 60)
+        self.assertEqual(store.remaining(1, 'general'), 0)
+    
+    def test_non_positive_ttl_is_not_recorded(self):
+        store = CooldownStore()
+        store.set(1, 0)
+        store.set(2, -5, 'bug')
+        
+        self.assertEqual(len(store), 0)
+    
+    def test_oldest_entry_is_evicted_when_full(self):
+        store = CooldownStore(max_entries=2)
+        store.set(1, 300)
+        store.set(2, 300)
+        # 다시 기록한 항목은 가장 최근 항목이 됨
+        store.set(1, 300)
+        store.set(3, 300)
+        
+        self.assertEqual(len(store), 2)
+        self.assertEqual(store.remaining(2), 0)
+        self.assertGreater(store.remaining(1), 0)
+        self.assertGreater(store.remaining(3), 0)
+    
+    def test_expired_entries_are_dropped_on_set(self):
+        store = CooldownStore()
+        store.set(1, 10)
+        store.set(2, 10)
+        self.clock.now += 60
+        store.set(3, 10)
+        
+        self.assertEqual(len(store), 1)
+    
+    async def test_persisted_entries_are_reloaded(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory) / 'cooldowns.json'
+            store = CooldownStore(path=path)
+            store.start()
+            store.set(1, 300)
+            store.set(1, 30, 'bug')
+            await store.close()
+            
+            saved = json.loads(path.read_text(encoding='utf-8'))
+            self.assertEqual(sorted(saved), [[1, '*', self.clock.now + 300], [1, 'bug', self.clock.now + 30]])
+            
+            # 다시 읽을 때 만료된 항목은 제외
+            self.clock.now += 60
+            reloaded = CooldownStore(path=path)
+            reloaded.start()
+            self.assertEqual(len(reloaded), 1)
+            self.assertAlmostEqual(reloaded.remaining(1), 240)
+            self.assertEqual(reloaded.remaining(1, 'bug'), 0)
+            await reloaded.close()
+    
+    async def test_missing_or_corrupt_file_starts_empty(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory) / 'cooldowns.json'
+            store = CooldownStore(path=path)
+            store.start()
+            self.assertEqual(len(store), 0)
+            await store.close()
+            
+            path.write_text('{not json', encoding='utf-8')
+            store = CooldownStore(path=path)
+            store.start()
+            self.assertEqual(len(store), 0)
+            await store.close()
+
+if __name__ == '__main__':
+    unittest.main()
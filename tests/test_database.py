@@ -0,0 +1,157 @@
+import asyncio
+import tempfile
+import unittest
+from pathlib import Path
+
+import aiosqlite
+
+from utils.database import Database
+
+class DatabaseTestCase(unittest.IsolatedAsyncioTestCase):
+    
+    async def asyncSetUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        root = Path(self.directory.name)
+        self.db_path = str(root / 'tickets.db')
+        self.db = Database(self.db_path, archive_dir=root / 'archive')
+        await self.db.setup()
+    
+    async def asyncTearDown(self):
+        self.directory.cleanup()
+    
+    async def execute(self, query: str, parameters=()):
+        async with aiosqlite.connect(self.db_path) as db:
+            await db.execute(query, parameters)
+            await db.commit()
+
+class TicketStatsTest(DatabaseTestCase):
+    
+    async def create_and_close(self):
+        await self.db.create_ticket(101, 1, 'general')
+        await self.db.create_ticket(102, 2, 'general')
+        ticket_id = await self.db.create_ticket(103, 3, 'bug')
+        await self.db.claim_ticket(ticket_id, 50)
+        await self.db.close_ticket(101, 50)
+        # 이미 종료된 티켓을 다시 종료해도 통계가 바뀌지 않음
+        await self.db.close_ticket(101, 50)
+    
+    def assert_stats(self, stats):
+        self.assertEqual((stats['open'], stats['created'], stats['closed']), (2, 3, 1))
+        self.assertEqual(
+            {row['ticket_type']: (row['open_count'], row['total_count']) for row in stats['by_type']},
+            {'general': (1, 2), 'bug': (1, 1)}
+        )
+        self.assertEqual([(row['created'], row['closed']) for row in stats['daily']], [(3, 1)])
+        self.assertEqual(stats['staff'], [{'user_id': 50, 'claims': 1}])
+    
+    async def test_counters_follow_ticket_lifecycle(self):
+        await self.create_and_close()
+        
+        self.assert_stats(await self.db.get_ticket_stats())
+        self.assertFalse(self.db.is_ticket_channel(101))
+        self.assertTrue(self.db.is_ticket_channel(102))
+    
+    async def test_backfill_matches_incremental_counters(self):
+        await self.create_and_close()
+        for table in ('ticket_stats', 'ticket_type_stats', 'ticket_daily_stats', 'staff_claim_stats'):
+            await self.execute(f'DELETE FROM {table}')
+        
+        # 집계 테이블이 비어 있으면 setup()이 기존 티켓으로 다시 채움
+        await Database(self.db_path, archive_dir=self.db.archive.archive_dir).setup()
+        self.assert_stats(await self.db.get_ticket_stats())
+
+class TicketSequenceTest(DatabaseTestCase):
+    
+    async def test_numbers_are_unique_and_increasing(self):
+        numbers = await asyncio.gather(*(self.db.next_ticket_number() for _ in range(20)))
+        
+        self.assertEqual(sorted(numbers), list(range(1, 21)))
+        self.assertEqual(await self.db.next_ticket_number(), 21)
+    
+    async def test_sequence_starts_after_existing_tickets(self):
+        for channel_id in range(5):
+            await self.db.create_ticket(channel_id, 1, 'general')
+        await self.execute('DELETE FROM ticket_sequence')
+        
+        await Database(self.db_path, archive_dir=self.db.archive.archive_dir).setup()
+        self.assertEqual(await self.db.next_ticket_number(), 6)
+
+class JobLeaseTest(DatabaseTestCase):
+    
+    async def job_row(self, job_id):
+        async with aiosqlite.connect(self.db_path) as db:
+            db.row_factory = aiosqlite.Row
+            cursor = await db.execute('SELECT * FROM jobs WHERE id = ?', (job_id,))
+            return await cursor.fetchone()
+    
+    async def test_job_is_not_claimed_before_run_at(self):
+        await self.db.enqueue_job('test', '{}', run_at=100.0)
+        
+        self.assertIsNone(await self.db.claim_job('lease-1', now=99.0, visibility_timeout=30))
+        self.assertEqual(await self.db.get_next_job_time(), 100.0)
+        
+        job = await self.db.claim_job('lease-1', now=100.0, visibility_timeout=30)
+        self.assertEqual((job['status'], job['lease'], job['attempts']), ('running', 'lease-1', 1))
+    
+    async def test_jobs_are_claimed_in_run_at_order(self):
+        late = await self.db.enqueue_job('test', '{}', run_at=20.0)
+        early = await self.db.enqueue_job('test', '{}', run_at=10.0)
+        
+        self.assertEqual((await self.db.claim_job('a', now=30.0, visibility_timeout=30))['id'], early)
+        self.assertEqual((await self.db.claim_job('b', now=30.0, visibility_timeout=30))['id'], late)
+        self.assertIsNone(await self.db.claim_job('c', now=30.0, visibility_timeout=30))
+    
+    async def test_expired_lease_is_reclaimed(self):
+        job_id = await self.db.enqueue_job('test', '{}', run_at=0.0)
+        await self.db.claim_job('lease-1', now=10.0, visibility_timeout=30)
+        
+        # 임대가 유효한 동안에는 다른 워커가 가져가지 못함
+        self.assertIsNone(await self.db.claim_job('lease-2', now=39.9, visibility_timeout=30))
+        self.assertEqual(await self.db.get_next_job_time(), 40.0)
+        
+        job = await self.db.claim_job('lease-2', now=40.0, visibility_timeout=30)
+        self.assertEqual((job['id'], job['lease'], job['attempts'], job['locked_until']), (job_id, 'lease-2', 2, 70.0))
+    
+    async def test_stale_lease_cannot_finish_job(self):
+        job_id = await self.db.enqueue_job('test', '{}', run_at=0.0)
+        await self.db.claim_job('lease-1', now=10.0, visibility_timeout=30)
+        await self.db.claim_job('lease-2', now=40.0, visibility_timeout=30)
+        
+        # 임대를 잃은 워커의 완료/재시도/실패 처리는 무시됨
+        await self.db.complete_job(job_id, 'lease-1')
+        await self.db.retry_job(job_id, 'lease-1', 100.0, "error")
+        await self.db.fail_job(job_id, 'lease-1', "error")
+        job = await self.job_row(job_id)
+        self.assertEqual((job['status'], job['lease'], job['last_error']), ('running', 'lease-2', None))
+        
+        await self.db.complete_job(job_id, 'lease-2')
+        self.assertIsNone(await self.job_row(job_id))
+        self.assertIsNone(await self.db.get_next_job_time())
+    
+    async def test_retry_and_fail(self):
+        job_id = await self.db.enqueue_job('test', '{}', run_at=0.0)
+        await self.db.claim_job('lease-1', now=10.0, visibility_timeout=30)
+        await self.db.retry_job(job_id, 'lease-1', 50.0, "first error")
+        
+        job = await self.job_row(job_id)
+        self.assertEqual((job['status'], job['lease'], job['run_at'], job['last_error']), ('pending', None, 50.0, "first error"))
+        self.assertIsNone(await self.db.claim_job('lease-2', now=49.0, visibility_timeout=30))
+        
+        await self.db.claim_job('lease-2', now=50.0, visibility_timeout=30)
+        await self.db.fail_job(job_id, 'lease-2', "second error")
+        job = await self.job_row(job_id)
+        self.assertEqual((job['status'], job['attempts'], job['last_error']), ('failed', 2, "second error"))
+        # 실패한 작업은 다시 임대되지 않음
+        self.assertIsNone(await self.db.claim_job('lease-3', now=1000.0, visibility_timeout=30))
+        self.assertIsNone(await self.db.get_next_job_time())
+    
+    async def test_job_transcript_references(self):
+        await self.db.add_job_transcript('123', 2)
+        
+        self.assertEqual(await self.db.release_job_transcript('123'), 1)
+        self.assertEqual(await self.db.release_job_transcript('123'), 0)
+        # 이미 정리된 키를 다시 해제해도 0
+        self.assertEqual(await self.db.release_job_transcript('123'), 0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,70 @@
+import unittest
+
+from utils.inactivity import TimerWheel
+
+def advance_until_expired(wheel: TimerWheel, limit: int) -> list:
+    """limit칸까지 진행하며 (진행한 칸 수, 키, 값) 목록 반환"""
+    expired = []
+    for tick in range(1, limit + 1):
+        expired.extend((tick, key, value) for key, value in wheel.advance())
+    return expired
+
+class TimerWheelTest(unittest.TestCase):
+    
+    def test_expires_after_delay(self):
+        wheel = TimerWheel(tick=60, slots=8)
+        wheel.schedule('a', 180, 'remind')
+        wheel.schedule('b', 150, 'close')
+        
+        # 틱 경계에 걸치지 않는 지연은 다음 틱으로 올림
+        self.assertEqual(advance_until_expired(wheel, 8), [(3, 'a', 'remind'), (3, 'b', 'close')])
+        self.assertEqual(len(wheel), 0)
+    
+    def test_zero_delay_fires_on_next_tick(self):
+        wheel = TimerWheel(tick=60, slots=8)
+        wheel.schedule('a', 0)
+        wheel.schedule('b', -30)
+        
+        self.assertEqual(sorted(key for key, _ in wheel.advance()), ['a', 'b'])
+    
+    def test_delay_longer_than_one_revolution(self):
+        wheel = TimerWheel(tick=1, slots=4)
+        wheel.schedule('exact', 4)
+        wheel.schedule('wrapped', 9)
+        wheel.schedule('far', 13)
+        
+        self.assertEqual(
+            [(tick, key) for tick, key, _ in advance_until_expired(wheel, 16)],
+            [(4, 'exact'), (9, 'wrapped'), (13, 'far')]
+        )
+    
+    def test_schedule_after_advancing_uses_current_position(self):
+        wheel = TimerWheel(tick=1, slots=4)
+        advance_until_expired(wheel, 3)
+        wheel.schedule('a', 6)
+        
+        self.assertEqual([(tick, key) for tick, key, _ in advance_until_expired(wheel, 8)], [(6, 'a')])
+    
+    def test_reschedule_replaces_timer(self):
+        wheel = TimerWheel(tick=1, slots=8)
+        wheel.schedule('a', 2, 'remind')
+        wheel.schedule('a', 5, 'close')
+        
+        self.assertEqual(len(wheel), 1)
+        self.assertEqual(advance_until_expired(wheel, 8), [(5, 'a', 'close')])
+    
+    def test_cancel(self):
+        wheel = TimerWheel(tick=1, slots=8)
+        wheel.schedule('a', 2)
+        wheel.schedule('b', 2)
+        wheel.cancel('a')
+        # 없는 키를 취소해도 오류 없음
+        wheel.cancel('missing')
+        
+        self.assertNotIn('a', wheel)
+        self.assertIn('b', wheel)
+        self.assertEqual([key for _, key, _ in advance_until_expired(wheel, 8)], ['b'])
+        self.assertNotIn('b', wheel)
+
+if __name__ == '__main__':
+    unittest.main()
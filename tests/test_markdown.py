@@ -0,0 +1,91 @@
+import unittest
+from types import SimpleNamespace
+
+from utils.markdown import DiscordMarkdown, collect_mentions
+from utils.transcript import TranscriptMessage, TranscriptRenderer
+
+def message(content: str, author_name: str = "user") -> TranscriptMessage:
+    return TranscriptMessage(1, False, "2024-01-01 00:00:00", author_name, f"{author_name}#0", content, (), ())
+
+class FakeGuild:
+    """ID별 조회 횟수를 세는 discord.Guild 대용"""
+    
+    def __init__(self, members=None, roles=None, channels=None):
+        self.members = members or {}
+        self.roles = roles or {}
+        self.channels = channels or {}
+        self.lookups = []
+    
+    def get_member(self, object_id):
+        self.lookups.append(('member', object_id))
+        name = self.members.get(object_id)
+        return SimpleNamespace(display_name=name) if name else None
+    
+    def get_role(self, object_id):
+        self.lookups.append(('role', object_id))
+        name, color = self.roles.get(object_id, (None, 0))
+        return SimpleNamespace(name=name, color=SimpleNamespace(value=color)) if name else None
+    
+    def get_channel(self, object_id):
+        self.lookups.append(('channel', object_id))
+        name = self.channels.get(object_id)
+        return SimpleNamespace(name=name) if name else None
+
+class DiscordMarkdownTest(unittest.TestCase):
+    
+    def test_content_is_escaped(self):
+        rendered = DiscordMarkdown().render('<script>alert("x")</script>\n&')
+        self.assertEqual(rendered, '&lt;script&gt;alert(&quot;x&quot;)&lt;/script&gt;<br>&amp;')
+    
+    def test_markup_inside_formatting_and_code_is_escaped(self):
+        markdown = DiscordMarkdown()
+        self.assertEqual(markdown.render('**<b>bold</b>**'), '<strong>&lt;b&gt;bold&lt;/b&gt;</strong>')
+        self.assertEqual(markdown.render('`<i>`'), '<code>&lt;i&gt;</code>')
+        self.assertEqual(markdown.render('```\n<img src=x>```'), '<pre><code>&lt;img src=x&gt;</code></pre>')
+        # 이스케이프된 서식 문자는 서식으로 처리하지 않음
+        self.assertEqual(markdown.render(r'\*not italic\*'), '*not italic*')
+    
+    def test_url_cannot_break_out_of_attribute(self):
+        rendered = DiscordMarkdown().render('https://example.com/?q="onmouseover=alert')
+        self.assertNotIn('"onmouseover', rendered)
+        self.assertIn('href="https://example.com/?q=&quot;onmouseover=alert"', rendered)
+    
+    def test_mention_names_are_escaped(self):
+        markdown = DiscordMarkdown({
+            'users': {'1': '<b>evil</b>'},
+            'roles': {'2': ('<i>role</i>', 0xff0000)},
+            'channels': {'3': '"chan"'}
+        })
+        self.assertEqual(markdown.render('<@1>'), '<span class="mention">@&lt;b&gt;evil&lt;/b&gt;</span>')
+        self.assertEqual(markdown.render('<@!1>'), '<span class="mention">@&lt;b&gt;evil&lt;/b&gt;</span>')
+        self.assertEqual(
+            markdown.render('<@&2>'),
+            '<span class="mention" style="color: #ff0000">@&lt;i&gt;role&lt;/i&gt;</span>'
+        )
+        self.assertEqual(markdown.render('<#3>'), '<span class="mention">#&quot;chan&quot;</span>')
+        self.assertEqual(markdown.render('<@9>'), '<span class="mention">@알 수 없는 사용자</span>')
+    
+    def test_author_name_is_escaped(self):
+        renderer = TranscriptRenderer()
+        rendered = renderer.render_html(message("hi", author_name='<img src=x onerror=alert(1)>'))
+        self.assertNotIn('<img src=x', rendered)
+        self.assertIn('&lt;img src=x onerror=alert(1)&gt;', rendered)
+        # 아바타가 없으면 이름 첫 글자를 표시하며, 이 글자도 이스케이프함
+        self.assertIn('<div class="avatar">&lt;</div>', rendered)
+    
+    def test_collect_mentions_looks_up_each_id_once(self):
+        guild = FakeGuild(members={1: "alice"}, roles={2: ("staff", 0x00ff00)}, channels={3: "general"})
+        mentions = collect_mentions(guild, ['<@1> <@!1> <@&2>', '<@1> <#3> <@4>'])
+        
+        self.assertEqual(mentions, {
+            'users': {'1': "alice"},
+            'roles': {'2': ("staff", 0x00ff00)},
+            'channels': {'3': "general"}
+        })
+        self.assertEqual(sorted(guild.lookups), [('channel', 3), ('member', 1), ('member', 4), ('role', 2)])
+    
+    def test_collect_mentions_without_guild(self):
+        self.assertEqual(collect_mentions(None, ['<@1>']), {'users': {}, 'roles': {}, 'channels': {}})
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,98 @@
+import gzip
+import os
+import unittest
+
+from utils.transcript import Transcript
+
+def reassemble(pieces: list) -> bytes:
+    """조각 (파일명, 바이트) 목록을 이어 붙여 압축 해제"""
+    return gzip.decompress(b"".join(data for _, data in pieces))
+
+class FakeDestination:
+    """send()에 넘어온 내용을 기록하는 채널 대용"""
+    
+    def __init__(self):
+        self.sent = []
+    
+    async def send(self, content=None, files=None, **kwargs):
+        self.sent.append((content, [file.filename for file in files], kwargs))
+        return len(self.sent)
+
+class FitTest(unittest.TestCase):
+    
+    def test_small_file_is_unchanged(self):
+        self.assertEqual(Transcript._fit("a.html", b"x" * 100, 100), [("a.html", b"x" * 100)])
+    
+    def test_compressible_file_is_gzipped(self):
+        data = b"<div>message</div>\n" * 1000
+        pieces = Transcript._fit("a.html", data, 1000)
+        
+        self.assertEqual([name for name, _ in pieces], ["a.html.gz"])
+        self.assertEqual(gzip.decompress(pieces[0][1]), data)
+    
+    def test_incompressible_file_is_split(self):
+        data = os.urandom(2500)
+        pieces = Transcript._fit("a.html", data, 1000)
+        
+        self.assertEqual(
+            [name for name, _ in pieces],
+            ["a.html.gz.part001", "a.html.gz.part002", "a.html.gz.part003"]
+        )
+        self.assertTrue(all(len(piece) <= 1000 for _, piece in pieces))
+        self.assertEqual(reassemble(pieces), data)
+
+class UploadBatchesTest(unittest.IsolatedAsyncioTestCase):
+    
+    async def test_batches_respect_size_and_file_limits(self):
+        transcript = Transcript("ticket", os.urandom(2500), os.urandom(1500), 10)
+        extra = [(f"extra{index}.png", b"p" * 10) for index in range(9)]
+        batches, split = await transcript.upload_batches(1000, extra=extra)
+        
+        self.assertTrue(split)
+        # 추가 파일이 첫 메시지부터 먼저 들어감
+        self.assertEqual([name for name, _ in batches[0][:9]], [name for name, _ in extra])
+        for batch in batches:
+            self.assertLessEqual(len(batch), Transcript.MAX_FILES_PER_MESSAGE)
+            self.assertLessEqual(sum(len(data) for _, data in batch), 1000)
+        
+        pieces = [piece for batch in batches for piece in batch]
+        self.assertEqual(reassemble([p for p in pieces if p[0].startswith("ticket_transcript.html")]), transcript.html)
+        self.assertEqual(reassemble([p for p in pieces if p[0].startswith("ticket_transcript.txt")]), transcript.text)
+    
+    async def test_names_containing_part_are_not_reported_as_split(self):
+        transcript = Transcript("release.part1", b"<html></html>", b"text", 1)
+        batches, split = await transcript.upload_batches(1000, extra=[("summary.part.png", b"png")])
+        
+        self.assertFalse(split)
+        self.assertEqual(
+            [name for name, _ in batches[0]],
+            ["summary.part.png", "release.part1_transcript.html", "release.part1_transcript.txt"]
+        )
+    
+    async def test_text_is_optional(self):
+        transcript = Transcript("ticket", b"<html></html>", b"text", 1)
+        batches, _ = await transcript.upload_batches(1000, include_text=False)
+        
+        self.assertEqual(batches, [[("ticket_transcript.html", b"<html></html>")]])
+
+class DeliverTest(unittest.IsolatedAsyncioTestCase):
+    
+    async def test_split_note_only_when_split(self):
+        destination = FakeDestination()
+        await Transcript("a.part1", b"<html></html>", b"text", 1).deliver(destination, 1000, content="done")
+        self.assertEqual(destination.sent[0][0], "done")
+        
+        destination = FakeDestination()
+        await Transcript("ticket", os.urandom(2500), b"text", 1).deliver(
+            destination, 1000, embed="embed", content="done", ephemeral=True
+        )
+        first_content, _, first_kwargs = destination.sent[0]
+        self.assertTrue(first_content.startswith("done\n"))
+        self.assertIn("분할", first_content)
+        self.assertEqual(first_kwargs, {'embed': "embed", 'ephemeral': True})
+        # 두 번째 메시지부터는 임베드 없이 순서만 표시
+        self.assertEqual(destination.sent[1][0], f"트랜스크립트 (2/{len(destination.sent)})")
+        self.assertEqual(destination.sent[1][2], {'ephemeral': True})
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,66 @@
+import asyncio
+import gzip
+import json
+import logging
+import os
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+class TicketArchive:
+    """종료된 티켓을 월 단위 gzip 파일로 보관하는 클래스
+    
+    레코드마다 gzip 멤버 하나로 이어 붙이고, 멤버의 위치(오프셋, 길이)를 DB 인덱스에 저장해
+    조회할 때 파티션 전체가 아니라 해당 멤버만 읽어서 압축을 풂
+    """
+    
+    def __init__(self, archive_dir: str = 'archive'):
+        self.archive_dir = Path(archive_dir)
+    
+    @staticmethod
+    def partition_for(closed_at) -> str:
+        """종료 시각으로 파티션 이름(YYYY-MM) 계산"""
+        return str(closed_at)[:7]
+    
+    def _partition_path(self, partition: str) -> Path:
+        return self.archive_dir / f"tickets-{partition}.jsonl.gz"
+    
+    def _append(self, partition: str, records: list, committed_end: int) -> list:
+        """파티션 파일에 레코드를 gzip 멤버 단위로 추가하고 각 멤버의 (오프셋, 길이) 반환
+        
+        committed_end 뒤의 내용은 DB에 기록되지 못한 이전 시도이므로 잘라낸 뒤 추가함
+        """
+        self.archive_dir.mkdir(parents=True, exist_ok=True)
+        path = self._partition_path(partition)
+        members = [gzip.compress((json.dumps(record, ensure_ascii=False) + '\n').encode('utf-8')) for record in records]
+        
+        with open(path, 'ab') as f:
+            if f.tell() > committed_end:
+                logger.warning(f"보관 파일의 기록되지 않은 끝부분 정리: {path} ({f.tell() - committed_end}바이트)")
+                f.truncate(committed_end)
+            
+            offset = f.seek(0, os.SEEK_END)
+            positions = []
+            for member in members:
+                f.write(member)
+                positions.append((offset, len(member)))
+                offset += len(member)
+            f.flush()
+            os.fsync(f.fileno())
+        return positions
+    
+    def _read_at(self, partition: str, offset: int, length: int):
+        """멤버 하나만 읽어 레코드 반환"""
+        with open(self._partition_path(partition), 'rb') as f:
+            f.seek(offset)
+            return json.loads(gzip.decompress(f.read(length)))
+    
+    async def write(self, partition: str, records: list, committed_end: int) -> list:
+        """레코드를 파티션 파일에 기록하고 멤버 위치 목록 반환 (스레드에서 실행)"""
+        positions = await asyncio.to_thread(self._append, partition, records, committed_end)
+        logger.info(f"티켓 {len(records)}개 보관 파일 기록: {self._partition_path(partition)}")
+        return positions
+    
+    async def read(self, partition: str, offset: int, length: int):
+        """보관된 티켓 레코드 조회 (스레드에서 실행)"""
+        return await asyncio.to_thread(self._read_at, partition, offset, length)
@@ -0,0 +1,140 @@
+import discord
+import datetime
+import heapq
+import itertools
+import logging
+
+logger = logging.getLogger(__name__)
+
+class TicketAssigner:
+    """새 티켓을 열린 티켓이 가장 적은 지원팀원에게 자동 배정
+    
+    근무 중(/duty)이거나 (use_presence일 때) 온라인인 지원팀원을 (담당 중인 티켓 수, 순번) 힙에 넣어 두고
+    배정, 담당, 종료로 바뀐 항목은 새로 넣고 오래된 항목은 꺼낼 때 버림 (배정 O(log n))
+    담당 수가 같으면 가장 오래전에 배정받은 사람이 먼저 받음
+    """
+    
+    def __init__(self, bot, use_presence: bool = False, max_load: int = 0):
+        self.bot = bot
+        self.use_presence = use_presence
+        # 한 사람이 담당할 수 있는 최대 열린 티켓 수 (0이면 제한 없음)
+        self.max_load = max_load
+        
+        # 지원팀원 ID -> 담당 중인 열린 티켓 수
+        self.loads = {}
+        self.on_duty = set()
+        self.online = set()
+        self._heap = []
+        self._order = itertools.count()
+    
+    def is_available(self, user_id: int) -> bool:
+        return user_id in self.on_duty or (self.use_presence and user_id in self.online)
+    
+    def _push(self, user_id: int):
+        if not self.is_available(user_id):
+            return
+        heapq.heappush(self._heap, (self.loads.get(user_id, 0), next(self._order), user_id))
+        
+        # 버려질 항목이 많이 쌓이면 한 번 정리
+        if len(self._heap) > 4 * (len(self.on_duty) + len(self.online)) + 16:
+            self._rebuild()
+    
+    def _rebuild(self):
+        available = self.on_duty | (self.online if self.use_presence else set())
+        self._heap = [(self.loads.get(user_id, 0), next(self._order), user_id) for user_id in available]
+        heapq.heapify(self._heap)
+    
+    def _peek(self):
+        """담당 수가 가장 적은 배정 가능한 지원팀원 (없으면 None)"""
+        while self._heap:
+            load, _, user_id = self._heap[0]
+            if self.is_available(user_id) and self.loads.get(user_id, 0) == load:
+                if self.max_load and load >= self.max_load:
+                    return None
+                return user_id
+            heapq.heappop(self._heap)
+        return None
+    
+    async def load(self):
+        """열린 티켓 담당 수, 근무 상태, 온라인 상태 초기화 (봇 준비 후)"""
+        self.loads = {}
+        for ticket in self.bot.db.open_tickets.values():
+            if ticket.get('claimed_by'):
+                self.loads[ticket['claimed_by']] = self.loads.get(ticket['claimed_by'], 0) + 1
+        
+        self.on_duty = set(await self.bot.db.get_staff_on_duty())
+        self.online = set()
+        if self.use_presence:
+            guild = self.bot.get_guild(self.bot.guild_id)
+            support_role = guild.get_role(self.bot.support_role_id) if guild else None
+            if support_role:
+                self.online = {member.id for member in support_role.members if member.status != discord.Status.offline}
+        
+        self._rebuild()
+        logger.info(f"자동 배정 대상 지원팀원 {len(self.on_duty | self.online)}명")
+    
+    async def set_duty(self, user_id: int, on_duty: bool):
+        """근무 상태 변경 (/duty)"""
+        await self.bot.db.set_staff_duty(user_id, on_duty)
+        if on_duty:
+            self.on_duty.add(user_id)
+            self._push(user_id)
+        else:
+            self.on_duty.discard(user_id)
+    
+    def presence_changed(self, member: discord.Member):
+        """지원팀원 온라인 상태 반영 (on_presence_update)"""
+        if not self.use_presence:
+            return
+        
+        if member.status != discord.Status.offline and any(role.id == self.bot.support_role_id for role in member.roles):
+            if member.id not in self.online:
+                self.online.add(member.id)
+                self._push(member.id)
+        else:
+            self.online.discard(member.id)
+    
+    def claimed(self, user_id: int):
+        """티켓을 담당함 (자동 배정 또는 담당 버튼)"""
+        self.loads[user_id] = self.loads.get(user_id, 0) + 1
+        self._push(user_id)
+    
+    def released(self, user_id: int):
+        """담당하던 티켓이 종료됨"""
+        if self.loads.get(user_id):
+            self.loads[user_id] -= 1
+            if not self.loads[user_id]:
+                del self.loads[user_id]
+        self._push(user_id)
+    
+    async def assign(self, channel, ticket_id: int):
+        """새 티켓을 가장 한가한 지원팀원에게 배정 (배정할 사람이 없으면 None)"""
+        member = None
+        while member is None:
+            user_id = self._peek()
+            if user_id is None:
+                return None
+            member = channel.guild.get_member(user_id)
+            if member is None:
+                # 서버를 떠난 지원팀원
+                self.on_duty.discard(user_id)
+                self.online.discard(user_id)
+        
+        # await 전에 담당 수를 올려 동시에 열린 티켓이 같은 사람에게 몰리지 않게 함
+        self.claimed(user_id)
+        
+        await self.bot.db.claim_ticket(ticket_id, user_id)
+        
+        if isinstance(channel, discord.Thread):
+            await channel.add_user(member)
+        else:
+            await channel.edit(topic=f"{channel.topic or ''} | 담당자: {member.mention}")
+        
+        embed = discord.Embed(
+            title="✅ 티켓 담당자 자동 배정",
+            description=f"{member.mention}님이 이 티켓을 담당합니다.",
+            color=discord.Color.green()
+        )
+        embed.set_footer(text=f"배정 시간: {datetime.datetime.now().strftime('%Y-%m-%d %H:%M')}")
+        await channel.send(embed=embed)
+        return member
@@ -0,0 +1,186 @@
+import discord
+import aiofiles
+import aiohttp
+import asyncio
+import hashlib
+import logging
+import os
+import re
+import time
+import uuid
+import zipfile
+from pathlib import Path
+from urllib.parse import parse_qs, urlsplit
+
+logger = logging.getLogger(__name__)
+
+class AttachmentArchiver:
+    """티켓 첨부파일을 내려받아 트랜스크립트와 함께 zip 번들로 묶는 클래스"""
+    
+    # 이미 압축된 형식은 다시 압축하지 않고 그대로 저장
+    STORED_EXTENSIONS = {
+        '.png', '.jpg', '.jpeg', '.gif', '.webp', '.mp3', '.mp4', '.mov', '.webm', '.ogg',
+        '.zip', '.gz', '.7z', '.rar', '.xz', '.bz2'
+    }
+    CHUNK_SIZE = 64 * 1024
+    # 서명된 CDN URL이 이 시간(초) 안에 만료되면 다운로드 전에 새로 발급받음
+    REFRESH_MARGIN = 600
+    # refresh-urls 요청 한 번에 보낼 수 있는 URL 수
+    REFRESH_BATCH = 50
+    
+    def __init__(
+        self,
+        store_dir: str = 'attachments',
+        bundle_dir: str = 'transcripts',
+        max_concurrency: int = 4,
+        max_bytes_per_ticket: int = 50 * 1024 * 1024,
+        max_file_bytes: int = 25 * 1024 * 1024,
+        http=None
+    ):
+        # 만료된 첨부파일 URL 재발급에 사용하는 discord.py HTTP 클라이언트 (bot.http)
+        self.http = http
+        self.store_dir = Path(store_dir)
+        self.bundle_dir = Path(bundle_dir)
+        self.max_bytes_per_ticket = max_bytes_per_ticket
+        self.max_file_bytes = max_file_bytes
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._session = None
+    
+    async def close(self):
+        """HTTP 세션 종료"""
+        if self._session and not self._session.closed:
+            await self._session.close()
+    
+    def _store_path(self, digest: str) -> Path:
+        """내용 해시 기반 저장 경로 (티켓 간 중복 제거)"""
+        return self.store_dir / digest[:2] / digest
+    
+    @classmethod
+    def needs_refresh(cls, url: str, now: float = None) -> bool:
+        """서명 만료 시각(ex, 16진수 유닉스 시간)이 지났거나 곧 지나는 URL인지 (서명이 없는 이전 URL 포함)"""
+        expires = parse_qs(urlsplit(url).query).get('ex')
+        if not expires:
+            return True
+        try:
+            return int(expires[0], 16) <= (now or time.time()) + cls.REFRESH_MARGIN
+        except ValueError:
+            return True
+    
+    async def refresh_urls(self, urls) -> dict:
+        """만료되었거나 곧 만료되는 첨부파일 URL을 다시 서명받아 {원래 URL: 새 URL} 반환
+        
+        첨부파일 URL은 기록 시점에 서명되어 약 24시간 뒤 만료되므로, 오래 열려 있던 티켓은 종료 시 재발급이 필요함
+        재발급하지 못한 URL은 결과에서 빠지고 원래 URL로 다운로드를 시도함
+        """
+        stale = [url for url in dict.fromkeys(urls) if self.needs_refresh(url)]
+        if not stale or self.http is None:
+            return {}
+        
+        refreshed = {}
+        for start in range(0, len(stale), self.REFRESH_BATCH):
+            try:
+                data = await self.http.request(
+                    discord.http.Route('POST', '/attachments/refresh-urls'),
+                    json={'attachment_urls': stale[start:start + self.REFRESH_BATCH]}
+                )
+            except discord.HTTPException as e:
+                logger.warning(f"첨부파일 URL 재발급 실패: {e}")
+                continue
+            for entry in data.get('refreshed_urls', []):
+                refreshed[entry['original']] = entry['refreshed']
+        return refreshed
+    
+    async def _download(self, url: str):
+        """첨부파일을 디스크로 스트리밍하며 해시 계산, (해시, 크기) 반환"""
+        tmp_dir = self.store_dir / 'tmp'
+        tmp_dir.mkdir(parents=True, exist_ok=True)
+        tmp_path = tmp_dir / uuid.uuid4().hex
+        
+        sha256 = hashlib.sha256()
+        size = 0
+        try:
+            async with self._semaphore:
+                if self._session is None or self._session.closed:
+                    self._session = aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=300))
+                
+                async with self._session.get(url) as response:
+                    if response.status != 200:
+                        logger.warning(f"첨부파일 다운로드 실패 ({response.status}): {url}")
+                        return None
+                    
+                    async with aiofiles.open(tmp_path, 'wb') as f:
+                        async for chunk in response.content.iter_chunked(self.CHUNK_SIZE):
+                            size += len(chunk)
+                            if size > self.max_file_bytes:
+                                logger.warning(f"첨부파일 크기 제한 초과: {url}")
+                                return None
+                            sha256.update(chunk)
+                            await f.write(chunk)
+            
+            digest = sha256.hexdigest()
+            store_path = self._store_path(digest)
+            if not store_path.exists():
+                store_path.parent.mkdir(parents=True, exist_ok=True)
+                os.replace(tmp_path, store_path)
+            return digest, size
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            logger.warning(f"첨부파일 다운로드 오류: {url} ({e})")
+            return None
+        finally:
+            if tmp_path.exists():
+                tmp_path.unlink()
+    
+    def _write_bundle(self, bundle_path: Path, html: bytes, entries: list):
+        """트랜스크립트와 첨부파일을 zip으로 기록 (파일은 디스크에서 바로 스트리밍)"""
+        self.bundle_dir.mkdir(parents=True, exist_ok=True)
+        with zipfile.ZipFile(bundle_path, 'w', compression=zipfile.ZIP_DEFLATED) as bundle:
+            bundle.writestr('transcript.html', html)
+            for arcname, store_path in entries:
+                compression = zipfile.ZIP_STORED if Path(arcname).suffix.lower() in self.STORED_EXTENSIONS else zipfile.ZIP_DEFLATED
+                bundle.write(store_path, arcname=arcname, compress_type=compression)
+    
+    async def build_bundle(self, name: str, html: bytes, attachments: list) -> dict:
+        """첨부파일 번들 생성
+        
+        attachments는 Database.get_captured_attachments()의 (message_id, [[파일명, 크기, URL], ...]) 목록
+        """
+        # 선언된 크기로 티켓별 한도 안에서 먼저 선택 (동시 다운로드 중 한도 경쟁 방지)
+        selected = []
+        skipped = 0
+        budget = self.max_bytes_per_ticket
+        for message_id, items in attachments:
+            for item in items:
+                if len(item) < 3 or item[1] > self.max_file_bytes or item[1] > budget:
+                    skipped += 1
+                    continue
+                budget -= item[1]
+                selected.append((message_id, item[0], item[2]))
+        
+        refreshed = await self.refresh_urls(url for _, _, url in selected)
+        results = await asyncio.gather(*(self._download(refreshed.get(url, url)) for _, _, url in selected))
+        
+        entries = []
+        for (message_id, filename, _), result in zip(selected, results):
+            if result is None:
+                skipped += 1
+                continue
+            safe_name = re.sub(r'[^\w.\-]', '_', filename)
+            entries.append((f"attachments/{message_id}_{safe_name}", self._store_path(result[0])))
+        
+        bundle_path = self.bundle_dir / f"{name}.zip"
+        await asyncio.to_thread(self._write_bundle, bundle_path, html, entries)
+        
+        logger.info(f"첨부파일 번들 생성: {bundle_path} (보관 {len(entries)}개, 제외 {skipped}개)")
+        return {
+            'path': str(bundle_path),
+            'size': bundle_path.stat().st_size,
+            'archived': len(entries),
+            'skipped': skipped
+        }
+    
+    async def archive_ticket(self, db, channel_id: int, name: str, html: bytes):
+        """기록된 메시지의 첨부파일로 번들 생성 (첨부파일이 없으면 None)"""
+        attachments = await db.get_captured_attachments(channel_id)
+        if not attachments:
+            return None
+        return await self.build_bundle(name, html, attachments)
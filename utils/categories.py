@@ -0,0 +1,237 @@
+import discord
+import asyncio
+import logging
+
+logger = logging.getLogger(__name__)
+
+class TicketCategoryManager:
+    """티켓 카테고리 관리 (기본 카테고리 + 자동으로 만드는 추가 카테고리)
+    
+    카테고리마다 채널 수를 추적하고 채널 수별 버킷에 넣어 두어,
+    가장 비어 있는 카테고리를 채널 수 상한(50)만큼의 버킷 조회로 찾음 (카테고리 수와 무관)
+    모든 카테고리가 가득 차면 추가 카테고리를 만들고, 비게 된 추가 카테고리는 잠시 뒤 삭제함
+    """
+    
+    def __init__(self, bot, max_channels: int = 50, remove_delay: float = 300.0):
+        self.bot = bot
+        self.max_channels = max_channels
+        # 비게 된 추가 카테고리를 삭제하기까지 기다리는 시간 (생성/삭제 반복 방지)
+        self.remove_delay = remove_delay
+        
+        # 카테고리 ID -> 채널 수 (생성 요청 중인 채널 포함)
+        self.counts = {}
+        # 채널 수 -> 카테고리 ID 집합
+        self.buckets = {}
+        # 카테고리 ID -> 생성 요청 중인 채널 수 (생성 이벤트가 오면 차감)
+        self.pending = {}
+        self.overflow = set()
+        
+        self._ready = asyncio.Event()
+        self._create_lock = asyncio.Lock()
+        self._tasks = set()
+    
+    def start(self):
+        """봇이 준비된 뒤 카테고리 상태 로드"""
+        self._spawn(self._load())
+    
+    def close(self):
+        for task in self._tasks:
+            task.cancel()
+    
+    def _spawn(self, coro):
+        task = asyncio.create_task(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+    
+    def _set_count(self, category_id: int, count: int):
+        previous = self.counts.get(category_id)
+        if previous is not None:
+            bucket = self.buckets[previous]
+            bucket.discard(category_id)
+            if not bucket:
+                del self.buckets[previous]
+        
+        self.counts[category_id] = count
+        self.buckets.setdefault(count, set()).add(category_id)
+    
+    def _forget(self, category_id: int):
+        count = self.counts.pop(category_id, None)
+        if count is not None:
+            bucket = self.buckets[count]
+            bucket.discard(category_id)
+            if not bucket:
+                del self.buckets[count]
+        self.pending.pop(category_id, None)
+        self.overflow.discard(category_id)
+    
+    def _least_full(self):
+        """자리가 남은 카테고리 중 채널이 가장 적은 것 (없으면 None)"""
+        for count in range(self.max_channels):
+            bucket = self.buckets.get(count)
+            if bucket:
+                return next(iter(bucket))
+        return None
+    
+    async def _load(self):
+        await self.bot.wait_until_ready()
+        
+        base = self.bot.get_channel(self.bot.ticket_category_id)
+        if base:
+            self._set_count(base.id, len(base.channels))
+        
+        for category_id in await self.bot.db.get_ticket_categories():
+            category = self.bot.get_channel(category_id)
+            if category is None:
+                await self.bot.db.remove_ticket_category(category_id)
+                continue
+            
+            self.overflow.add(category_id)
+            self._set_count(category_id, len(category.channels))
+            if not category.channels:
+                self._schedule_remove(category_id)
+        
+        logger.info(f"티켓 카테고리 {len(self.counts)}개 로드 (추가 카테고리 {len(self.overflow)}개)")
+        self._ready.set()
+    
+    async def categories(self) -> list:
+        """관리 중인 티켓 카테고리 목록 (로드가 끝날 때까지 대기)"""
+        await self._ready.wait()
+        return [category for category in map(self.bot.get_channel, self.counts) if category]
+    
+    async def acquire(self):
+        """채널을 만들 카테고리를 고르고 한 자리를 예약 (만들지 못하면 None)"""
+        await self._ready.wait()
+        
+        category_id = self._least_full()
+        if category_id is None:
+            # 동시에 가득 찬 것을 본 요청들이 추가 카테고리를 하나만 만들도록 잠금 후 다시 확인
+            async with self._create_lock:
+                category_id = self._least_full()
+                if category_id is None:
+                    category_id = await self._create_overflow()
+                    if category_id is None:
+                        return None
+        
+        self._set_count(category_id, self.counts[category_id] + 1)
+        self.pending[category_id] = self.pending.get(category_id, 0) + 1
+        return self.bot.get_channel(category_id)
+    
+    def release(self, category_id: int):
+        """예약했지만 채널을 만들지 못한 자리 반환"""
+        if self.pending.get(category_id):
+            self.pending[category_id] -= 1
+            self._set_count(category_id, self.counts[category_id] - 1)
+    
+    def mark_full(self, category_id: int):
+        """디스코드가 가득 찼다고 응답한 카테고리 (추적하지 못한 채널이 있는 경우)"""
+        if category_id in self.counts:
+            self._set_count(category_id, max(self.counts[category_id], self.max_channels))
+    
+    async def create_text_channel(self, retries: int = 3, **kwargs):
+        """자리가 남은 카테고리에 채널 생성
+        
+        카테고리가 가득 찼다는 오류가 오면 그 카테고리를 가득 찬 것으로 표시하고 다른 카테고리로 다시 시도
+        """
+        for attempt in range(retries):
+            category = await self.acquire()
+            if category is None:
+                raise RuntimeError("티켓 카테고리를 만들 수 없습니다")
+            
+            try:
+                return await category.create_text_channel(**kwargs)
+            except discord.HTTPException as e:
+                self.release(category.id)
+                # 50035: 요청 본문 오류, parent_id 항목이면 카테고리 채널 수 초과
+                if e.code == 50035 and 'parent_id' in e.text and attempt + 1 < retries:
+                    logger.warning(f"티켓 카테고리가 가득 찼습니다 ({category.name}), 다른 카테고리로 다시 시도")
+                    self.mark_full(category.id)
+                    continue
+                raise
+    
+    async def _create_overflow(self):
+        base = self.bot.get_channel(self.bot.ticket_category_id)
+        if base is None:
+            logger.warning("티켓 카테고리를 찾을 수 없어 추가 카테고리를 만들지 못했습니다")
+            return None
+        
+        try:
+            category = await base.guild.create_category(
+                f"{base.name} {len(self.overflow) + 2}",
+                overwrites=base.overwrites,
+                position=base.position + len(self.overflow) + 1,
+                reason="티켓 카테고리가 가득 차 추가 카테고리 생성"
+            )
+        except discord.HTTPException as e:
+            logger.error(f"추가 티켓 카테고리 생성 실패: {e}")
+            return None
+        
+        await self.bot.db.add_ticket_category(category.id)
+        self.overflow.add(category.id)
+        self._set_count(category.id, 0)
+        logger.info(f"추가 티켓 카테고리 생성: {category.name}")
+        return category.id
+    
+    def channel_created(self, channel):
+        """카테고리에 채널이 생성됨 (on_guild_channel_create)"""
+        category_id = channel.category_id
+        if category_id not in self.counts:
+            return
+        
+        # acquire()로 예약한 채널은 이미 세었음
+        if self.pending.get(category_id):
+            self.pending[category_id] -= 1
+        else:
+            self._set_count(category_id, self.counts[category_id] + 1)
+    
+    def channel_deleted(self, channel):
+        """카테고리에서 채널이 삭제됨 (on_guild_channel_delete)"""
+        if channel.id in self.counts:
+            # 관리되는 카테고리 자체가 삭제된 경우
+            self._forget(channel.id)
+            self._spawn(self.bot.db.remove_ticket_category(channel.id))
+            return
+        
+        category_id = channel.category_id
+        if category_id not in self.counts:
+            return
+        
+        count = max(0, self.counts[category_id] - 1)
+        self._set_count(category_id, count)
+        if count == 0 and category_id in self.overflow:
+            self._schedule_remove(category_id)
+    
+    def channel_moved(self, before, after):
+        """채널의 카테고리가 바뀜 (on_guild_channel_update)"""
+        if before.category_id == after.category_id:
+            return
+        self.channel_deleted(before)
+        self.channel_created(after)
+    
+    def _schedule_remove(self, category_id: int):
+        self._spawn(self._remove_later(category_id))
+    
+    async def _remove_later(self, category_id: int):
+        await asyncio.sleep(self.remove_delay)
+        
+        # 기다리는 동안 다시 사용되었으면 유지
+        if self.counts.get(category_id) or self.pending.get(category_id):
+            return
+        
+        category = self.bot.get_channel(category_id)
+        if category is not None and category.channels:
+            # 추적하지 못한 채널이 남아 있으면 실제 개수로 맞추고 유지
+            self._set_count(category_id, len(category.channels))
+            return
+        
+        self._forget(category_id)
+        await self.bot.db.remove_ticket_category(category_id)
+        if category is None:
+            return
+        
+        try:
+            await category.delete(reason="비어 있는 추가 티켓 카테고리 정리")
+            logger.info(f"비어 있는 추가 티켓 카테고리 삭제: {category.name}")
+        except discord.NotFound:
+            pass
+        except discord.HTTPException as e:
+            logger.error(f"추가 티켓 카테고리 삭제 실패 ({category_id}): {e}")
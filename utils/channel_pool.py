@@ -0,0 +1,112 @@
+import discord
+import asyncio
+import logging
+from collections import deque
+
+logger = logging.getLogger(__name__)
+
+class TicketChannelPool:
+    """티켓 카테고리에 미리 만들어 두는 숨김 채널 풀
+    
+    티켓을 열 때는 채널 하나를 꺼내 이름, 토픽, 권한을 한 번의 수정으로 바꾸고
+    줄어든 만큼은 백그라운드에서 다시 채움
+    """
+    
+    # 재시작 후에도 대기 채널을 알아볼 수 있도록 토픽에 표시
+    POOL_TOPIC = "[ticket-pool] 대기 중인 티켓 채널"
+    
+    def __init__(self, bot, size: int = 5, refill_delay: float = 1.0):
+        self.bot = bot
+        self.size = size
+        # 채널 생성 요청 사이 간격 (한꺼번에 만들어 속도 제한에 걸리지 않도록)
+        self.refill_delay = refill_delay
+        self.available = deque()
+        self._loaded = False
+        self._refill_task = None
+    
+    @staticmethod
+    def hidden_overwrites(guild: discord.Guild) -> dict:
+        """대기 채널 권한 (봇만 볼 수 있음)"""
+        return {
+            guild.default_role: discord.PermissionOverwrite(view_channel=False),
+            guild.me: discord.PermissionOverwrite(
+                view_channel=True,
+                send_messages=True,
+                read_message_history=True,
+                embed_links=True,
+                manage_messages=True,
+                manage_channels=True
+            )
+        }
+    
+    async def _load(self):
+        """티켓 카테고리에 남아 있는 대기 채널 회수 (재시작 후)"""
+        for category in await self.bot.ticket_categories.categories():
+            for channel in category.text_channels:
+                if (
+                    channel.topic == self.POOL_TOPIC
+                    and channel.id not in self.available
+                    and not self.bot.db.is_ticket_channel(channel.id)
+                ):
+                    self.available.append(channel.id)
+        logger.info(f"티켓 대기 채널 {len(self.available)}개 회수")
+    
+    def start(self):
+        """풀 채우기 시작 (봇이 준비된 뒤 실행됨)"""
+        self.schedule_refill()
+    
+    def schedule_refill(self):
+        """진행 중인 채우기 작업이 없으면 새로 시작"""
+        if self._refill_task is None or self._refill_task.done():
+            self._refill_task = asyncio.create_task(self._refill())
+    
+    async def _refill(self):
+        await self.bot.wait_until_ready()
+        if not self._loaded:
+            await self._load()
+            self._loaded = True
+        
+        guild = self.bot.get_guild(self.bot.guild_id)
+        while len(self.available) < self.size:
+            if not guild:
+                logger.warning("서버를 찾을 수 없어 대기 채널을 만들지 못했습니다")
+                return
+            
+            # 카테고리가 가득 차면 추가 카테고리에 생성됨
+            try:
+                channel = await self.bot.ticket_categories.create_text_channel(
+                    name=f"{self.bot.config['bot_settings']['ticket_prefix']}pool",
+                    topic=self.POOL_TOPIC,
+                    overwrites=self.hidden_overwrites(guild)
+                )
+            except (discord.HTTPException, RuntimeError) as e:
+                logger.error(f"티켓 대기 채널 생성 실패: {e}")
+                return
+            
+            self.available.append(channel.id)
+            await asyncio.sleep(self.refill_delay)
+    
+    async def claim(self, **changes):
+        """대기 채널 하나를 꺼내 changes(name, topic, overwrites 등)를 한 번에 적용
+        
+        사용할 수 있는 채널이 없으면 None
+        """
+        channel = None
+        while self.available and channel is None:
+            candidate = self.bot.get_channel(self.available.popleft())
+            if candidate is None:
+                continue
+            
+            try:
+                channel = await candidate.edit(**changes) or candidate
+            except discord.HTTPException as e:
+                # 수정에 실패한 채널은 토픽이 그대로라 다음 재시작 때 다시 회수됨
+                logger.warning(f"티켓 대기 채널 사용 실패 ({candidate.id}): {e}")
+        
+        self.schedule_refill()
+        return channel
+    
+    def close(self):
+        """채우기 작업 중단"""
+        if self._refill_task and not self._refill_task.done():
+            self._refill_task.cancel()
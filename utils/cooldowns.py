@@ -0,0 +1,121 @@
+from discord.ext import tasks
+import asyncio
+import json
+import logging
+import os
+import time
+from collections import OrderedDict
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+class CooldownStore:
+    """(사용자, 종류)별 만료 시각을 기록하는 크기 제한 쿨다운 저장소
+    
+    종류를 생략하면 모든 티켓 유형에 공통으로 적용되는 사용자별 쿨다운(ALL_TYPES)을 사용함
+    
+    만료된 항목은 조회할 때 지우고, 기록할 때 오래된 항목부터 정리하므로 주기적 전체 검사가 없음
+    항목 수가 max_entries를 넘으면 가장 오래 전에 기록된 항목부터 버려 메모리 사용량이 일정함
+    path를 주면 변경된 내용을 save_interval초마다 파일에 저장하고 시작할 때 다시 읽음
+    """
+    
+    ALL_TYPES = '*'
+    
+    def __init__(self, max_entries: int = 10000, path: str = None, save_interval: float = 60.0):
+        self.max_entries = max_entries
+        self.path = Path(path) if path else None
+        
+        # (사용자 ID, 종류) -> 만료 시각 (time.time(), 기록 순서대로 정렬)
+        self._entries = OrderedDict()
+        self._dirty = False
+        
+        self._saver = tasks.loop(seconds=save_interval)(self._save_if_dirty)
+    
+    def __len__(self):
+        return len(self._entries)
+    
+    def start(self):
+        """저장된 쿨다운을 읽고 주기적 저장 시작"""
+        if self.path is None:
+            return
+        self._load()
+        self._saver.start()
+    
+    async def close(self):
+        if self.path is None:
+            return
+        self._saver.cancel()
+        await self._save_if_dirty()
+    
+    def remaining(self, user_id: int, kind: str = ALL_TYPES) -> float:
+        """남은 쿨다운 (초, 없으면 0)"""
+        key = (user_id, kind)
+        expires_at = self._entries.get(key)
+        if expires_at is None:
+            return 0.0
+        
+        left = expires_at - time.time()
+        if left <= 0:
+            del self._entries[key]
+            self._dirty = True
+            return 0.0
+        return left
+    
+    def set(self, user_id: int, ttl: float, kind: str = ALL_TYPES):
+        """ttl초 동안 쿨다운 적용 (0 이하면 기록하지 않음)"""
+        if ttl <= 0:
+            return
+        
+        key = (user_id, kind)
+        self._entries[key] = time.time() + ttl
+        self._entries.move_to_end(key)
+        self._dirty = True
+        self._evict()
+    
+    def _evict(self):
+        # 앞쪽(오래 전에 기록된) 항목 중 만료된 것을 정리하고, 그래도 넘치면 가장 오래된 것부터 버림
+        now = time.time()
+        while self._entries:
+            key, expires_at = next(iter(self._entries.items()))
+            if expires_at > now and len(self._entries) <= self.max_entries:
+                break
+            del self._entries[key]
+    
+    def _load(self):
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                saved = json.load(f)
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            logger.error(f"쿨다운 파일 로드 실패: {e}")
+            return
+        
+        now = time.time()
+        # 만료 시각 순으로 넣어 먼저 만료될 항목이 앞쪽에 오게 함
+        for user_id, kind, expires_at in sorted(saved, key=lambda entry: entry[2]):
+            if expires_at > now:
+                self._entries[(user_id, kind)] = expires_at
+        self._evict()
+        logger.info(f"쿨다운 {len(self._entries)}개 로드")
+    
+    def _write(self, entries: list):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = self.path.with_suffix('.tmp')
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(entries, f, ensure_ascii=False)
+        # 저장 중에 종료되어도 이전 파일이 남도록 교체
+        os.replace(temp_path, self.path)
+    
+    async def _save_if_dirty(self):
+        if not self._dirty:
+            return
+        self._dirty = False
+        
+        now = time.time()
+        entries = [[user_id, kind, expires_at] for (user_id, kind), expires_at in self._entries.items() if expires_at > now]
+        try:
+            await asyncio.to_thread(self._write, entries)
+        except OSError as e:
+            self._dirty = True
+            logger.error(f"쿨다운 파일 저장 실패: {e}")
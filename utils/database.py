@@ -1,10 +1,14 @@
 import aiosqlite
 import datetime
 import json
+from utils.archive import TicketArchive
 
 class Database:
-    def __init__(self, db_path):
+    def __init__(self, db_path, archive_dir='archive'):
         self.db_path = db_path
+        self.archive = TicketArchive(archive_dir)
+        # 열린 티켓 레지스트리 (channel_id -> 티켓 정보)
+        self.open_tickets = {}
     
     async def setup(self):
         """데이터베이스 초기화"""
@@ -19,10 +23,20 @@ class Database:
                     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
                     closed_at TIMESTAMP,
                     closed_by INTEGER,
-                    status TEXT DEFAULT 'open'
+                    status TEXT DEFAULT 'open',
+                    ticket_number INTEGER
                 )
             ''')
             
+            # 기존 DB 마이그레이션: 티켓 번호 컬럼 추가
+            cursor = await db.execute('PRAGMA table_info(tickets)')
+            columns = {row[1] for row in await cursor.fetchall()}
+            if 'ticket_number' not in columns:
+                await db.execute('ALTER TABLE tickets ADD COLUMN ticket_number INTEGER')
+            # 기존 DB 마이그레이션: 담당자 컬럼 추가
+            if 'claimed_by' not in columns:
+                await db.execute('ALTER TABLE tickets ADD COLUMN claimed_by INTEGER')
+            
             # 티켓 로그 테이블
             await db.execute('''
                 CREATE TABLE IF NOT EXISTS ticket_logs (
@@ -47,31 +61,259 @@ class Database:
                 )
             ''')
             
+            # 보관된 티켓 인덱스 테이블 (본문은 보관 파일에 저장)
+            await db.execute('''
+                CREATE TABLE IF NOT EXISTS archived_tickets (
+                    id INTEGER PRIMARY KEY,
+                    channel_id INTEGER NOT NULL,
+                    user_id INTEGER NOT NULL,
+                    ticket_type TEXT NOT NULL,
+                    created_at TIMESTAMP,
+                    closed_at TIMESTAMP,
+                    closed_by INTEGER,
+                    status TEXT,
+                    partition TEXT NOT NULL,
+                    archive_offset INTEGER NOT NULL,
+                    archive_length INTEGER NOT NULL,
+                    archived_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            ''')
+            await db.execute('CREATE INDEX IF NOT EXISTS idx_archived_tickets_user ON archived_tickets(user_id)')
+            await db.execute('CREATE INDEX IF NOT EXISTS idx_archived_tickets_partition ON archived_tickets(partition, archive_offset)')
+            await db.execute('CREATE INDEX IF NOT EXISTS idx_tickets_closed_at ON tickets(status, closed_at)')
+            await db.execute('CREATE INDEX IF NOT EXISTS idx_ticket_logs_ticket ON ticket_logs(ticket_id)')
+            await db.execute('CREATE INDEX IF NOT EXISTS idx_transcripts_ticket ON transcripts(ticket_id)')
+            
+            # 열린 티켓의 실시간 메시지 기록 (종료 시 트랜스크립트 생성에 사용)
+            await db.execute('''
+                CREATE TABLE IF NOT EXISTS transcript_messages (
+                    message_id INTEGER PRIMARY KEY,
+                    channel_id INTEGER NOT NULL,
+                    payload TEXT NOT NULL
+                )
+            ''')
+            await db.execute('CREATE INDEX IF NOT EXISTS idx_transcript_messages_channel ON transcript_messages(channel_id, message_id)')
+            
+            # 지연 작업 큐 (채널 삭제, 트랜스크립트 DM, 로그 게시 등, 시각은 유닉스 시간)
+            await db.execute('''
+                CREATE TABLE IF NOT EXISTS jobs (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    kind TEXT NOT NULL,
+                    payload TEXT NOT NULL,
+                    status TEXT NOT NULL DEFAULT 'pending',
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    run_at REAL NOT NULL,
+                    locked_until REAL,
+                    lease TEXT,
+                    last_error TEXT,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            ''')
+            await db.execute('CREATE INDEX IF NOT EXISTS idx_jobs_due ON jobs(status, run_at)')
+            
+            # 작업 큐의 여러 작업이 함께 쓰는 디스크의 트랜스크립트 파일 (남은 참조 수가 0이 되면 삭제)
+            await db.execute('''
+                CREATE TABLE IF NOT EXISTS job_transcripts (
+                    key TEXT PRIMARY KEY,
+                    refs INTEGER NOT NULL,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            ''')
+            
+            # 자동 배정을 받는 근무 중인 지원팀원
+            await db.execute('''
+                CREATE TABLE IF NOT EXISTS staff_on_duty (
+                    user_id INTEGER PRIMARY KEY,
+                    since TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            ''')
+            
+            # 기본 티켓 카테고리가 가득 차 봇이 추가로 만든 카테고리
+            await db.execute('''
+                CREATE TABLE IF NOT EXISTS ticket_categories (
+                    category_id INTEGER PRIMARY KEY,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            ''')
+            
+            # 통계 집계 테이블 (티켓 이벤트와 같은 트랜잭션에서 갱신)
+            await db.execute('''
+                CREATE TABLE IF NOT EXISTS ticket_stats (
+                    key TEXT PRIMARY KEY,
+                    value INTEGER NOT NULL DEFAULT 0
+                )
+            ''')
+            await db.execute('''
+                CREATE TABLE IF NOT EXISTS ticket_type_stats (
+                    ticket_type TEXT PRIMARY KEY,
+                    open_count INTEGER NOT NULL DEFAULT 0,
+                    total_count INTEGER NOT NULL DEFAULT 0
+                )
+            ''')
+            await db.execute('''
+                CREATE TABLE IF NOT EXISTS ticket_daily_stats (
+                    day TEXT PRIMARY KEY,
+                    created INTEGER NOT NULL DEFAULT 0,
+                    closed INTEGER NOT NULL DEFAULT 0
+                )
+            ''')
+            await db.execute('''
+                CREATE TABLE IF NOT EXISTS staff_claim_stats (
+                    user_id INTEGER PRIMARY KEY,
+                    claims INTEGER NOT NULL DEFAULT 0
+                )
+            ''')
+            
+            # 티켓 번호 시퀀스 (기존 티켓 이후 번호부터 시작)
+            await db.execute('''
+                CREATE TABLE IF NOT EXISTS ticket_sequence (
+                    name TEXT PRIMARY KEY,
+                    value INTEGER NOT NULL
+                )
+            ''')
+            await db.execute('''
+                INSERT OR IGNORE INTO ticket_sequence (name, value)
+                SELECT 'ticket', MAX(COALESCE((SELECT MAX(id) FROM tickets), 0),
+                                     COALESCE((SELECT MAX(id) FROM archived_tickets), 0))
+            ''')
+            
+            # 기존 데이터가 있으면 집계 테이블을 한 번만 채움
+            cursor = await db.execute('SELECT COUNT(*) FROM ticket_stats')
+            if (await cursor.fetchone())[0] == 0:
+                await self._backfill_stats(db)
+            
             await db.commit()
+        
+        await self.load_open_tickets()
     
-    async def create_ticket(self, channel_id, user_id, ticket_type):
+    async def _backfill_stats(self, db):
+        """기존 티켓 데이터로 집계 테이블 초기화"""
+        all_tickets = '''SELECT ticket_type, status, created_at, closed_at FROM tickets
+                         UNION ALL
+                         SELECT ticket_type, status, created_at, closed_at FROM archived_tickets'''
+        
+        await db.execute(f'''
+            INSERT INTO ticket_stats (key, value)
+            SELECT 'open', COUNT(CASE WHEN status = 'open' THEN 1 END) FROM ({all_tickets})
+            UNION ALL
+            SELECT 'created', COUNT(*) FROM ({all_tickets})
+            UNION ALL
+            SELECT 'closed', COUNT(CASE WHEN status = 'closed' THEN 1 END) FROM ({all_tickets})
+        ''')
+        await db.execute(f'''
+            INSERT INTO ticket_type_stats (ticket_type, open_count, total_count)
+            SELECT ticket_type, COUNT(CASE WHEN status = 'open' THEN 1 END), COUNT(*)
+            FROM ({all_tickets}) GROUP BY ticket_type
+        ''')
+        await db.execute(f'''
+            INSERT INTO ticket_daily_stats (day, created, closed)
+            SELECT day, SUM(created), SUM(closed) FROM (
+                SELECT date(created_at) AS day, 1 AS created, 0 AS closed FROM ({all_tickets})
+                UNION ALL
+                SELECT date(closed_at), 0, 1 FROM ({all_tickets}) WHERE closed_at IS NOT NULL
+            ) GROUP BY day
+        ''')
+        await db.execute('''
+            INSERT INTO staff_claim_stats (user_id, claims)
+            SELECT user_id, COUNT(*) FROM ticket_logs WHERE action = 'claimed' GROUP BY user_id
+        ''')
+    
+    @staticmethod
+    async def _bump_stat(db, key, delta):
+        await db.execute(
+            '''INSERT INTO ticket_stats (key, value) VALUES (?, ?)
+               ON CONFLICT(key) DO UPDATE SET value = value + excluded.value''',
+            (key, delta)
+        )
+    
+    async def load_open_tickets(self):
+        """열린 티켓을 메모리 레지스트리로 로드"""
+        async with aiosqlite.connect(self.db_path) as db:
+            db.row_factory = aiosqlite.Row
+            cursor = await db.execute("SELECT * FROM tickets WHERE status = 'open'")
+            rows = await cursor.fetchall()
+        
+        self.open_tickets = {row['channel_id']: dict(row) for row in rows}
+    
+    def is_ticket_channel(self, channel_id):
+        """열린 티켓 채널인지 확인 (메모리 조회)"""
+        return channel_id in self.open_tickets
+    
+    async def next_ticket_number(self):
+        """시퀀스에서 다음 티켓 번호 할당 (원자적 증가)"""
+        async with aiosqlite.connect(self.db_path) as db:
+            # UPDATE가 쓰기 잠금을 잡은 상태로 같은 트랜잭션에서 값을 읽음
+            await db.execute("UPDATE ticket_sequence SET value = value + 1 WHERE name = 'ticket'")
+            cursor = await db.execute("SELECT value FROM ticket_sequence WHERE name = 'ticket'")
+            number = (await cursor.fetchone())[0]
+            await db.commit()
+            return number
+    
+    async def create_ticket(self, channel_id, user_id, ticket_type, ticket_number=None):
         """새 티켓 생성"""
         async with aiosqlite.connect(self.db_path) as db:
+            db.row_factory = aiosqlite.Row
             cursor = await db.execute(
-                'INSERT INTO tickets (channel_id, user_id, ticket_type) VALUES (?, ?, ?)',
-                (channel_id, user_id, ticket_type)
+                'INSERT INTO tickets (channel_id, user_id, ticket_type, ticket_number) VALUES (?, ?, ?, ?)',
+                (channel_id, user_id, ticket_type, ticket_number)
+            )
+            ticket_id = cursor.lastrowid
+            cursor = await db.execute('SELECT * FROM tickets WHERE id = ?', (ticket_id,))
+            row = await cursor.fetchone()
+            
+            # 통계 갱신
+            await self._bump_stat(db, 'open', 1)
+            await self._bump_stat(db, 'created', 1)
+            await db.execute(
+                '''INSERT INTO ticket_type_stats (ticket_type, open_count, total_count) VALUES (?, 1, 1)
+                   ON CONFLICT(ticket_type) DO UPDATE SET open_count = open_count + 1, total_count = total_count + 1''',
+                (ticket_type,)
+            )
+            await db.execute(
+                '''INSERT INTO ticket_daily_stats (day, created) VALUES (date('now'), 1)
+                   ON CONFLICT(day) DO UPDATE SET created = created + 1'''
             )
             await db.commit()
-            return cursor.lastrowid
+        
+        # 커밋 이후 레지스트리 반영 (write-through)
+        self.open_tickets[channel_id] = dict(row)
+        return ticket_id
     
     async def close_ticket(self, channel_id, closed_by):
         """티켓 종료"""
         async with aiosqlite.connect(self.db_path) as db:
-            await db.execute(
+            cursor = await db.execute(
                 '''UPDATE tickets 
                    SET status = 'closed', closed_at = CURRENT_TIMESTAMP, closed_by = ? 
-                   WHERE channel_id = ?''',
+                   WHERE status = 'open' AND channel_id = ?''',
                 (closed_by, channel_id)
             )
+            
+            # 실제로 열린 티켓이 종료된 경우에만 통계 갱신
+            if cursor.rowcount:
+                cursor = await db.execute('SELECT ticket_type FROM tickets WHERE channel_id = ?', (channel_id,))
+                ticket_type = (await cursor.fetchone())[0]
+                await self._bump_stat(db, 'open', -1)
+                await self._bump_stat(db, 'closed', 1)
+                await db.execute(
+                    'UPDATE ticket_type_stats SET open_count = open_count - 1 WHERE ticket_type = ?',
+                    (ticket_type,)
+                )
+                await db.execute(
+                    '''INSERT INTO ticket_daily_stats (day, closed) VALUES (date('now'), 1)
+                       ON CONFLICT(day) DO UPDATE SET closed = closed + 1'''
+                )
             await db.commit()
+        
+        self.open_tickets.pop(channel_id, None)
     
     async def get_ticket_by_channel(self, channel_id):
         """채널 ID로 티켓 조회"""
+        # 열린 티켓은 레지스트리에서 바로 반환
+        ticket = self.open_tickets.get(channel_id)
+        if ticket:
+            return ticket
+        
         async with aiosqlite.connect(self.db_path) as db:
             db.row_factory = aiosqlite.Row
             cursor = await db.execute(
@@ -80,13 +322,34 @@ class Database:
             )
             return await cursor.fetchone()
     
+    async def get_ticket(self, ticket_id):
+        """티켓 ID로 티켓 조회 (보관된 티켓 포함)"""
+        async with aiosqlite.connect(self.db_path) as db:
+            db.row_factory = aiosqlite.Row
+            cursor = await db.execute('SELECT * FROM tickets WHERE id = ?', (ticket_id,))
+            row = await cursor.fetchone()
+            if row:
+                return row
+            
+            cursor = await db.execute(
+                '''SELECT id, channel_id, user_id, ticket_type, created_at, closed_at, closed_by, status
+                   FROM archived_tickets WHERE id = ?''',
+                (ticket_id,)
+            )
+            return await cursor.fetchone()
+    
     async def get_user_tickets(self, user_id):
-        """사용자의 모든 티켓 조회"""
+        """사용자의 모든 티켓 조회 (보관된 티켓 포함)"""
         async with aiosqlite.connect(self.db_path) as db:
             db.row_factory = aiosqlite.Row
             cursor = await db.execute(
-                'SELECT * FROM tickets WHERE user_id = ? ORDER BY created_at DESC',
-                (user_id,)
+                '''SELECT id, channel_id, user_id, ticket_type, created_at, closed_at, closed_by, status
+                   FROM tickets WHERE user_id = ?
+                   UNION ALL
+                   SELECT id, channel_id, user_id, ticket_type, created_at, closed_at, closed_by, status
+                   FROM archived_tickets WHERE user_id = ?
+                   ORDER BY created_at DESC''',
+                (user_id, user_id)
             )
             return await cursor.fetchall()
     
@@ -99,6 +362,74 @@ class Database:
             )
             await db.commit()
     
+    async def claim_ticket(self, ticket_id, user_id):
+        """티켓 담당 기록 (담당자, 로그, 담당 통계를 함께 갱신)"""
+        async with aiosqlite.connect(self.db_path) as db:
+            await db.execute('UPDATE tickets SET claimed_by = ? WHERE id = ?', (user_id, ticket_id))
+            cursor = await db.execute('SELECT channel_id FROM tickets WHERE id = ?', (ticket_id,))
+            row = await cursor.fetchone()
+            await db.execute(
+                'INSERT INTO ticket_logs (ticket_id, action, user_id) VALUES (?, ?, ?)',
+                (ticket_id, 'claimed', user_id)
+            )
+            await db.execute(
+                '''INSERT INTO staff_claim_stats (user_id, claims) VALUES (?, 1)
+                   ON CONFLICT(user_id) DO UPDATE SET claims = claims + 1''',
+                (user_id,)
+            )
+            await db.commit()
+        
+        # 열린 티켓 레지스트리에도 반영
+        ticket = self.open_tickets.get(row[0]) if row else None
+        if ticket:
+            ticket['claimed_by'] = user_id
+    
+    async def get_staff_on_duty(self):
+        """근무 중인 지원팀원 ID 목록"""
+        async with aiosqlite.connect(self.db_path) as db:
+            cursor = await db.execute('SELECT user_id FROM staff_on_duty')
+            return [row[0] for row in await cursor.fetchall()]
+    
+    async def set_staff_duty(self, user_id, on_duty):
+        """지원팀원 근무 상태 저장"""
+        async with aiosqlite.connect(self.db_path) as db:
+            if on_duty:
+                await db.execute('INSERT OR IGNORE INTO staff_on_duty (user_id) VALUES (?)', (user_id,))
+            else:
+                await db.execute('DELETE FROM staff_on_duty WHERE user_id = ?', (user_id,))
+            await db.commit()
+    
+    async def get_ticket_stats(self, days=7, top_staff=5):
+        """집계 테이블에서 티켓 통계 조회"""
+        async with aiosqlite.connect(self.db_path) as db:
+            db.row_factory = aiosqlite.Row
+            cursor = await db.execute('SELECT key, value FROM ticket_stats')
+            totals = {row['key']: row['value'] for row in await cursor.fetchall()}
+            
+            cursor = await db.execute('SELECT * FROM ticket_type_stats ORDER BY total_count DESC')
+            by_type = [dict(row) for row in await cursor.fetchall()]
+            
+            cursor = await db.execute(
+                "SELECT * FROM ticket_daily_stats WHERE day > date('now', ?) ORDER BY day DESC",
+                (f'-{int(days)} days',)
+            )
+            daily = [dict(row) for row in await cursor.fetchall()]
+            
+            cursor = await db.execute(
+                'SELECT * FROM staff_claim_stats ORDER BY claims DESC LIMIT ?',
+                (top_staff,)
+            )
+            staff = [dict(row) for row in await cursor.fetchall()]
+        
+        return {
+            'open': totals.get('open', 0),
+            'created': totals.get('created', 0),
+            'closed': totals.get('closed', 0),
+            'by_type': by_type,
+            'daily': daily,
+            'staff': staff
+        }
+    
     async def save_transcript(self, ticket_id, content):
         """트랜스크립트 저장"""
         async with aiosqlite.connect(self.db_path) as db:
@@ -106,4 +437,272 @@ class Database:
                 'INSERT INTO transcripts (ticket_id, content) VALUES (?, ?)',
                 (ticket_id, content)
             )
-            await db.commit()
\ No newline at end of file
+            await db.commit()
+    
+    async def capture_message(self, channel_id, message_id, payload):
+        """티켓 채널 메시지 기록 (수정된 메시지는 덮어씀)"""
+        async with aiosqlite.connect(self.db_path) as db:
+            await db.execute(
+                'INSERT OR REPLACE INTO transcript_messages (message_id, channel_id, payload) VALUES (?, ?, ?)',
+                (message_id, channel_id, payload)
+            )
+            await db.commit()
+    
+    async def capture_messages(self, channel_id, messages):
+        """여러 메시지를 한 번에 기록 ((message_id, payload) 목록)"""
+        async with aiosqlite.connect(self.db_path) as db:
+            await db.executemany(
+                'INSERT OR REPLACE INTO transcript_messages (message_id, channel_id, payload) VALUES (?, ?, ?)',
+                [(message_id, channel_id, payload) for message_id, payload in messages]
+            )
+            await db.commit()
+    
+    async def delete_captured_message(self, message_id):
+        """삭제된 메시지를 기록에서 제거"""
+        async with aiosqlite.connect(self.db_path) as db:
+            await db.execute('DELETE FROM transcript_messages WHERE message_id = ?', (message_id,))
+            await db.commit()
+    
+    async def iter_captured_messages(self, channel_id, after_id=None, chunk_size=1000):
+        """채널의 기록된 메시지를 작성 순서대로 chunk_size개씩 조회 (after_id가 있으면 그 이후만)
+        
+        커서에서 조각 단위로 읽으므로 메시지 수와 관계없이 한 조각만 메모리에 올라감
+        """
+        async with aiosqlite.connect(self.db_path) as db:
+            cursor = await db.execute(
+                'SELECT payload FROM transcript_messages WHERE channel_id = ? AND message_id > ? ORDER BY message_id',
+                (channel_id, after_id or 0)
+            )
+            while True:
+                rows = await cursor.fetchmany(chunk_size)
+                if not rows:
+                    return
+                yield [row[0] for row in rows]
+    
+    async def get_captured_attachments(self, channel_id):
+        """첨부파일이 있는 기록 메시지의 (message_id, 첨부파일 JSON) 목록"""
+        async with aiosqlite.connect(self.db_path) as db:
+            cursor = await db.execute(
+                '''SELECT message_id, json_extract(payload, '$[6]') FROM transcript_messages
+                   WHERE channel_id = ? AND json_array_length(payload, '$[6]') > 0
+                   ORDER BY message_id''',
+                (channel_id,)
+            )
+            return [(row[0], json.loads(row[1])) for row in await cursor.fetchall()]
+    
+    async def get_captured_avatars(self, channel_id):
+        """기록된 메시지 작성자의 (아바타 해시, URL) 목록 (처음 등장한 순서)"""
+        async with aiosqlite.connect(self.db_path) as db:
+            cursor = await db.execute(
+                '''SELECT json_extract(payload, '$[8]') AS avatar_key, json_extract(payload, '$[9]')
+                   FROM transcript_messages
+                   WHERE channel_id = ? AND json_extract(payload, '$[8]') != ''
+                   GROUP BY avatar_key
+                   ORDER BY MIN(message_id)''',
+                (channel_id,)
+            )
+            return [(row[0], row[1]) for row in await cursor.fetchall()]
+    
+    async def get_last_captured_message_id(self, channel_id):
+        """채널에서 마지막으로 기록된 메시지 ID"""
+        async with aiosqlite.connect(self.db_path) as db:
+            cursor = await db.execute(
+                'SELECT MAX(message_id) FROM transcript_messages WHERE channel_id = ?',
+                (channel_id,)
+            )
+            return (await cursor.fetchone())[0]
+    
+    async def clear_captured_messages(self, channel_id):
+        """종료된 티켓의 메시지 기록 삭제"""
+        async with aiosqlite.connect(self.db_path) as db:
+            await db.execute('DELETE FROM transcript_messages WHERE channel_id = ?', (channel_id,))
+            await db.commit()
+    
+    async def enqueue_job(self, kind, payload, run_at):
+        """작업 추가 (payload는 JSON 문자열)"""
+        async with aiosqlite.connect(self.db_path) as db:
+            cursor = await db.execute(
+                'INSERT INTO jobs (kind, payload, run_at) VALUES (?, ?, ?)',
+                (kind, payload, run_at)
+            )
+            await db.commit()
+            return cursor.lastrowid
+    
+    async def claim_job(self, lease, now, visibility_timeout):
+        """실행할 작업 하나를 임대하고 반환 (없으면 None)
+        
+        대기 중이면서 예정 시각이 지난 작업이나 임대가 만료된 실행 중 작업을 가져감
+        """
+        async with aiosqlite.connect(self.db_path) as db:
+            db.row_factory = aiosqlite.Row
+            # 한 번의 UPDATE로 선택과 임대를 함께 처리하여 워커끼리 같은 작업을 가져가지 않음
+            cursor = await db.execute(
+                '''UPDATE jobs
+                   SET status = 'running', lease = ?, locked_until = ?, attempts = attempts + 1
+                   WHERE id = (
+                       SELECT id FROM jobs
+                       WHERE (status = 'pending' AND run_at <= ?)
+                          OR (status = 'running' AND locked_until <= ?)
+                       ORDER BY run_at LIMIT 1
+                   )''',
+                (lease, now + visibility_timeout, now, now)
+            )
+            if not cursor.rowcount:
+                return None
+            
+            cursor = await db.execute('SELECT * FROM jobs WHERE lease = ?', (lease,))
+            row = await cursor.fetchone()
+            await db.commit()
+            return row
+    
+    async def complete_job(self, job_id, lease):
+        """완료된 작업 삭제 (임대가 다른 워커로 넘어갔으면 무시)"""
+        async with aiosqlite.connect(self.db_path) as db:
+            await db.execute('DELETE FROM jobs WHERE id = ? AND lease = ?', (job_id, lease))
+            await db.commit()
+    
+    async def retry_job(self, job_id, lease, run_at, error):
+        """실패한 작업을 run_at에 다시 실행하도록 예약"""
+        async with aiosqlite.connect(self.db_path) as db:
+            await db.execute(
+                '''UPDATE jobs SET status = 'pending', run_at = ?, lease = NULL, locked_until = NULL, last_error = ?
+                   WHERE id = ? AND lease = ?''',
+                (run_at, error, job_id, lease)
+            )
+            await db.commit()
+    
+    async def fail_job(self, job_id, lease, error):
+        """재시도 횟수를 넘긴 작업을 failed 상태로 남김"""
+        async with aiosqlite.connect(self.db_path) as db:
+            await db.execute(
+                '''UPDATE jobs SET status = 'failed', lease = NULL, locked_until = NULL, last_error = ?
+                   WHERE id = ? AND lease = ?''',
+                (error, job_id, lease)
+            )
+            await db.commit()
+    
+    async def get_next_job_time(self):
+        """다음으로 실행할 수 있게 되는 시각 (대기 작업의 예정 시각 또는 실행 중 작업의 임대 만료 시각)"""
+        async with aiosqlite.connect(self.db_path) as db:
+            cursor = await db.execute(
+                '''SELECT MIN(CASE WHEN status = 'pending' THEN run_at ELSE locked_until END)
+                   FROM jobs WHERE status IN ('pending', 'running')'''
+            )
+            return (await cursor.fetchone())[0]
+    
+    async def add_job_transcript(self, key, refs):
+        """작업 refs개가 참조하는 트랜스크립트 파일 등록"""
+        async with aiosqlite.connect(self.db_path) as db:
+            await db.execute('INSERT OR REPLACE INTO job_transcripts (key, refs) VALUES (?, ?)', (key, refs))
+            await db.commit()
+    
+    async def release_job_transcript(self, key):
+        """트랜스크립트 파일 참조 하나를 해제하고 남은 참조 수 반환 (0이면 행 삭제)"""
+        async with aiosqlite.connect(self.db_path) as db:
+            await db.execute('UPDATE job_transcripts SET refs = refs - 1 WHERE key = ?', (key,))
+            cursor = await db.execute('SELECT refs FROM job_transcripts WHERE key = ?', (key,))
+            row = await cursor.fetchone()
+            remaining = max(0, row[0]) if row else 0
+            if not remaining:
+                await db.execute('DELETE FROM job_transcripts WHERE key = ?', (key,))
+            await db.commit()
+            return remaining
+    
+    async def add_ticket_category(self, category_id):
+        """추가 티켓 카테고리 기록"""
+        async with aiosqlite.connect(self.db_path) as db:
+            await db.execute('INSERT OR IGNORE INTO ticket_categories (category_id) VALUES (?)', (category_id,))
+            await db.commit()
+    
+    async def remove_ticket_category(self, category_id):
+        """삭제된 추가 티켓 카테고리 기록 제거"""
+        async with aiosqlite.connect(self.db_path) as db:
+            await db.execute('DELETE FROM ticket_categories WHERE category_id = ?', (category_id,))
+            await db.commit()
+    
+    async def get_ticket_categories(self):
+        """추가 티켓 카테고리 ID 목록 (만든 순서)"""
+        async with aiosqlite.connect(self.db_path) as db:
+            cursor = await db.execute('SELECT category_id FROM ticket_categories ORDER BY created_at, category_id')
+            return [row[0] for row in await cursor.fetchall()]
+    
+    async def archive_closed_tickets(self, older_than_days, batch_size=100):
+        """오래된 종료 티켓 한 배치를 보관 파일로 이동하고 이동한 개수 반환"""
+        async with aiosqlite.connect(self.db_path) as db:
+            db.row_factory = aiosqlite.Row
+            cursor = await db.execute(
+                '''SELECT * FROM tickets
+                   WHERE status = 'closed' AND closed_at < datetime('now', ?)
+                   ORDER BY closed_at LIMIT ?''',
+                (f'-{int(older_than_days)} days', batch_size)
+            )
+            tickets = await cursor.fetchall()
+            if not tickets:
+                return 0
+            
+            ids = [ticket['id'] for ticket in tickets]
+            placeholders = ','.join('?' * len(ids))
+            
+            records = {ticket['id']: {'ticket': dict(ticket), 'logs': [], 'transcripts': []} for ticket in tickets}
+            cursor = await db.execute(f'SELECT * FROM ticket_logs WHERE ticket_id IN ({placeholders}) ORDER BY id', ids)
+            for row in await cursor.fetchall():
+                records[row['ticket_id']]['logs'].append(dict(row))
+            cursor = await db.execute(f'SELECT * FROM transcripts WHERE ticket_id IN ({placeholders}) ORDER BY id', ids)
+            for row in await cursor.fetchall():
+                records[row['ticket_id']]['transcripts'].append(dict(row))
+            
+            # 파티션별로 보관 파일에 레코드를 추가한 뒤, 레코드 위치를 인덱스에 넣고 핫 테이블에서 삭제하는 것을
+            # 한 트랜잭션으로 커밋함. 커밋 전에 실패하면 티켓은 그대로 남고, 인덱스에 없는 파일 끝부분은
+            # 다음 실행에서 잘라낸 뒤 다시 기록하므로 보관 파일에 같은 레코드가 중복되지 않음
+            partitions = {}
+            for ticket in tickets:
+                partition = self.archive.partition_for(ticket['closed_at'])
+                partitions.setdefault(partition, []).append(ticket)
+            
+            index_rows = []
+            for partition, partition_tickets in partitions.items():
+                # 인덱스에 기록된 마지막 멤버의 끝 (인덱스에 없는 파티션이면 파일 전체가 기록되지 못한 내용)
+                cursor = await db.execute(
+                    '''SELECT archive_offset + archive_length FROM archived_tickets
+                       WHERE partition = ? ORDER BY archive_offset DESC LIMIT 1''',
+                    (partition,)
+                )
+                row = await cursor.fetchone()
+                committed_end = row[0] if row else 0
+                
+                positions = await self.archive.write(
+                    partition,
+                    [records[t['id']] for t in partition_tickets],
+                    committed_end=committed_end
+                )
+                index_rows.extend(
+                    (t['id'], t['channel_id'], t['user_id'], t['ticket_type'], t['created_at'],
+                     t['closed_at'], t['closed_by'], t['status'], partition, offset, length)
+                    for t, (offset, length) in zip(partition_tickets, positions)
+                )
+            
+            await db.executemany(
+                '''INSERT OR REPLACE INTO archived_tickets
+                   (id, channel_id, user_id, ticket_type, created_at, closed_at, closed_by, status, partition,
+                    archive_offset, archive_length)
+                   VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)''',
+                index_rows
+            )
+            await db.execute(f'DELETE FROM ticket_logs WHERE ticket_id IN ({placeholders})', ids)
+            await db.execute(f'DELETE FROM transcripts WHERE ticket_id IN ({placeholders})', ids)
+            await db.execute(f'DELETE FROM tickets WHERE id IN ({placeholders})', ids)
+            await db.commit()
+            return len(ids)
+    
+    async def get_archived_ticket(self, ticket_id):
+        """보관된 티켓의 로그와 트랜스크립트를 보관 파일에서 지연 조회"""
+        async with aiosqlite.connect(self.db_path) as db:
+            cursor = await db.execute(
+                'SELECT partition, archive_offset, archive_length FROM archived_tickets WHERE id = ?',
+                (ticket_id,)
+            )
+            row = await cursor.fetchone()
+        
+        if not row:
+            return None
+        return await self.archive.read(row[0], row[1], row[2])
@@ -0,0 +1,221 @@
+import aiohttp
+import asyncio
+import base64
+import io
+import logging
+import re
+import textwrap
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from PIL import Image, ImageDraw, ImageFont
+
+logger = logging.getLogger(__name__)
+
+class TranscriptImages:
+    """아바타 썸네일 캐시와 로그 채널용 요약 카드 생성 클래스
+    
+    이미지 처리는 모두 전용 스레드 풀에서 실행하여 이벤트 루프를 막지 않음
+    """
+    
+    # 설정한 폰트가 없을 때 순서대로 시도하는 한글(CJK) 폰트
+    FONT_CANDIDATES = (
+        '/usr/share/fonts/opentype/noto/NotoSansCJK-Regular.ttc',
+        '/usr/share/fonts/noto-cjk/NotoSansCJK-Regular.ttc',
+        '/usr/share/fonts/truetype/nanum/NanumGothic.ttf',
+        '/System/Library/Fonts/AppleSDGothicNeo.ttc',
+        'C:/Windows/Fonts/malgun.ttf'
+    )
+    
+    CARD_WIDTH = 640
+    CARD_BACKGROUND = (47, 49, 54)
+    CARD_ACCENT = (88, 101, 242)
+    
+    def __init__(
+        self,
+        cache_dir: str = 'cache/avatars',
+        avatar_size: int = 64,
+        memory_items: int = 512,
+        workers: int = 2,
+        font_path: str = None
+    ):
+        self.cache_dir = Path(cache_dir)
+        self.avatar_size = avatar_size
+        self.memory_items = memory_items
+        self.font_path = font_path
+        
+        # 아바타 해시 -> PNG 바이트 (최근 사용 순)
+        self._memory = OrderedDict()
+        # 같은 아바타를 동시에 여러 번 내려받지 않도록 진행 중인 작업 공유
+        self._pending = {}
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='transcript-images')
+        self._session = None
+        self._fonts = {}
+    
+    async def close(self):
+        """HTTP 세션과 스레드 풀 종료"""
+        if self._session and not self._session.closed:
+            await self._session.close()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+    
+    async def _run(self, func, *args):
+        return await asyncio.get_running_loop().run_in_executor(self._executor, func, *args)
+    
+    def _cache_path(self, key: str) -> Path:
+        safe_key = re.sub(r'[^\w]', '_', key)
+        return self.cache_dir / f"{safe_key}_{self.avatar_size}.png"
+    
+    def _remember(self, key: str, data: bytes):
+        self._memory[key] = data
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_items:
+            self._memory.popitem(last=False)
+    
+    def _read_cached(self, path: Path):
+        return path.read_bytes() if path.exists() else None
+    
+    def _make_thumbnail(self, raw: bytes, path: Path) -> bytes:
+        """원본 아바타를 정사각형 썸네일 PNG로 변환해 디스크에 저장"""
+        with Image.open(io.BytesIO(raw)) as image:
+            image.seek(0)  # 움직이는 아바타는 첫 프레임만 사용
+            thumbnail = image.convert('RGBA').resize((self.avatar_size, self.avatar_size), Image.LANCZOS)
+        
+        output = io.BytesIO()
+        thumbnail.save(output, format='PNG', optimize=True)
+        data = output.getvalue()
+        
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix('.tmp')
+        tmp_path.write_bytes(data)
+        tmp_path.replace(path)
+        return data
+    
+    async def _load(self, key: str, url: str):
+        path = self._cache_path(key)
+        data = await self._run(self._read_cached, path)
+        if data is None:
+            if self._session is None or self._session.closed:
+                self._session = aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=30))
+            
+            try:
+                async with self._session.get(url) as response:
+                    if response.status != 200:
+                        logger.warning(f"아바타 다운로드 실패 ({response.status}): {url}")
+                        return None
+                    raw = await response.read()
+                data = await self._run(self._make_thumbnail, raw, path)
+            except (aiohttp.ClientError, asyncio.TimeoutError, OSError) as e:
+                logger.warning(f"아바타 처리 오류: {url} ({e})")
+                return None
+            except Exception as e:
+                # 압축 폭탄(DecompressionBombError) 등 Pillow 오류도 해당 아바타만 제외
+                logger.warning(f"아바타 이미지 변환 실패: {url} ({e!r})")
+                return None
+        
+        self._remember(key, data)
+        return data
+    
+    async def thumbnail(self, key: str, url: str):
+        """아바타 해시별 썸네일 PNG (메모리 -> 디스크 -> 다운로드 순으로 조회)"""
+        if key in self._memory:
+            self._memory.move_to_end(key)
+            return self._memory[key]
+        
+        task = self._pending.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._load(key, url))
+            self._pending[key] = task
+            task.add_done_callback(lambda _: self._pending.pop(key, None))
+        return await task
+    
+    async def thumbnails(self, avatars: list) -> dict:
+        """(아바타 해시, URL) 목록의 썸네일을 함께 조회, 실패한 항목은 제외
+        
+        썸네일은 부가 기능이므로 한 항목의 오류가 트랜스크립트 생성이나 티켓 종료를 중단시키지 않게 함
+        """
+        results = await asyncio.gather(*(self.thumbnail(key, url) for key, url in avatars), return_exceptions=True)
+        thumbnails = {}
+        for (key, url), data in zip(avatars, results):
+            if isinstance(data, Exception):
+                logger.warning(f"아바타 썸네일 조회 실패: {url} ({data!r})")
+            elif data:
+                thumbnails[key] = data
+        return thumbnails
+    
+    @staticmethod
+    def data_uris(thumbnails: dict) -> dict:
+        """HTML에 넣을 수 있도록 썸네일을 data URI로 변환"""
+        return {
+            key: "data:image/png;base64," + base64.b64encode(data).decode('ascii')
+            for key, data in thumbnails.items()
+        }
+    
+    def _font(self, size: int):
+        """한글을 표시할 수 있는 폰트 (없으면 Pillow 기본 폰트)"""
+        if size in self._fonts:
+            return self._fonts[size]
+        
+        font = None
+        for path in (self.font_path, *self.FONT_CANDIDATES):
+            if path and Path(path).exists():
+                try:
+                    font = ImageFont.truetype(path, size)
+                    break
+                except OSError:
+                    continue
+        
+        if font is None:
+            try:
+                font = ImageFont.load_default(size)
+            except TypeError:  # Pillow 10.1 미만
+                font = ImageFont.load_default()
+        
+        self._fonts[size] = font
+        return font
+    
+    def _draw_card(self, title: str, rows: list, avatars: list) -> bytes:
+        """제목, (항목, 값) 목록, 참여자 썸네일로 요약 카드 PNG 생성"""
+        title_font = self._font(28)
+        font = self._font(20)
+        padding = 24
+        line_height = 32
+        avatar_size = 48
+        
+        lines = []
+        for label, value in rows:
+            wrapped = textwrap.wrap(str(value), width=40) or [""]
+            lines.append((label, wrapped[0]))
+            lines.extend(("", extra) for extra in wrapped[1:])
+        
+        height = padding * 2 + 48 + line_height * len(lines)
+        if avatars:
+            height += avatar_size + padding
+        
+        card = Image.new('RGB', (self.CARD_WIDTH, height), self.CARD_BACKGROUND)
+        draw = ImageDraw.Draw(card)
+        draw.rectangle((0, 0, 6, height), fill=self.CARD_ACCENT)
+        draw.text((padding, padding), title, font=title_font, fill=(255, 255, 255))
+        
+        y = padding + 48
+        for label, value in lines:
+            draw.text((padding, y), label, font=font, fill=(185, 187, 190))
+            draw.text((padding + 140, y), value, font=font, fill=(220, 221, 222))
+            y += line_height
+        
+        if avatars:
+            y += padding // 2
+            mask = Image.new('L', (avatar_size, avatar_size), 0)
+            ImageDraw.Draw(mask).ellipse((0, 0, avatar_size - 1, avatar_size - 1), fill=255)
+            
+            for index, data in enumerate(avatars[:(self.CARD_WIDTH - padding * 2) // (avatar_size + 8)]):
+                with Image.open(io.BytesIO(data)) as image:
+                    avatar = image.convert('RGBA').resize((avatar_size, avatar_size), Image.LANCZOS)
+                card.paste(avatar, (padding + index * (avatar_size + 8), y), mask)
+        
+        output = io.BytesIO()
+        card.save(output, format='PNG', optimize=True)
+        return output.getvalue()
+    
+    async def summary_card(self, title: str, rows: list, avatars: list = ()) -> bytes:
+        """로그 채널용 요약 카드 PNG (스레드 풀에서 생성)"""
+        return await self._run(self._draw_card, title, rows, list(avatars))
@@ -0,0 +1,168 @@
+import discord
+from discord.ext import tasks
+import asyncio
+import datetime
+import logging
+import math
+import time
+
+logger = logging.getLogger(__name__)
+
+class TimerWheel:
+    """해시 타이머 휠
+    
+    타이머는 만료 시각에 해당하는 칸에 (남은 바퀴 수, 값)으로 들어가고
+    예약, 취소, 재예약은 모두 dict 연산 한두 번이라 타이머 수와 관계없이 O(1)
+    advance()는 한 칸씩 진행하며 그 칸에서 만료된 타이머만 돌려줌
+    """
+    
+    def __init__(self, tick: float, slots: int = 512):
+        self.tick = tick
+        self.slots = [{} for _ in range(slots)]
+        self.cursor = 0
+        # 키 -> 들어 있는 칸 번호
+        self.positions = {}
+    
+    def __len__(self):
+        return len(self.positions)
+    
+    def __contains__(self, key):
+        return key in self.positions
+    
+    def schedule(self, key, delay: float, value=None):
+        """delay초 뒤 만료되도록 예약 (이미 있으면 옮김)"""
+        self.cancel(key)
+        ticks = max(1, math.ceil(delay / self.tick))
+        index = (self.cursor + ticks) % len(self.slots)
+        self.slots[index][key] = ((ticks - 1) // len(self.slots), value)
+        self.positions[key] = index
+    
+    def cancel(self, key):
+        index = self.positions.pop(key, None)
+        if index is not None:
+            del self.slots[index][key]
+    
+    def advance(self) -> list:
+        """한 칸 진행하고 만료된 (키, 값) 목록 반환"""
+        self.cursor = (self.cursor + 1) % len(self.slots)
+        slot = self.slots[self.cursor]
+        
+        expired = []
+        for key, (rounds, value) in list(slot.items()):
+            if rounds:
+                slot[key] = (rounds - 1, value)
+            else:
+                del slot[key]
+                del self.positions[key]
+                expired.append((key, value))
+        return expired
+
+class InactivityMonitor:
+    """활동이 없는 티켓에 알림을 보내고 자동으로 종료
+    
+    채널 기록을 주기적으로 조회하지 않고, 메시지가 올 때마다 채널의 타이머를 다시 예약함
+    remind_after가 지나면 알림을 보내고 close_after가 지나면 기존 종료 흐름으로 종료
+    """
+    
+    REMIND = 'remind'
+    CLOSE = 'close'
+    
+    def __init__(self, bot, remind_after: float, close_after: float, tick: float = 60.0):
+        self.bot = bot
+        # 0이면 알림 없이 종료만 함
+        self.remind_after = remind_after
+        self.close_after = close_after
+        self.wheel = TimerWheel(tick)
+        
+        self._started_at = None
+        self._ticks = 0
+        self._ticker = tasks.loop(seconds=tick)(self._tick)
+        self._ticker.before_loop(self._load)
+    
+    def start(self):
+        self._ticker.start()
+    
+    def close(self):
+        self._ticker.cancel()
+    
+    def touch(self, channel_id: int, idle: float = 0):
+        """채널에 활동이 있었음을 기록 (idle초 전에 마지막 활동)"""
+        if self.remind_after and idle < self.remind_after:
+            self.wheel.schedule(channel_id, self.remind_after - idle, self.REMIND)
+        else:
+            self.wheel.schedule(channel_id, max(0, self.close_after - idle), self.CLOSE)
+    
+    def forget(self, channel_id: int):
+        """종료된 티켓의 타이머 제거"""
+        self.wheel.cancel(channel_id)
+    
+    async def _load(self):
+        """열린 티켓의 마지막 메시지 시각으로 타이머 초기화 (재시작 후)"""
+        await self.bot.wait_until_ready()
+        
+        now = discord.utils.utcnow()
+        for channel_id, ticket in list(self.bot.db.open_tickets.items()):
+            channel = self.bot.get_channel(channel_id)
+            if channel is None:
+                continue
+            
+            # 마지막 메시지 ID(스노우플레이크)에 작성 시각이 들어 있으므로 기록을 조회하지 않음
+            if channel.last_message_id:
+                last_activity = discord.utils.snowflake_time(channel.last_message_id)
+            else:
+                last_activity = channel.created_at
+            self.touch(channel_id, max(0.0, (now - last_activity).total_seconds()))
+        
+        logger.info(f"비활성 티켓 타이머 {len(self.wheel)}개 등록")
+        self._started_at = time.monotonic()
+    
+    async def _tick(self):
+        # 루프가 늦게 실행된 만큼 여러 칸을 진행하여 타이머가 밀리지 않게 함
+        due = int((time.monotonic() - self._started_at) / self.wheel.tick)
+        expired = []
+        while self._ticks < due:
+            self._ticks += 1
+            expired.extend(self.wheel.advance())
+        
+        if not expired:
+            return
+        
+        results = await asyncio.gather(
+            *(self._fire(channel_id, stage) for channel_id, stage in expired),
+            return_exceptions=True
+        )
+        for (channel_id, stage), result in zip(expired, results):
+            if isinstance(result, Exception):
+                logger.error(f"비활성 티켓 처리 실패 ({channel_id}, {stage}): {result}")
+    
+    async def _fire(self, channel_id: int, stage: str):
+        ticket = self.bot.db.open_tickets.get(channel_id)
+        channel = self.bot.get_channel(channel_id)
+        if ticket is None or channel is None:
+            return
+        
+        if stage == self.REMIND:
+            # 알림 이후에도 활동이 없으면 종료되도록 남은 시간으로 다시 예약
+            self.wheel.schedule(channel_id, max(0, self.close_after - self.remind_after), self.CLOSE)
+            await self._remind(channel, ticket)
+        else:
+            logger.info(f"활동이 없는 티켓 자동 종료: {channel.name}")
+            await self.bot.ticket_closer.close(
+                channel,
+                channel.guild.me,
+                details={'reason': 'Inactive', 'idle_hours': round(self.close_after / 3600, 1)}
+            )
+    
+    async def _remind(self, channel: discord.TextChannel, ticket):
+        hours_left = max(0, self.close_after - self.remind_after) / 3600
+        message = self.bot.config['ticket_messages'].get(
+            'inactive_reminder',
+            "이 티켓에 한동안 활동이 없었습니다. {hours}시간 안에 추가 메시지가 없으면 티켓이 자동으로 종료됩니다."
+        )
+        embed = discord.Embed(
+            title="티켓 자동 종료 예정",
+            description=message.format(hours=f"{hours_left:g}"),
+            color=discord.Color.orange(),
+            timestamp=datetime.datetime.now()
+        )
+        await channel.send(f"<@{ticket['user_id']}>", embed=embed)
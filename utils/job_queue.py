@@ -0,0 +1,133 @@
+import asyncio
+import json
+import logging
+import random
+import time
+import uuid
+
+logger = logging.getLogger(__name__)
+
+class JobQueue:
+    """tickets.db의 jobs 테이블에 저장되는 지연 작업 큐
+    
+    작업은 실행 전에 DB에 기록되므로 재시작해도 남아 있고, 정해진 수의 워커가 나눠서 실행함
+    워커는 작업을 가져갈 때 visibility_timeout 동안만 유효한 임대(lease)를 잡으며
+    실행 도중 봇이 종료되면 임대가 만료된 뒤 다시 실행됨 (최소 한 번 실행)
+    실패한 작업은 지수 백오프로 재시도하고 max_attempts를 넘기면 failed 상태로 남김
+    """
+    
+    def __init__(
+        self,
+        bot,
+        workers: int = 2,
+        poll_interval: float = 30.0,
+        visibility_timeout: float = 300.0,
+        max_attempts: int = 5,
+        backoff_base: float = 10.0,
+        backoff_max: float = 900.0
+    ):
+        self.bot = bot
+        self.workers = workers
+        # 새 작업 알림이 없을 때 최대 대기 시간
+        self.poll_interval = poll_interval
+        self.visibility_timeout = visibility_timeout
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        
+        # 작업 종류 -> 처리 코루틴 함수 (payload를 인자로 받음)
+        self.handlers = {}
+        self._wakeup = asyncio.Event()
+        self._tasks = []
+    
+    def register(self, kind: str, handler):
+        """작업 종류별 처리 함수 등록"""
+        self.handlers[kind] = handler
+    
+    async def enqueue(self, kind: str, payload: dict, delay: float = 0) -> int:
+        """작업 추가 (delay초 뒤 실행) 후 작업 ID 반환"""
+        if kind not in self.handlers:
+            raise ValueError(f"등록되지 않은 작업 종류입니다: {kind}")
+        
+        job_id = await self.bot.db.enqueue_job(
+            kind,
+            json.dumps(payload, ensure_ascii=False),
+            time.time() + max(0, delay)
+        )
+        self._wakeup.set()
+        return job_id
+    
+    def start(self):
+        """워커 시작 (봇이 준비된 뒤 작업을 가져감)"""
+        if self._tasks:
+            return
+        self._tasks = [asyncio.create_task(self._worker(index)) for index in range(self.workers)]
+    
+    async def close(self):
+        """워커 중단 (실행 중이던 작업은 임대가 만료된 뒤 다시 실행됨)"""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+    
+    def _backoff(self, attempts: int) -> float:
+        delay = min(self.backoff_max, self.backoff_base * 2 ** (attempts - 1))
+        return delay * random.uniform(0.8, 1.2)
+    
+    async def _idle(self):
+        """다음 작업 예정 시각이나 새 작업 알림까지 대기"""
+        next_run = await self.bot.db.get_next_job_time()
+        timeout = self.poll_interval
+        if next_run is not None:
+            timeout = min(timeout, max(0.0, next_run - time.time()))
+        
+        try:
+            await asyncio.wait_for(self._wakeup.wait(), timeout=timeout)
+        except asyncio.TimeoutError:
+            pass
+    
+    async def _worker(self, index: int):
+        await self.bot.wait_until_ready()
+        
+        while True:
+            try:
+                # 조회 전에 알림을 지워야 조회 직후 추가된 작업을 놓치지 않음
+                self._wakeup.clear()
+                lease = uuid.uuid4().hex
+                job = await self.bot.db.claim_job(lease, time.time(), self.visibility_timeout)
+                if job is None:
+                    await self._idle()
+                    continue
+                
+                await self._run(job, lease)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                # DB 오류 등으로 워커가 멈추지 않도록 잠시 쉬고 계속
+                logger.error(f"작업 큐 워커 {index} 오류: {e}")
+                await asyncio.sleep(self.poll_interval)
+    
+    async def _run(self, job, lease: str):
+        handler = self.handlers.get(job['kind'])
+        if handler is None:
+            await self.bot.db.fail_job(job['id'], lease, "등록되지 않은 작업 종류")
+            logger.error(f"처리할 수 없는 작업입니다 (#{job['id']} {job['kind']})")
+            return
+        
+        try:
+            # 임대가 만료되면 다른 워커가 다시 가져가므로 결과를 기록할 여유를 두고 끊음
+            await asyncio.wait_for(handler(json.loads(job['payload'])), timeout=self.visibility_timeout * 0.8)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+            if job['attempts'] >= self.max_attempts:
+                await self.bot.db.fail_job(job['id'], lease, error)
+                logger.error(f"작업 실패 (#{job['id']} {job['kind']}, {job['attempts']}회 시도): {error}")
+            else:
+                delay = self._backoff(job['attempts'])
+                await self.bot.db.retry_job(job['id'], lease, time.time() + delay, error)
+                logger.warning(f"작업 재시도 예약 (#{job['id']} {job['kind']}, {delay:.0f}초 뒤): {error}")
+            return
+        
+        await self.bot.db.complete_job(job['id'], lease)
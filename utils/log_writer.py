@@ -0,0 +1,150 @@
+import discord
+import asyncio
+import io
+import logging
+from collections import deque
+
+logger = logging.getLogger(__name__)
+
+class LogWriter:
+    """로그 채널 전송을 모아서 보내는 작성기
+    
+    post()는 바로 Future를 돌려주고, 전송은 백그라운드 작업 하나가 순서대로 처리함
+    window초 동안 모인 로그를 메시지 하나(임베드 10개, 파일 10개, 업로드 한도 이내)로 합쳐 보내므로
+    로그 채널의 속도 제한을 덜 쓰고, 전송이 밀리는 동안 쌓인 로그는 더 크게 합쳐짐
+    """
+    
+    MAX_EMBEDS = 10
+    MAX_FILES = 10
+    # 메시지 하나에 들어가는 임베드 전체 글자 수 / 본문 글자 수 한도
+    MAX_EMBED_CHARS = 6000
+    MAX_CONTENT_CHARS = 2000
+    
+    def __init__(self, bot, window: float = 2.0):
+        self.bot = bot
+        self.window = window
+        
+        # (본문, 임베드, 파일 목록, 파일 크기 합, Future)
+        self._pending = deque()
+        # 아직 전송되지 않은 로그의 Future (전송 중인 것 포함)
+        self._unsent = set()
+        self._wakeup = asyncio.Event()
+        self._task = None
+        self._closing = False
+    
+    def start(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+    
+    async def close(self, timeout: float = 10.0):
+        """남은 로그를 보낸 뒤 종료"""
+        if self._task is None:
+            return
+        self._closing = True
+        self._wakeup.set()
+        if self._unsent:
+            await asyncio.wait(set(self._unsent), timeout=timeout)
+        if self._unsent:
+            logger.warning(f"보내지 못한 로그 {len(self._unsent)}개를 버립니다")
+        self._task.cancel()
+    
+    @staticmethod
+    def _file_size(file: discord.File) -> int:
+        fp = file.fp
+        position = fp.tell()
+        size = fp.seek(0, io.SEEK_END)
+        fp.seek(position)
+        return size - position
+    
+    def post(self, content: str = None, embed: discord.Embed = None, files: list = None) -> asyncio.Future:
+        """로그 전송 예약 (전송된 메시지로 완료되는 Future 반환, 기다리지 않아도 됨)"""
+        files = list(files or [])
+        future = asyncio.get_running_loop().create_future()
+        future.add_done_callback(self._report)
+        self._unsent.add(future)
+        future.add_done_callback(self._unsent.discard)
+        
+        self._pending.append((content, embed, files, sum(map(self._file_size, files)), future))
+        self._wakeup.set()
+        return future
+    
+    async def send(self, content: str = None, embed: discord.Embed = None, files: list = None, **_):
+        """post() 후 전송될 때까지 대기 (send()를 가진 대상으로 Transcript.deliver에 넘길 수 있음)"""
+        return await self.post(content=content, embed=embed, files=files)
+    
+    @staticmethod
+    def _report(future: asyncio.Future):
+        # 기다리지 않은 Future의 오류도 기록되도록 여기서 확인
+        if not future.cancelled() and future.exception():
+            logger.error(f"로그 채널 전송 실패: {future.exception()}")
+    
+    def _take_batch(self, size_limit: int) -> list:
+        """한 메시지에 합칠 수 있는 만큼 앞에서부터 꺼냄 (최소 1개)"""
+        batch = []
+        embeds = embed_chars = files = size = content_chars = 0
+        # 임베드가 attachment://파일명으로 참조하므로 같은 이름의 파일은 한 메시지에 넣지 않음
+        filenames = set()
+        while self._pending:
+            content, embed, entry_files, entry_size, _ = self._pending[0]
+            entry_embeds = 1 if embed else 0
+            entry_chars = len(embed) if embed else 0
+            entry_content = len(content) + 1 if content else 0
+            
+            if batch and (
+                embeds + entry_embeds > self.MAX_EMBEDS
+                or embed_chars + entry_chars > self.MAX_EMBED_CHARS
+                or files + len(entry_files) > self.MAX_FILES
+                or size + entry_size > size_limit
+                or content_chars + entry_content > self.MAX_CONTENT_CHARS
+                or any(file.filename in filenames for file in entry_files)
+            ):
+                break
+            
+            batch.append(self._pending.popleft())
+            embeds += entry_embeds
+            embed_chars += entry_chars
+            files += len(entry_files)
+            size += entry_size
+            content_chars += entry_content
+            filenames.update(file.filename for file in entry_files)
+        return batch
+    
+    async def _run(self):
+        await self.bot.wait_until_ready()
+        
+        while True:
+            if not self._pending:
+                self._wakeup.clear()
+                await self._wakeup.wait()
+            
+            # 첫 로그가 들어온 뒤 잠시 더 모음 (이미 한 메시지 분량이면 바로 보냄)
+            if len(self._pending) < self.MAX_EMBEDS and not self._closing:
+                await asyncio.sleep(self.window)
+            
+            while self._pending:
+                channel = self.bot.get_channel(self.bot.log_channel_id)
+                if channel is None:
+                    logger.warning("로그 채널을 찾을 수 없어 로그를 버립니다")
+                    while self._pending:
+                        future = self._pending.popleft()[-1]
+                        if not future.done():
+                            future.set_result(None)
+                    break
+                
+                batch = self._take_batch(channel.guild.filesize_limit)
+                contents = [content for content, *_ in batch if content]
+                try:
+                    message = await channel.send(
+                        content="\n".join(contents) if contents else None,
+                        embeds=[embed for _, embed, *_ in batch if embed],
+                        files=[file for _, _, entry_files, *_ in batch for file in entry_files]
+                    )
+                except Exception as e:
+                    for *_, future in batch:
+                        if not future.done():
+                            future.set_exception(e)
+                    continue
+                
+                for *_, future in batch:
+                    if not future.done():
+                        future.set_result(message)
@@ -0,0 +1,158 @@
+import html
+import re
+
+# 메시지 본문에서 처리할 모든 토큰을 하나의 패턴으로 미리 컴파일
+# 앞쪽 대안이 우선하므로 코드 블록 -> 인라인 코드 -> 이스케이프 -> 멘션 -> 서식 순서로 둠
+TOKEN_PATTERN = re.compile(r'''
+    ```(?:(?P<lang>[\w+-]+)\n)?\n?(?P<codeblock>.*?)```
+  | `(?P<code>[^`]+)`
+  | \\(?P<escaped>[^\w\s])
+  | <@!?(?P<user>\d+)>
+  | <@&(?P<role>\d+)>
+  | <\#(?P<channel>\d+)>
+  | <(?P<animated>a?):(?P<emoji_name>\w+):(?P<emoji_id>\d+)>
+  | (?P<everyone>@(?:everyone|here))
+  | (?P<url>https?://[^\s<]+[^\s<.,:;"')\]])
+  | ^(?P<heading>\#{1,3})[ ](?P<heading_text>[^\n]+)\n?
+  | ^>[ ](?P<quote>[^\n]*)\n?
+  | \*\*(?P<bold>.+?)\*\*
+  | __(?P<underline>.+?)__
+  | \*(?P<italic>[^*\s][^*]*?)\*
+  | (?<!\w)_(?P<italic_underscore>[^_\n]+?)_(?!\w)
+  | ~~(?P<strike>.+?)~~
+  | \|\|(?P<spoiler>.+?)\|\|
+''', re.VERBOSE | re.DOTALL | re.MULTILINE)
+
+# 이름 조회가 필요한 멘션만 찾는 패턴
+MENTION_PATTERN = re.compile(r'<(@[!&]?|#)(\d+)>')
+
+# 안쪽 내용을 다시 렌더링하는 서식 토큰 -> HTML 태그
+NESTED_TAGS = {
+    'bold': ('<strong>', '</strong>'),
+    'underline': ('<u>', '</u>'),
+    'italic': ('<em>', '</em>'),
+    'italic_underscore': ('<em>', '</em>'),
+    'strike': ('<s>', '</s>'),
+    'spoiler': ('<span class="spoiler">', '</span>'),
+    'quote': ('<blockquote>', '</blockquote>')
+}
+
+def escape_text(text: str) -> str:
+    """HTML 이스케이프 후 줄바꿈을 <br>로 변환"""
+    return html.escape(text).replace('\n', '<br>')
+
+def collect_mentions(guild, texts) -> dict:
+    """본문에 등장한 멘션을 ID마다 한 번씩만 조회해 이름 맵 생성
+    
+    결과는 JSON/피클로 전달할 수 있는 dict라 워커 프로세스 렌더링에도 그대로 사용
+    """
+    mentions = {'users': {}, 'roles': {}, 'channels': {}}
+    if guild is None:
+        return mentions
+    
+    seen = set()
+    for text in texts:
+        for kind, object_id in MENTION_PATTERN.findall(text):
+            # <@id>와 <@!id>는 같은 사용자
+            kind = '@' if kind == '@!' else kind
+            if (kind, object_id) in seen:
+                continue
+            seen.add((kind, object_id))
+            
+            if kind == '@&':
+                role = guild.get_role(int(object_id))
+                if role:
+                    mentions['roles'][object_id] = (role.name, role.color.value)
+            elif kind == '#':
+                channel = guild.get_channel(int(object_id))
+                if channel:
+                    mentions['channels'][object_id] = channel.name
+            else:
+                member = guild.get_member(int(object_id))
+                if member:
+                    mentions['users'][object_id] = member.display_name
+    return mentions
+
+class DiscordMarkdown:
+    """디스코드 마크다운을 이스케이프된 HTML로 변환하는 렌더러
+    
+    메시지마다 미리 컴파일된 패턴으로 한 번만 훑고, 서식 토큰의 안쪽만 다시 렌더링함
+    """
+    
+    def __init__(self, mentions: dict = None):
+        mentions = mentions or {}
+        self.users = mentions.get('users', {})
+        self.roles = mentions.get('roles', {})
+        self.channels = mentions.get('channels', {})
+        # 같은 멘션이 반복되므로 ID별 HTML을 한 번만 만들어 재사용
+        self._mention_cache = {}
+    
+    def _mention(self, kind: str, object_id: str) -> str:
+        key = (kind, object_id)
+        cached = self._mention_cache.get(key)
+        if cached is not None:
+            return cached
+        
+        style = ""
+        if kind == 'user':
+            name = self.users.get(object_id)
+            label = f"@{name}" if name else "@알 수 없는 사용자"
+        elif kind == 'role':
+            name, color = self.roles.get(object_id, (None, 0))
+            label = f"@{name}" if name else "@알 수 없는 역할"
+            if color:
+                style = f' style="color: #{color:06x}"'
+        else:
+            name = self.channels.get(object_id)
+            label = f"#{name}" if name else "#알 수 없는 채널"
+        
+        result = f'<span class="mention"{style}>{html.escape(label)}</span>'
+        self._mention_cache[key] = result
+        return result
+    
+    def render(self, text: str) -> str:
+        """본문 전체를 HTML로 변환"""
+        if not text:
+            return ""
+        
+        parts = []
+        position = 0
+        for match in TOKEN_PATTERN.finditer(text):
+            start = match.start()
+            if start > position:
+                parts.append(escape_text(text[position:start]))
+            position = match.end()
+            
+            kind = match.lastgroup
+            value = match.group(kind)
+            
+            if kind in NESTED_TAGS:
+                open_tag, close_tag = NESTED_TAGS[kind]
+                parts.append(f"{open_tag}{self.render(value)}{close_tag}")
+            elif kind == 'codeblock':
+                parts.append(f"<pre><code>{html.escape(value)}</code></pre>")
+            elif kind == 'code':
+                parts.append(f"<code>{html.escape(value)}</code>")
+            elif kind == 'escaped':
+                parts.append(html.escape(value))
+            elif kind in ('user', 'role', 'channel'):
+                parts.append(self._mention(kind, value))
+            elif kind == 'emoji_id':
+                extension = 'gif' if match.group('animated') else 'png'
+                name = html.escape(match.group('emoji_name'))
+                parts.append(
+                    f'<img class="emoji" src="https://cdn.discordapp.com/emojis/{value}.{extension}" '
+                    f'alt=":{name}:" title=":{name}:">'
+                )
+            elif kind == 'everyone':
+                parts.append(f'<span class="mention">{value}</span>')
+            elif kind == 'url':
+                url = html.escape(value)
+                parts.append(f'<a href="{url}" target="_blank" rel="noopener">{url}</a>')
+            elif kind == 'heading_text':
+                level = len(match.group('heading'))
+                parts.append(f"<h{level}>{self.render(value)}</h{level}>")
+        
+        if position < len(text):
+            parts.append(escape_text(text[position:]))
+        return "".join(parts)
@@ -5,11 +5,11 @@ class PermissionManager:
     """권한 관리 클래스"""
     
     @staticmethod
-    async def setup_channel_permissions(channel: discord.TextChannel, user: discord.Member, support_role: discord.Role):
-        """티켓 채널 권한 설정"""
-        overwrites = {
+    def ticket_overwrites(guild: discord.Guild, user: discord.Member, support_role: discord.Role) -> dict:
+        """티켓 채널 권한 (채널 생성 시 overwrites로 바로 전달)"""
+        return {
             # 기본 역할 - 모든 권한 거부
-            channel.guild.default_role: discord.PermissionOverwrite(
+            guild.default_role: discord.PermissionOverwrite(
                 view_channel=False,
                 send_messages=False,
                 read_message_history=False,
@@ -36,7 +36,7 @@ class PermissionManager:
                 manage_messages=True
             ),
             # 봇 권한
-            channel.guild.me: discord.PermissionOverwrite(
+            guild.me: discord.PermissionOverwrite(
                 view_channel=True,
                 send_messages=True,
                 read_message_history=True,
@@ -47,9 +47,6 @@ class PermissionManager:
                 manage_channels=True
             )
         }
-        
-        await channel.edit(overwrites=overwrites)
-        return True
     
     @staticmethod
     def has_ticket_access(member: discord.Member, channel: discord.TextChannel, support_role_id: int) -> bool:
@@ -120,8 +117,7 @@ def is_ticket_channel():
         if ctx.guild is None:
             return False
         
-        # 채널 이름이 티켓 접두사로 시작하는지 확인
-        ticket_prefix = ctx.bot.config['bot_settings']['ticket_prefix']
-        return ctx.channel.name.startswith(ticket_prefix)
+        # 열린 티켓 레지스트리에 등록된 채널인지 확인
+        return ctx.bot.db.is_ticket_channel(ctx.channel.id)
     
     return commands.check(predicate)
\ No newline at end of file
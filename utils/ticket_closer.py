@@ -0,0 +1,274 @@
+import discord
+import asyncio
+import datetime
+import io
+import logging
+import os
+from pathlib import Path
+from typing import Union
+from utils.transcript import Transcript
+
+logger = logging.getLogger(__name__)
+
+class TicketCloser:
+    """티켓 종료 파이프라인
+    
+    종료 확인 버튼, 관리자 강제 종료, 자동 종료가 같은 흐름을 사용함
+    트랜스크립트를 만든 뒤 DB 저장, 종료 안내, 첨부파일 번들은 바로 실행하고
+    트랜스크립트 DM, 로그 게시, 채널 삭제는 작업 큐에 넣어 재시작 후에도 실행되게 함
+    트랜스크립트는 작업 내용에 넣지 않고 spool_dir에 한 번만 저장하며, 참조하는 작업이 모두 끝나면 삭제함
+    """
+    
+    # DM에는 서버 부스트 한도가 없으므로 기본 업로드 한도(10MiB) 사용
+    DM_FILE_SIZE_LIMIT = 10 * 1024 * 1024
+    
+    def __init__(self, bot, spool_dir: str = 'transcripts/pending'):
+        self.bot = bot
+        self.spool_dir = Path(spool_dir)
+        # 종료 중인 채널 (버튼을 여러 번 눌러도 한 번만 실행)
+        self.closing = set()
+        
+        bot.job_queue.register('transcript_dm', self._run_dm)
+        bot.job_queue.register('close_log', self._run_close_log)
+        bot.job_queue.register('delete_channel', self._run_delete)
+    
+    async def close(
+        self,
+        channel: Union[discord.TextChannel, discord.Thread],
+        closed_by: discord.abc.User,
+        *,
+        forced: bool = False,
+        details: dict = None,
+        delete_delay: float = None
+    ) -> bool:
+        """티켓 종료 (이미 종료 중이거나 종료된 티켓이면 False)
+        
+        forced면 관리자 강제 종료로 기록하고 DM과 종료 안내를 보내지 않음
+        delete_delay가 None이면 설정(auto_delete_after_close)에 따라 결정
+        """
+        # 삭제 대기 중인 종료된 티켓을 다시 종료하면 기록과 작업이 중복되므로 열린 티켓만 처리
+        if channel.id in self.closing or not self.bot.db.is_ticket_channel(channel.id):
+            return False
+        self.closing.add(channel.id)
+        if self.bot.inactivity:
+            self.bot.inactivity.forget(channel.id)
+        
+        try:
+            transcript = await self.bot.transcript_capture.build_transcript(channel)
+            ticket = await self.bot.db.get_ticket_by_channel(channel.id)
+            
+            steps = {'DB 저장': self._persist(ticket, channel, closed_by, transcript, forced, details)}
+            if not forced:
+                steps['종료 안내'] = self._announce(channel)
+            if ticket and self.bot.attachment_archiver:
+                steps['첨부파일 번들'] = self.bot.attachment_archiver.archive_ticket(
+                    self.bot.db, channel.id, f"{channel.name}_{ticket['id']}", transcript.html
+                )
+            
+            results = await asyncio.gather(*steps.values(), return_exceptions=True)
+            for step, result in zip(steps, results):
+                if isinstance(result, Exception):
+                    logger.error(f"티켓 종료 중 {step} 실패 ({channel.name}): {result}")
+            
+            bundle = results[-1] if '첨부파일 번들' in steps else None
+            if isinstance(bundle, Exception):
+                bundle = None
+            
+            send_dm = bool(ticket and not forced and self.bot.config['permissions']['transcript_dm'])
+            key = str(channel.id)
+            await asyncio.to_thread(self._write_transcript, key, transcript, send_dm)
+            await self.bot.db.add_job_transcript(key, 2 if send_dm else 1)
+            
+            if send_dm:
+                await self.bot.job_queue.enqueue('transcript_dm', {
+                    'user_id': ticket['user_id'],
+                    'channel_name': channel.name,
+                    'transcript': key,
+                    'message_count': transcript.message_count
+                })
+            await self.bot.job_queue.enqueue(
+                'close_log',
+                await self._close_log_payload(ticket, channel, closed_by, transcript, forced, bundle, key)
+            )
+            
+            # 아바타 목록과 번들을 만든 뒤 기록 삭제
+            await self.bot.transcript_capture.discard(channel.id)
+        finally:
+            self.closing.discard(channel.id)
+        
+        if delete_delay is None:
+            permissions = self.bot.config['permissions']
+            delete_delay = permissions['delete_delay_seconds'] if permissions['auto_delete_after_close'] else 0
+        
+        await self.bot.job_queue.enqueue('delete_channel', {
+            'channel_id': channel.id,
+            'reason': f"{'강제 종료' if forced else '티켓 종료'} - {closed_by}"
+        }, delay=delete_delay)
+        return True
+    
+    async def _persist(self, ticket, channel, closed_by, transcript, forced, details):
+        """티켓 상태, 로그, 트랜스크립트 저장"""
+        if not ticket:
+            return
+        
+        # 열린 티켓을 닫는 경우에만 담당 수 차감
+        if self.bot.assigner and ticket['claimed_by'] and self.bot.db.is_ticket_channel(channel.id):
+            self.bot.assigner.released(ticket['claimed_by'])
+        await self.bot.db.close_ticket(channel.id, closed_by.id)
+        await self.bot.db.add_ticket_log(ticket['id'], 'force_closed' if forced else 'closed', closed_by.id, details)
+        await self.bot.db.save_transcript(ticket['id'], transcript.text_content)
+    
+    async def _announce(self, channel):
+        """티켓 채널에 종료 안내"""
+        close_embed = discord.Embed(
+            title="티켓이 종료되었습니다",
+            description=self.bot.config['ticket_messages']['closed'],
+            color=discord.Color.red()
+        )
+        await channel.send(embed=close_embed)
+    
+    async def _close_log_payload(self, ticket, channel, closed_by, transcript, forced, bundle, key):
+        """로그 게시 작업에 넣을 내용 (JSON으로 저장할 수 있는 값만 사용)"""
+        log_embed = discord.Embed(
+            title="관리자 강제 종료" if forced else "티켓 종료",
+            color=discord.Color.orange() if forced else discord.Color.red()
+        )
+        log_embed.add_field(name="티켓 채널", value=channel.name, inline=True)
+        log_embed.add_field(name="종료자", value=closed_by.mention, inline=True)
+        if ticket:
+            log_embed.add_field(name="티켓 생성자", value=f"<@{ticket['user_id']}>", inline=True)
+        log_embed.add_field(name="메시지 수", value=f"{transcript.message_count}", inline=True)
+        if bundle:
+            log_embed.add_field(name="첨부파일", value=f"{bundle['archived']}개 보관 / {bundle['skipped']}개 제외", inline=True)
+        log_embed.timestamp = datetime.datetime.now()
+        
+        # 요약 카드는 작업 실행 시 만들고, 참여자 썸네일은 디스크 캐시에서 다시 읽음
+        card = None
+        if self.bot.transcript_images:
+            creator = channel.guild.get_member(ticket['user_id']) if ticket else None
+            rows = []
+            if ticket:
+                rows.append(("티켓 생성자", creator.display_name if creator else str(ticket['user_id'])))
+            rows.extend([
+                ("종료자", closed_by.display_name),
+                ("메시지 수", f"{transcript.message_count}개"),
+                ("참여자", f"{len(transcript.avatars)}명")
+            ])
+            card = {
+                'title': f"{'강제 종료' if forced else '티켓 종료'}: {channel.name}",
+                'rows': rows,
+                'avatars': await self.bot.db.get_captured_avatars(channel.id)
+            }
+        
+        return {
+            'embed': log_embed.to_dict(),
+            'channel_name': channel.name,
+            'transcript': key,
+            'message_count': transcript.message_count,
+            'card': card,
+            'bundle': {'path': bundle['path'], 'size': bundle['size']} if bundle else None
+        }
+    
+    def _transcript_path(self, key: str, suffix: str) -> Path:
+        return self.spool_dir / f"{key}{suffix}"
+    
+    def _write_transcript(self, key: str, transcript: Transcript, include_text: bool):
+        """작업들이 함께 읽을 트랜스크립트를 디스크에 저장 (텍스트는 DM에만 사용)"""
+        self.spool_dir.mkdir(parents=True, exist_ok=True)
+        self._transcript_path(key, '.html').write_bytes(transcript.html)
+        if include_text:
+            self._transcript_path(key, '.txt').write_bytes(transcript.text)
+    
+    async def _load_transcript(self, payload, include_text: bool = False) -> Transcript:
+        """작업이 참조하는 트랜스크립트
+        
+        파일이 없으면 예외를 내서 작업이 완료 처리되지 않고 재시도 후 실패로 남게 함
+        """
+        try:
+            html = await asyncio.to_thread(self._transcript_path(payload['transcript'], '.html').read_bytes)
+            text = await asyncio.to_thread(self._transcript_path(payload['transcript'], '.txt').read_bytes) if include_text else b""
+        except FileNotFoundError as e:
+            raise RuntimeError(f"작업의 트랜스크립트 파일이 없습니다: {payload['channel_name']} ({e.filename})") from e
+        return Transcript(payload['channel_name'], html, text, payload['message_count'])
+    
+    async def _release_transcript(self, payload):
+        """작업이 끝났으므로 트랜스크립트 참조 해제 (마지막 참조면 파일 삭제)"""
+        key = payload['transcript']
+        if await self.bot.db.release_job_transcript(key):
+            return
+        for suffix in ('.html', '.txt'):
+            self._transcript_path(key, suffix).unlink(missing_ok=True)
+    
+    async def _run_dm(self, payload):
+        """티켓 생성자에게 DM으로 트랜스크립트 전송 (작업 큐에서 실행)"""
+        try:
+            user = self.bot.get_user(payload['user_id']) or await self.bot.fetch_user(payload['user_id'])
+        except discord.NotFound:
+            await self._release_transcript(payload)
+            return
+        
+        transcript = await self._load_transcript(payload, include_text=True)
+        
+        dm_embed = discord.Embed(
+            title="티켓이 종료되었습니다",
+            description=f"티켓 채널: {payload['channel_name']}\n대화 내용이 첨부되었습니다.",
+            color=discord.Color.blue()
+        )
+        try:
+            await transcript.deliver(user, self.DM_FILE_SIZE_LIMIT, embed=dm_embed)
+        except discord.Forbidden:
+            # 재시도해도 결과가 같으므로 기록만 남기고 완료 처리
+            logger.info(f"DM을 보낼 수 없는 사용자입니다 ({user}): {payload['channel_name']} 트랜스크립트")
+        await self._release_transcript(payload)
+    
+    async def _run_close_log(self, payload):
+        """로그 채널에 종료 기록과 트랜스크립트 게시 (작업 큐에서 실행)"""
+        log_channel = self.bot.get_channel(self.bot.log_channel_id)
+        if not log_channel:
+            await self._release_transcript(payload)
+            return
+        transcript = await self._load_transcript(payload)
+        
+        log_embed = discord.Embed.from_dict(payload['embed'])
+        
+        # 요약 카드 (임베드 이미지로 표시)
+        extra = []
+        card = payload.get('card')
+        if card and self.bot.transcript_images:
+            try:
+                thumbnails = await self.bot.transcript_images.thumbnails([tuple(avatar) for avatar in card['avatars']])
+                data = await self.bot.transcript_images.summary_card(
+                    card['title'],
+                    [tuple(row) for row in card['rows']],
+                    thumbnails.values()
+                )
+            except Exception as e:
+                # 카드가 없어도 종료 기록은 게시
+                logger.error(f"요약 카드 생성 실패 ({payload['channel_name']}): {e!r}")
+            else:
+                extra.append(("summary.png", data))
+                log_embed.set_image(url="attachment://summary.png")
+        
+        # 번들이 업로드 한도 안이면 HTML 대신 번들(HTML 포함) 첨부
+        bundle = payload.get('bundle')
+        limit = log_channel.guild.filesize_limit
+        if (
+            bundle
+            and os.path.exists(bundle['path'])
+            and bundle['size'] + sum(len(data) for _, data in extra) <= limit
+        ):
+            files = [discord.File(bundle['path'])] + [discord.File(io.BytesIO(data), filename=name) for name, data in extra]
+            await self.bot.log_writer.send(embed=log_embed, files=files)
+        else:
+            # 로그 작성기를 통해 다른 로그와 합쳐 보내고, 전송이 실패하면 작업을 재시도함
+            await transcript.deliver(self.bot.log_writer, limit, embed=log_embed, include_text=False, extra=extra)
+        await self._release_transcript(payload)
+    
+    async def _run_delete(self, payload):
+        """티켓 채널(스레드) 삭제 (작업 큐에서 실행, 이미 삭제됐으면 완료 처리)"""
+        try:
+            # 보관된 스레드는 캐시에 없으므로 API로 조회
+            channel = self.bot.get_channel(payload['channel_id']) or await self.bot.fetch_channel(payload['channel_id'])
+            await channel.delete(reason=payload['reason'])
+        except discord.NotFound:
+            pass
@@ -1,18 +1,169 @@
 import discord
 import aiofiles
+import asyncio
 import datetime
+import gzip
+import html
 import io
-from PIL import Image, ImageDraw, ImageFont
-import textwrap
+import json
+import logging
+import multiprocessing
+import re
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import NamedTuple
+from utils.markdown import DiscordMarkdown, collect_mentions
 
-class TranscriptGenerator:
-    """트랜스크립트 생성 클래스"""
+logger = logging.getLogger(__name__)
+
+class TranscriptMessage(NamedTuple):
+    """트랜스크립트용으로 한 번만 정규화한 메시지"""
+    id: int
+    is_system: bool
+    timestamp: str
+    author_name: str
+    author_tag: str
+    content: str
+    attachments: tuple  # ((파일명, 크기, URL), ...)
+    embeds: tuple       # ((제목, 설명), ...)
+    avatar_key: str = ''
+    avatar_url: str = ''
+    
+    @classmethod
+    def from_message(cls, message: discord.Message) -> 'TranscriptMessage':
+        """discord.Message를 정규화"""
+        timestamp = message.created_at.strftime('%Y-%m-%d %H:%M:%S')
+        
+        if message.type != discord.MessageType.default:
+            return cls(message.id, True, timestamp, "", "", message.system_content, (), ())
+        
+        return cls(
+            message.id,
+            False,
+            timestamp,
+            message.author.display_name,
+            f"{message.author.display_name}#{message.author.discriminator}",
+            message.content,
+            tuple((attachment.filename, attachment.size, attachment.url) for attachment in message.attachments),
+            tuple(
+                (embed.title, embed.description)
+                for embed in message.embeds
+                if embed.title or embed.description
+            ),
+            message.author.display_avatar.key,
+            message.author.display_avatar.with_format('png').with_size(128).url
+        )
+    
+    def dumps(self) -> str:
+        """저장용 JSON 문자열로 직렬화"""
+        return json.dumps(self, ensure_ascii=False)
+    
+    @classmethod
+    def loads(cls, payload: str) -> 'TranscriptMessage':
+        """dumps()로 저장한 문자열 복원"""
+        data = json.loads(payload)
+        data[6] = tuple(tuple(item) for item in data[6])
+        data[7] = tuple(tuple(item) for item in data[7])
+        return cls(*data)
+
+class Transcript:
+    """렌더링이 끝난 트랜스크립트 (바이트는 한 번만 보관)"""
+    
+    # 디스코드 메시지 하나에 첨부할 수 있는 최대 파일 수
+    MAX_FILES_PER_MESSAGE = 10
+    
+    def __init__(self, channel_name: str, html: bytes, text: bytes, message_count: int, avatars: dict = None):
+        self.channel_name = channel_name
+        self.html = html
+        self.text = text
+        self.message_count = message_count
+        # 참여자 아바타 해시 -> 썸네일 PNG (등장 순서)
+        self.avatars = avatars or {}
+    
+    @property
+    def text_content(self) -> str:
+        return self.text.decode('utf-8')
     
     @staticmethod
-    async def generate_html_transcript(channel: discord.TextChannel, messages: list) -> str:
-        """HTML 형식 트랜스크립트 생성"""
-        html_template = """
-<!DOCTYPE html>
+    def _fit(filename: str, data: bytes, limit: int) -> list:
+        """한도를 넘으면 gzip 압축, 그래도 넘으면 순서가 있는 조각으로 분할"""
+        if len(data) <= limit:
+            return [(filename, data)]
+        
+        data = gzip.compress(data, compresslevel=9)
+        filename += '.gz'
+        if len(data) <= limit:
+            return [(filename, data)]
+        
+        count = -(-len(data) // limit)
+        return [
+            (f"{filename}.part{index + 1:03d}", data[index * limit:(index + 1) * limit])
+            for index in range(count)
+        ]
+    
+    async def upload_batches(self, limit: int, include_text: bool = True, extra: list = ()) -> tuple:
+        """업로드 한도에 맞춘 메시지별 (파일명, 바이트) 묶음 목록과 조각으로 분할된 문서가 있는지 여부
+        
+        파일 하나와 메시지 하나의 합계가 모두 limit 이하가 되도록 나눔
+        extra의 (파일명, 바이트)는 압축하지 않고 첫 메시지부터 먼저 배치
+        """
+        documents = [(f"{self.channel_name}_transcript.html", self.html)]
+        if include_text:
+            documents.append((f"{self.channel_name}_transcript.txt", self.text))
+        
+        fitted = await asyncio.to_thread(lambda: [self._fit(filename, data, limit) for filename, data in documents])
+        split = any(len(document_pieces) > 1 for document_pieces in fitted)
+        pieces = list(extra) + [piece for document_pieces in fitted for piece in document_pieces]
+        
+        batches = [[]]
+        batch_size = 0
+        for filename, data in pieces:
+            if batches[-1] and (batch_size + len(data) > limit or len(batches[-1]) >= self.MAX_FILES_PER_MESSAGE):
+                batches.append([])
+                batch_size = 0
+            batches[-1].append((filename, data))
+            batch_size += len(data)
+        return batches, split
+    
+    async def deliver(
+        self,
+        destination,
+        limit: int,
+        embed: discord.Embed = None,
+        include_text: bool = True,
+        extra: list = (),
+        **kwargs
+    ) -> list:
+        """업로드 전에 크기를 확인해 압축/분할한 뒤 순서대로 전송
+        
+        destination은 send()를 가진 대상 (채널, 사용자, interaction.followup 등)
+        """
+        batches, split = await self.upload_batches(limit, include_text, extra)
+        
+        messages = []
+        for index, batch in enumerate(batches):
+            files = [discord.File(io.BytesIO(data), filename=filename) for filename, data in batch]
+            if index == 0:
+                content = kwargs.pop('content', None)
+                if split:
+                    note = "트랜스크립트가 업로드 한도를 넘어 분할되었습니다. 조각을 순서대로 이어 붙인 뒤 압축을 해제하세요. (예: `cat 파일명.gz.part* > 파일명.gz`)"
+                    content = f"{content}\n{note}" if content else note
+                if embed:
+                    kwargs['embed'] = embed
+            else:
+                kwargs.pop('embed', None)
+                content = f"트랜스크립트 ({index + 1}/{len(batches)})"
+            messages.append(await destination.send(content=content, files=files, **kwargs))
+        return messages
+
+class TranscriptRenderer:
+    """정규화된 메시지를 한 번 순회하며 HTML과 텍스트를 함께 기록하는 클래스
+    
+    결과는 바이트로 반환되어 캐시되고 업로드되므로, 조각을 목록에 모았다가 마지막에 한 번만 합침
+    """
+    
+    HTML_HEADER = """<!DOCTYPE html>
 <html lang="ko">
 <head>
     <meta charset="UTF-8">
@@ -61,9 +212,12 @@ class TranscriptGenerator:
         .avatar {{
             width: 40px;
             height: 40px;
+            flex-shrink: 0;
             border-radius: 50%;
             margin-right: 15px;
             background-color: #5865f2;
+            background-position: center;
+            background-size: cover;
             display: flex;
             align-items: center;
             justify-content: center;
@@ -101,6 +255,12 @@ class TranscriptGenerator:
             border-radius: 4px;
             font-size: 14px;
         }}
+        .footer {{
+            border-top: 1px solid #202225;
+            padding-top: 10px;
+            color: #72767d;
+            font-size: 14px;
+        }}
         .system-message {{
             background-color: #202225;
             padding: 10px;
@@ -109,6 +269,50 @@ class TranscriptGenerator:
             font-style: italic;
             color: #72767d;
         }}
+        .content a {{
+            color: #00aff4;
+        }}
+        .content code {{
+            background-color: #202225;
+            border-radius: 3px;
+            padding: 0 3px;
+            font-family: Consolas, 'Courier New', monospace;
+            font-size: 85%;
+        }}
+        .content pre {{
+            background-color: #202225;
+            border-radius: 4px;
+            padding: 8px;
+            white-space: pre-wrap;
+        }}
+        .content pre code {{
+            padding: 0;
+        }}
+        .content blockquote {{
+            border-left: 4px solid #4f545c;
+            margin: 4px 0;
+            padding: 0 8px;
+        }}
+        .mention {{
+            background-color: rgba(88, 101, 242, 0.3);
+            color: #dee0fc;
+            border-radius: 3px;
+            padding: 0 2px;
+        }}
+        .emoji {{
+            width: 22px;
+            height: 22px;
+            vertical-align: bottom;
+        }}
+        .spoiler {{
+            background-color: #202225;
+            color: transparent;
+            border-radius: 3px;
+        }}
+        .spoiler:hover {{
+            color: inherit;
+        }}
+{avatar_styles}
     </style>
 </head>
 <body>
@@ -116,71 +320,135 @@ class TranscriptGenerator:
         <div class="header">
             <h1>트랜스크립트: {channel_name}</h1>
             <p>생성일: {created_date}</p>
-            <p>메시지 수: {message_count}</p>
         </div>
         <div class="messages">
-            {messages_html}
+"""
+    
+    HTML_FOOTER = """
+        </div>
+        <div class="footer">
+            <p>메시지 수: {message_count}</p>
         </div>
     </div>
 </body>
 </html>
-        """
+"""
+    
+    def __init__(self, avatars: dict = None, mentions: dict = None):
+        self.message_count = 0
+        # 아바타 해시 -> data URI, 작성자마다 CSS 규칙 하나로 한 번만 포함
+        self.avatars = avatars or {}
+        # 멘션 이름은 collect_mentions()로 미리 모은 맵에서 조회
+        self.markdown = DiscordMarkdown(mentions)
+        # (작성자 이름, 아바타 해시) -> 아바타/이름 HTML
+        self._authors = {}
         
-        messages_html = ""
-        for message in reversed(messages):
-            # 시스템 메시지 처리
-            if message.type != discord.MessageType.default:
-                messages_html += f'''
+        # 헤더/푸터 없이 메시지 조각만 기록 (헤더/푸터는 build_transcript에서 붙임)
+        self.html_parts = []
+        self.text_parts = []
+    
+    @classmethod
+    def html_header(cls, channel_name: str, created_date: str, avatars: dict) -> bytes:
+        return cls.HTML_HEADER.format(
+            channel_name=html.escape(channel_name),
+            created_date=created_date,
+            avatar_styles="\n".join(
+                f"        .{cls.avatar_class(key)} {{ background-image: url({uri}); }}"
+                for key, uri in avatars.items()
+            )
+        ).encode('utf-8')
+    
+    @staticmethod
+    def text_header(channel_name: str, created_date: str) -> bytes:
+        return (
+            f"=== 트랜스크립트: {channel_name} ===\n"
+            f"생성일: {created_date}\n"
+            + "=" * 50 + "\n\n"
+        ).encode('utf-8')
+    
+    @classmethod
+    def html_footer(cls, message_count: int) -> bytes:
+        return cls.HTML_FOOTER.format(message_count=message_count).encode('utf-8')
+    
+    @staticmethod
+    def text_footer(message_count: int) -> bytes:
+        return ("=" * 50 + f"\n메시지 수: {message_count}\n").encode('utf-8')
+    
+    def feed(self, record: TranscriptMessage):
+        """메시지 하나를 두 형식으로 기록"""
+        self.html_parts.append(self.render_html(record).encode('utf-8'))
+        self.text_parts.append(self.render_text(record).encode('utf-8'))
+        self.message_count += 1
+    
+    def finish_body(self) -> tuple:
+        """기록한 (HTML 본문, 텍스트 본문) 바이트 반환"""
+        return b"".join(self.html_parts), b"".join(self.text_parts)
+    
+    @staticmethod
+    def avatar_class(key: str) -> str:
+        """아바타 해시로 만든 CSS 클래스 이름"""
+        return "avatar-" + re.sub(r'[^\w-]', '_', key)
+    
+    def _author_html(self, record: TranscriptMessage) -> tuple:
+        """작성자별 아바타와 이름 HTML (작성자마다 한 번만 생성)"""
+        key = (record.author_name, record.avatar_key)
+        cached = self._authors.get(key)
+        if cached is None:
+            if record.avatar_key in self.avatars:
+                avatar_html = f'<div class="avatar {self.avatar_class(record.avatar_key)}"></div>'
+            else:
+                avatar_html = f'<div class="avatar">{html.escape(record.author_name[:1].upper())}</div>'
+            cached = self._authors[key] = (avatar_html, html.escape(record.author_name))
+        return cached
+    
+    def render_html(self, record: TranscriptMessage) -> str:
+        """메시지 하나를 HTML 조각으로 변환 (본문은 이스케이프 후 마크다운 렌더링)"""
+        # 시스템 메시지 처리
+        if record.is_system:
+            return f'''
                     <div class="system-message">
-                        {message.system_content}
+                        {html.escape(record.content)}
                     </div>
                 '''
-                continue
-            
-            # 아바타 첫 글자
-            avatar_letter = message.author.display_name[0].upper()
-            
-            # 메시지 내용 처리
-            content = discord.utils.escape_markdown(message.content)
-            content = content.replace('\n', '<br>')
-            
-            # 타임스탬프 포맷
-            timestamp = message.created_at.strftime('%Y-%m-%d %H:%M:%S')
-            
-            # 첨부파일 처리
-            attachments_html = ""
-            if message.attachments:
-                for attachment in message.attachments:
-                    attachments_html += f'''
+        
+        # 메시지 내용 처리
+        content = self.markdown.render(record.content)
+        
+        # 첨부파일 처리
+        attachments_html = "".join(
+            f'''
                         <div class="attachment">
-                            첨부 파일: {attachment.filename} ({attachment.size // 1024}KB)
+                            첨부 파일: {html.escape(filename)} ({size // 1024}KB)
                         </div>
                     '''
+            for filename, size, *_ in record.attachments
+        )
+        
+        # 임베드 처리
+        embed_parts = []
+        for title, description in record.embeds:
+            embed_content = ""
+            if title:
+                embed_content += f"<strong>{html.escape(title)}</strong><br>"
+            if description:
+                embed_content += f"{self.markdown.render(description)}<br>"
             
-            # 임베드 처리
-            embeds_html = ""
-            if message.embeds:
-                for embed in message.embeds:
-                    embed_content = ""
-                    if embed.title:
-                        embed_content += f"<strong>{embed.title}</strong><br>"
-                    if embed.description:
-                        embed_content += f"{embed.description}<br>"
-                    
-                    if embed_content:
-                        embeds_html += f'''
+            embed_parts.append(f'''
                             <div class="embed">
                                 {embed_content}
                             </div>
-                        '''
-            
-            messages_html += f'''
+                        ''')
+        embeds_html = "".join(embed_parts)
+        
+        avatar_html, author_name = self._author_html(record)
+        
+        return f'''
                 <div class="message">
-                    <div class="avatar">{avatar_letter}</div>
+                    {avatar_html}
                     <div class="message-content">
                         <div class="author">
-                            {message.author.display_name}
-                            <span class="timestamp">{timestamp}</span>
+                            {author_name}
+                            <span class="timestamp">{record.timestamp}</span>
                         </div>
                         <div class="content">
                             {content}
@@ -190,72 +458,244 @@ class TranscriptGenerator:
                     </div>
                 </div>
             '''
+    
+    @staticmethod
+    def render_text(record: TranscriptMessage) -> str:
+        """메시지 하나를 텍스트 조각으로 변환"""
+        # 시스템 메시지
+        if record.is_system:
+            return f"[시스템] {record.timestamp}: {record.content}\n\n"
         
-        return html_template.format(
-            channel_name=channel.name,
-            created_date=datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-            message_count=len(messages),
-            messages_html=messages_html
-        )
+        # 일반 메시지
+        parts = [
+            f"[{record.timestamp}] {record.author_tag}:\n",
+            f"{record.content}\n"
+        ]
+        
+        # 첨부파일
+        if record.attachments:
+            parts.append("첨부파일:\n")
+            parts.extend(f"  - {filename} ({size // 1024}KB)\n" for filename, size, *_ in record.attachments)
+        
+        # 임베드
+        if record.embeds:
+            parts.append("임베드:\n")
+            for title, description in record.embeds:
+                if title:
+                    parts.append(f"  제목: {title}\n")
+                if description:
+                    parts.append(f"  설명: {description}\n")
+        
+        parts.append("\n")
+        return "".join(parts)
+
+def render_payload_bodies(payloads: list, avatars: dict = None, mentions: dict = None) -> tuple:
+    """직렬화된 메시지 목록의 (HTML 본문, 텍스트 본문) 바이트만 렌더링 (워커 프로세스용)"""
+    renderer = TranscriptRenderer(avatars, mentions)
+    for payload in payloads:
+        renderer.feed(TranscriptMessage.loads(payload))
+    return renderer.finish_body()
+
+class CachedTranscript(NamedTuple):
+    """채널별로 마지막으로 만든 트랜스크립트
+    
+    html_body/text_body는 transcript 바이트에서 헤더/푸터를 뺀 부분을 복사 없이 가리킴
+    """
+    last_message_id: int
+    transcript: Transcript
+    html_body: memoryview
+    text_body: memoryview
+    
+    @property
+    def size(self) -> int:
+        return len(self.transcript.html) + len(self.transcript.text)
+
+class TranscriptCapture:
+    """열린 티켓 채널의 메시지를 도착하는 대로 기록하는 클래스"""
+    
+    def __init__(
+        self,
+        db,
+        render_workers: int = 2,
+        process_threshold: int = 500,
+        images=None,
+        cache_max_bytes: int = 64 * 1024 * 1024,
+        chunk_size: int = 1000
+    ):
+        self.db = db
+        # 아바타 썸네일을 넣을 때 사용하는 utils.images.TranscriptImages (선택사항)
+        self.images = images
+        # 누락 없이 기록 중인 채널 (이 프로세스에서 생성했거나 따라잡기가 끝난 채널)
+        self.live_channels = set()
+        
+        # 메시지가 process_threshold개 이상이면 워커 프로세스에서 렌더링
+        self.render_workers = render_workers
+        self.process_threshold = process_threshold
+        self._render_pool = None
+        # 기록된 메시지를 chunk_size개씩 읽어 렌더링 (조각마다 process_threshold와 비교)
+        self.chunk_size = chunk_size
+        
+        # 채널 ID -> CachedTranscript (최근 사용 순, 전체 크기 cache_max_bytes 이하)
+        self.cache_max_bytes = cache_max_bytes
+        self._cache = OrderedDict()
+        self._cache_bytes = 0
+    
+    def _get_render_pool(self) -> ProcessPoolExecutor:
+        if self._render_pool is None:
+            # 이벤트 루프와 스레드를 가진 프로세스를 fork하지 않도록 spawn 사용
+            self._render_pool = ProcessPoolExecutor(
+                max_workers=self.render_workers,
+                mp_context=multiprocessing.get_context('spawn')
+            )
+        return self._render_pool
+    
+    def close(self):
+        """렌더링 워커 프로세스 종료"""
+        if self._render_pool is not None:
+            self._render_pool.shutdown(wait=False, cancel_futures=True)
+            self._render_pool = None
+    
+    async def render_bodies(self, payloads: list, avatars: dict = None, mentions: dict = None) -> tuple:
+        """메시지 조각 렌더링 (많으면 프로세스 풀에서, 적으면 바로)"""
+        if self.render_workers and len(payloads) >= self.process_threshold:
+            loop = asyncio.get_running_loop()
+            try:
+                return await loop.run_in_executor(
+                    self._get_render_pool(), render_payload_bodies, payloads, avatars, mentions
+                )
+            except BrokenProcessPool:
+                logger.error("트랜스크립트 렌더링 프로세스 풀이 중단되어 직접 렌더링합니다")
+                self._render_pool = None
+        
+        return render_payload_bodies(payloads, avatars, mentions)
+    
+    def invalidate(self, channel_id: int):
+        """채널의 캐시된 트랜스크립트 제거"""
+        entry = self._cache.pop(channel_id, None)
+        if entry:
+            self._cache_bytes -= entry.size
+    
+    def _store(self, channel_id: int, entry: CachedTranscript):
+        self.invalidate(channel_id)
+        if entry.size > self.cache_max_bytes:
+            return
+        
+        self._cache[channel_id] = entry
+        self._cache_bytes += entry.size
+        while self._cache_bytes > self.cache_max_bytes:
+            _, evicted = self._cache.popitem(last=False)
+            self._cache_bytes -= evicted.size
+    
+    def start(self, channel_id: int):
+        """새 티켓 채널 기록 시작"""
+        self.live_channels.add(channel_id)
+    
+    async def record(self, message: discord.Message):
+        """새 메시지 또는 수정된 메시지 기록"""
+        record = TranscriptMessage.from_message(message)
+        await self.db.capture_message(message.channel.id, record.id, record.dumps())
+        
+        # 이미 렌더링한 메시지가 수정되었으면 캐시를 버림 (새 메시지는 다음에 이어서 렌더링)
+        entry = self._cache.get(message.channel.id)
+        if entry and record.id <= entry.last_message_id:
+            self.invalidate(message.channel.id)
+    
+    async def remove(self, message_id: int, channel_id: int = None):
+        """삭제된 메시지 제거"""
+        await self.db.delete_captured_message(message_id)
+        
+        entry = self._cache.get(channel_id)
+        if entry and message_id <= entry.last_message_id:
+            self.invalidate(channel_id)
+    
+    async def catch_up(self, channel: discord.TextChannel):
+        """봇이 꺼져 있던 동안의 메시지를 기록 (마지막 기록 이후만 조회)"""
+        last_id = await self.db.get_last_captured_message_id(channel.id)
+        after = discord.Object(id=last_id) if last_id else None
+        
+        batch = []
+        async for message in channel.history(limit=None, after=after, oldest_first=True):
+            record = TranscriptMessage.from_message(message)
+            batch.append((record.id, record.dumps()))
+            if len(batch) >= 100:
+                await self.db.capture_messages(channel.id, batch)
+                batch = []
+        if batch:
+            await self.db.capture_messages(channel.id, batch)
+        
+        self.live_channels.add(channel.id)
     
     @staticmethod
-    async def generate_text_transcript(channel: discord.TextChannel, messages: list) -> str:
-        """텍스트 형식 트랜스크립트 생성"""
-        transcript = f"=== 트랜스크립트: {channel.name} ===\n"
-        transcript += f"생성일: {datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n"
-        transcript += f"메시지 수: {len(messages)}\n"
-        transcript += "=" * 50 + "\n\n"
+    async def _next_chunk(chunks):
+        try:
+            return await chunks.__anext__()
+        except StopAsyncIteration:
+            return None
+    
+    async def build_transcript(self, channel: discord.TextChannel) -> Transcript:
+        """기록된 메시지로 트랜스크립트 생성
         
-        for message in reversed(messages):
-            timestamp = message.created_at.strftime('%Y-%m-%d %H:%M:%S')
-            
-            # 시스템 메시지
-            if message.type != discord.MessageType.default:
-                transcript += f"[시스템] {timestamp}: {message.system_content}\n\n"
-                continue
+        누락 구간이 있을 때만 기록 API를 호출하고, 캐시가 있으면 마지막 메시지 이후만 렌더링
+        기록은 조각 단위로 읽어 렌더링하고, 헤더/캐시된 본문/새 본문/푸터는 마지막에 한 번만 합침
+        """
+        if channel.id not in self.live_channels:
+            await self.catch_up(channel)
+        
+        entry = self._cache.get(channel.id)
+        chunks = self.db.iter_captured_messages(channel.id, entry.last_message_id if entry else None, self.chunk_size)
+        try:
+            payloads = await self._next_chunk(chunks)
             
-            # 일반 메시지
-            transcript += f"[{timestamp}] {message.author.display_name}#{message.author.discriminator}:\n"
-            transcript += f"{message.content}\n"
+            # 마지막 생성 이후 바뀐 것이 없으면 그대로 반환
+            if entry and payloads is None:
+                self._cache.move_to_end(channel.id)
+                return entry.transcript
             
-            # 첨부파일
-            if message.attachments:
-                transcript += "첨부파일:\n"
-                for attachment in message.attachments:
-                    transcript += f"  - {attachment.filename} ({attachment.size // 1024}KB)\n"
+            # 작성자별 아바타는 해시 기준으로 한 번만 가져옴
+            thumbnails = {}
+            if self.images:
+                thumbnails = await self.images.thumbnails(await self.db.get_captured_avatars(channel.id))
+            avatars = self.images.data_uris(thumbnails) if thumbnails else {}
             
-            # 임베드
-            if message.embeds:
-                transcript += "임베드:\n"
-                for embed in message.embeds:
-                    if embed.title:
-                        transcript += f"  제목: {embed.title}\n"
-                    if embed.description:
-                        transcript += f"  설명: {embed.description}\n"
+            # 헤더(생성일, 아바타 스타일)와 푸터(메시지 수)만 새로 만들고 캐시된 본문은 그대로 이어 붙임
+            created_date = datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+            html_parts = [TranscriptRenderer.html_header(channel.name, created_date, avatars)]
+            text_parts = [TranscriptRenderer.text_header(channel.name, created_date)]
+            message_count = last_message_id = 0
+            if entry:
+                html_parts.append(entry.html_body)
+                text_parts.append(entry.text_body)
+                message_count = entry.transcript.message_count
+                last_message_id = entry.last_message_id
             
-            transcript += "\n"
+            while payloads is not None:
+                # 멘션 이름은 워커 프로세스에서 조회할 수 없으므로 여기서 ID마다 한 번씩 조회
+                mentions = collect_mentions(getattr(channel, 'guild', None), payloads)
+                html_body, text_body = await self.render_bodies(payloads, avatars, mentions)
+                html_parts.append(html_body)
+                text_parts.append(text_body)
+                message_count += len(payloads)
+                last_message_id = TranscriptMessage.loads(payloads[-1]).id
+                payloads = await self._next_chunk(chunks)
+        finally:
+            await chunks.aclose()
         
+        html_start, text_start = len(html_parts[0]), len(text_parts[0])
+        html_end, text_end = sum(map(len, html_parts)), sum(map(len, text_parts))
+        html_parts.append(TranscriptRenderer.html_footer(message_count))
+        text_parts.append(TranscriptRenderer.text_footer(message_count))
+        transcript = Transcript(channel.name, b"".join(html_parts), b"".join(text_parts), message_count, thumbnails)
+        
+        self._store(channel.id, CachedTranscript(
+            last_message_id,
+            transcript,
+            memoryview(transcript.html)[html_start:html_end],
+            memoryview(transcript.text)[text_start:text_end]
+        ))
         return transcript
     
-    @staticmethod
-    async def save_transcript(channel: discord.TextChannel, limit: int = None) -> tuple:
-        """채널 메시지를 트랜스크립트로 저장"""
-        messages = []
-        async for message in channel.history(limit=limit, oldest_first=True):
-            messages.append(message)
-        
-        # HTML 트랜스크립트 생성
-        html_content = await TranscriptGenerator.generate_html_transcript(channel, messages)
-        html_file = io.BytesIO(html_content.encode('utf-8'))
-        html_file.seek(0)
-        
-        # 텍스트 트랜스크립트 생성
-        text_content = await TranscriptGenerator.generate_text_transcript(channel, messages)
-        text_file = io.BytesIO(text_content.encode('utf-8'))
-        text_file.seek(0)
-        
-        return (
-            discord.File(html_file, filename=f"{channel.name}_transcript.html"),
-            discord.File(text_file, filename=f"{channel.name}_transcript.txt"),
-            len(messages)
-        )
\ No newline at end of file
+    async def discard(self, channel_id: int):
+        """종료된 티켓의 기록과 캐시 삭제"""
+        self.live_channels.discard(channel_id)
+        self.invalidate(channel_id)
+        await self.db.clear_captured_messages(channel_id)